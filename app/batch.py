@@ -0,0 +1,233 @@
+"""Headless batch mode: generate and run dashboards for a file of queries.
+
+Usage (from the repository root):
+
+    python -m app.batch queries.txt [--source sqlite:///warehouse.db] \\
+        [--workers 4] [--rate 2] [--provider fake] [--output report.json]
+
+Each non-empty line of the queries file (``#`` starts a comment) is sent
+through ``LLMService.process_data_analysis`` and the generated code is executed
+headlessly against the data source. Queries run on a bounded worker pool and
+are started at no more than ``--rate`` per second. Running a batch warms the
+schema, embedding, result and query caches for the interactive app; the JSON
+report (per-query latency, token usage, SQL time and errors) doubles as a
+regression check after schema or prompt changes. Exits with status 1 if any
+query failed.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+from app.core.utils.rate_limiter import RateLimiter
+from app.core.utils.resource_registry import ResourceRegistry
+from app.core.utils.tracer import Tracer
+
+
+def read_queries(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def _spans(span, name: str):
+    if span.name == name:
+        yield span
+    for child in span.children:
+        yield from _spans(child, name)
+
+
+def _percentile(values: List[float], percentile: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = min(int(round(percentile / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return round(ordered[position], 4)
+
+
+class BatchRunner:
+    """Runs queries through the LLM service and the dashboard runtime concurrently."""
+
+    def __init__(self, llm_service, source: str, workers: int = 4, rate: float = 0.0):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.llm_service = llm_service
+        self.source = source
+        self.workers = max(workers, 1)
+        self.rate_limiter = RateLimiter(rate)
+        self.tracer = Tracer.instance()
+
+    def _create_runtime(self):
+        from app.core.execution.aggregate_store import AggregateStore
+        from app.core.execution.dashboard_runtime import DashboardRuntime
+        from app.core.execution.query_result_cache import QueryResultCache
+
+        # Same shared cache as the interactive app, so a batch warms it
+        result_cache = ResourceRegistry.instance().get_or_create(
+            "query_result_cache",
+            self.source,
+            lambda: QueryResultCache(
+                max_bytes=int(Config.QUERY_CACHE_MAX_MB * 1024 * 1024),
+                ttl_seconds=Config.QUERY_CACHE_TTL_SECONDS,
+            ),
+        )
+        data_source = self.llm_service.data_source
+        return DashboardRuntime(
+            data_source,
+            result_cache,
+            AggregateStore.shared(self.source, data_source),
+        )
+
+    def run_one(self, query: str) -> dict:
+        waited = self.rate_limiter.acquire()
+        result = {"query": query, "ok": False, "error": None}
+        runtime = None
+
+        with self.tracer.span("batch_query", query=query) as trace:
+            try:
+                started = time.perf_counter()
+                code = self.llm_service.process_data_analysis(query)
+                result["generation_seconds"] = round(time.perf_counter() - started, 4)
+
+                runtime = self._create_runtime()
+                started = time.perf_counter()
+                runtime.execute(code)
+                result["execution_seconds"] = round(time.perf_counter() - started, 4)
+                # Generated code catches its own exceptions and shows them with
+                # st.error, so the dashboard "succeeds" with broken charts
+                if runtime.errors:
+                    raise ValueError(
+                        f"Dashboard reported {len(runtime.errors)} error(s), first: "
+                        f"{runtime.errors[0]}"
+                    )
+                result["ok"] = True
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {str(e)}"
+                self.logger.error(f"Query failed: {query!r}: {result['error']}")
+
+        llm_spans = list(_spans(trace, "llm"))
+        prompt_build = next(_spans(trace, "prompt_build"), None)
+        query_log = runtime.query_log if runtime is not None else []
+        result["dashboard_errors"] = len(runtime.errors) if runtime is not None else 0
+        result.update(
+            {
+                "latency_seconds": round(trace.duration, 4),
+                "rate_limit_wait_seconds": round(waited, 4),
+                "result_cache_hit": bool(
+                    prompt_build and prompt_build.attributes.get("cache_hit")
+                ),
+                "prompt_tokens": sum(
+                    span.attributes.get("prompt_tokens", 0) for span in llm_spans
+                ),
+                "completion_tokens": sum(
+                    span.attributes.get("completion_tokens", 0) for span in llm_spans
+                ),
+                "sql_statements": len(query_log),
+                "sql_seconds": round(sum(entry["seconds"] for entry in query_log), 4),
+                "sql_cached": sum(1 for entry in query_log if entry["cached"]),
+                "sql_materialized": sum(
+                    1 for entry in query_log if entry["materialized"]
+                ),
+                "sql_rejected": sum(1 for entry in query_log if entry["rejected"]),
+            }
+        )
+        return result
+
+    def run(self, queries: List[str]) -> dict:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="batch"
+        ) as executor:
+            results = list(executor.map(self.run_one, queries))
+        wall_seconds = time.perf_counter() - started
+
+        latencies = [result["latency_seconds"] for result in results]
+        succeeded = sum(1 for result in results if result["ok"])
+        summary = {
+            "queries": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "workers": self.workers,
+            "rate_per_second": self.rate_limiter.rate,
+            "wall_seconds": round(wall_seconds, 4),
+            "queries_per_second": (
+                round(len(results) / wall_seconds, 3) if wall_seconds else None
+            ),
+            "latency_p50_seconds": _percentile(latencies, 50),
+            "latency_p95_seconds": _percentile(latencies, 95),
+            "latency_mean_seconds": (
+                round(statistics.mean(latencies), 4) if latencies else None
+            ),
+            "prompt_tokens": sum(result["prompt_tokens"] for result in results),
+            "completion_tokens": sum(result["completion_tokens"] for result in results),
+            "sql_seconds": round(sum(result["sql_seconds"] for result in results), 4),
+            "result_cache_hits": sum(
+                1 for result in results if result["result_cache_hit"]
+            ),
+        }
+        from app.core.execution.aggregate_store import AggregateStore
+
+        aggregate_store = AggregateStore.shared(self.source, self.llm_service.data_source)
+        if aggregate_store is not None:
+            summary["aggregate_store"] = aggregate_store.stats()
+        self.logger.info(
+            f"Batch finished: {succeeded}/{len(results)} succeeded in "
+            f"{wall_seconds:.2f}s."
+        )
+        return {"summary": summary, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("queries", help="File with one natural-language query per line")
+    parser.add_argument("--source", help="Data source (default DW_DATABASE_URL)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="Max queries started per second (0: no limit)"
+    )
+    parser.add_argument(
+        "--provider", choices=["openai", "fake"], help="LLM provider (default LLM_PROVIDER)"
+    )
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.provider:
+        Config.LLM_PROVIDER = args.provider
+    # Generated code calls st.* outside a Streamlit session; those calls are
+    # no-ops here, so silence the bare-mode warnings they log
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    from app.core.llm.llm_service import LLMService
+
+    source = args.source or Config().DW_DATABASE_URL
+    llm_service = LLMService(source=source, model_name=args.model)
+    runner = BatchRunner(llm_service, source, workers=args.workers, rate=args.rate)
+    report = runner.run(read_queries(args.queries))
+    report["parameters"] = {
+        # Masked: the report is written to disk and stdout
+        "source": ResourceRegistry.display_key(source),
+        "provider": Config.LLM_PROVIDER,
+        "model": args.model,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if report["summary"]["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from typing import Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.core.utils.logger import Logger
+
+
+class ArrowProfiler:
+    """Builds per-column data summaries from an in-memory Arrow table.
+
+    Produces the same shape as ``ColumnProfiler``: ``{"min", "max"}`` for
+    numeric and temporal columns and ``{"distinct_values"}`` (most frequent
+    first) for text columns. Each column is summarized by a single Arrow
+    compute kernel, so no values are materialized as Python objects except the
+    results themselves.
+    """
+
+    DISTINCT_LIMIT = 10
+
+    def __init__(self):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+
+    @staticmethod
+    def is_numeric(data_type: pa.DataType) -> bool:
+        return (
+            pa.types.is_integer(data_type)
+            or pa.types.is_floating(data_type)
+            or pa.types.is_decimal(data_type)
+        )
+
+    @staticmethod
+    def is_temporal(data_type: pa.DataType) -> bool:
+        return pa.types.is_temporal(data_type)
+
+    @staticmethod
+    def is_text(data_type: pa.DataType) -> bool:
+        return (
+            pa.types.is_string(data_type)
+            or pa.types.is_large_string(data_type)
+            or pa.types.is_dictionary(data_type)
+        )
+
+    def profile_table(self, table: pa.Table) -> dict:
+        data_summary = {}
+        for field in table.schema:
+            try:
+                summary = self._summarize_column(table.column(field.name), field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                self.logger.warning(f"Could not summarize column {field.name}: {str(e)}")
+                continue
+            if summary is not None:
+                data_summary[field.name] = summary
+        return data_summary
+
+    def _summarize_column(self, column: pa.ChunkedArray, data_type) -> Optional[dict]:
+        if self.is_numeric(data_type) or self.is_temporal(data_type):
+            bounds = pc.min_max(column)
+            return {"min": bounds["min"].as_py(), "max": bounds["max"].as_py()}
+
+        if self.is_text(data_type):
+            counts = pc.value_counts(column.drop_null())
+            order = pc.array_sort_indices(counts.field("counts"), order="descending")
+            top = pc.take(counts.field("values"), order[: self.DISTINCT_LIMIT])
+            return {"distinct_values": top.to_pylist()}
+
+        return None
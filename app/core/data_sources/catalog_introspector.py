@@ -0,0 +1,288 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql import sqltypes
+
+from app.core.utils.logger import Logger
+
+
+class CatalogIntrospector:
+    """Set-based schema introspection for PostgreSQL and SQL Server.
+
+    Reads tables, columns, foreign keys, indexes and key constraints for all
+    requested schemas with one catalog query each, instead of several inspector
+    round-trips per table. Results are keyed by ``(schema, table)`` and use the
+    same per-table dict shape as ``SQLDataSource.get_schema`` (minus
+    ``data_summary``).
+    """
+
+    SUPPORTED_DIALECTS = ("postgresql", "mssql")
+
+    def __init__(self, engine):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.engine = engine
+        self.dialect = engine.dialect
+
+    def supports(self) -> bool:
+        return self.dialect.name in self.SUPPORTED_DIALECTS
+
+    def introspect(self, schema_names: List[str]) -> Dict[Tuple[str, str], dict]:
+        if not schema_names:
+            return {}
+
+        queries = (
+            self._postgresql_queries()
+            if self.dialect.name == "postgresql"
+            else self._mssql_queries()
+        )
+
+        with self.engine.connect() as connection:
+            results = {
+                name: connection.execute(
+                    text(query).bindparams(bindparam("schemas", expanding=True)),
+                    {"schemas": list(schema_names)},
+                ).fetchall()
+                for name, query in queries.items()
+            }
+
+        tables = {}
+        for row in results["tables"]:
+            tables[(row[0], row[1])] = {
+                "columns": [],
+                "foreign_keys": [],
+                "indexes": [],
+                "constraints": {
+                    "primary_key": {"constrained_columns": [], "name": None},
+                    "unique_constraints": [],
+                },
+            }
+
+        for row in results["columns"]:
+            table = tables.get((row[0], row[1]))
+            if table is None:
+                continue
+            table["columns"].append(
+                {
+                    "name": row[2],
+                    "type": self._resolve_type(row[3], row[4], row[5], row[6]),
+                    "nullable": row[7] in ("YES", True, 1),
+                    "default": row[8],
+                }
+            )
+
+        self._collect_foreign_keys(tables, results["foreign_keys"])
+        self._collect_indexes(tables, results["indexes"])
+        self._collect_key_constraints(tables, results["key_constraints"])
+
+        self.logger.info(
+            f"Bulk catalog introspection returned {len(tables)} tables "
+            f"using {len(queries)} queries."
+        )
+
+        return tables
+
+    def _collect_foreign_keys(self, tables, rows):
+        # Rows: schema, table, fk name, referred schema, referred table,
+        # constrained column, referred column (ordered by column position)
+        foreign_keys = {}
+        for row in rows:
+            table = tables.get((row[0], row[1]))
+            if table is None:
+                continue
+            fk = foreign_keys.get((row[0], row[1], row[2]))
+            if fk is None:
+                fk = {
+                    "name": row[2],
+                    "constrained_columns": [],
+                    "referred_schema": row[3],
+                    "referred_table": row[4],
+                    "referred_columns": [],
+                }
+                foreign_keys[(row[0], row[1], row[2])] = fk
+                table["foreign_keys"].append(fk)
+            fk["constrained_columns"].append(row[5])
+            fk["referred_columns"].append(row[6])
+
+    def _collect_indexes(self, tables, rows):
+        # Rows: schema, table, index name, is unique, column (ordered by key position)
+        indexes = {}
+        for row in rows:
+            table = tables.get((row[0], row[1]))
+            if table is None:
+                continue
+            idx = indexes.get((row[0], row[1], row[2]))
+            if idx is None:
+                idx = {"name": row[2], "column_names": [], "unique": bool(row[3])}
+                indexes[(row[0], row[1], row[2])] = idx
+                table["indexes"].append(idx)
+            idx["column_names"].append(row[4])
+
+    def _collect_key_constraints(self, tables, rows):
+        # Rows: schema, table, constraint name, 'PK'/'UQ', column (ordered)
+        unique_constraints = defaultdict(dict)
+        for row in rows:
+            table = tables.get((row[0], row[1]))
+            if table is None:
+                continue
+            constraints = table["constraints"]
+            if row[3] == "PK":
+                constraints["primary_key"]["name"] = row[2]
+                constraints["primary_key"]["constrained_columns"].append(row[4])
+            else:
+                uc = unique_constraints[(row[0], row[1])].get(row[2])
+                if uc is None:
+                    uc = {"name": row[2], "column_names": []}
+                    unique_constraints[(row[0], row[1])][row[2]] = uc
+                    constraints["unique_constraints"].append(uc)
+                uc["column_names"].append(row[4])
+
+    def _resolve_type(
+        self,
+        type_name: str,
+        length: Optional[int],
+        precision: Optional[int],
+        scale: Optional[int],
+    ) -> str:
+        """Render a catalog type name the way the SQLAlchemy inspector would."""
+        type_cls = self.dialect.ischema_names.get(type_name.lower())
+        if type_cls is None:
+            return type_name.upper()
+
+        try:
+            if issubclass(type_cls, sqltypes.String) and length not in (None, -1):
+                return str(type_cls(length=length))
+            if (
+                issubclass(type_cls, sqltypes.Numeric)
+                and not issubclass(type_cls, sqltypes.Float)
+                and precision is not None
+            ):
+                return str(type_cls(precision=precision, scale=scale))
+            return str(type_cls())
+        except Exception:
+            return type_name.upper()
+
+    @staticmethod
+    def _postgresql_queries() -> Dict[str, str]:
+        return {
+            "tables": """
+                SELECT table_schema, table_name
+                FROM information_schema.tables
+                WHERE table_type = 'BASE TABLE' AND table_schema IN :schemas
+                ORDER BY table_schema, table_name
+            """,
+            "columns": """
+                SELECT c.table_schema, c.table_name, c.column_name,
+                       CASE WHEN c.data_type IN ('USER-DEFINED', 'ARRAY')
+                            THEN c.udt_name ELSE c.data_type END,
+                       c.character_maximum_length, c.numeric_precision,
+                       c.numeric_scale, c.is_nullable, c.column_default
+                FROM information_schema.columns c
+                WHERE c.table_schema IN :schemas
+                ORDER BY c.table_schema, c.table_name, c.ordinal_position
+            """,
+            "foreign_keys": """
+                SELECT ns.nspname, cl.relname, con.conname,
+                       rns.nspname, rcl.relname, att.attname, ratt.attname
+                FROM pg_constraint con
+                JOIN pg_class cl ON cl.oid = con.conrelid
+                JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+                JOIN pg_class rcl ON rcl.oid = con.confrelid
+                JOIN pg_namespace rns ON rns.oid = rcl.relnamespace
+                CROSS JOIN LATERAL unnest(con.conkey, con.confkey)
+                    WITH ORDINALITY AS k(attnum, rattnum, ord)
+                JOIN pg_attribute att
+                    ON att.attrelid = con.conrelid AND att.attnum = k.attnum
+                JOIN pg_attribute ratt
+                    ON ratt.attrelid = con.confrelid AND ratt.attnum = k.rattnum
+                WHERE con.contype = 'f' AND ns.nspname IN :schemas
+                ORDER BY ns.nspname, cl.relname, con.conname, k.ord
+            """,
+            "indexes": """
+                SELECT ns.nspname, cl.relname, ic.relname, ix.indisunique, att.attname
+                FROM pg_index ix
+                JOIN pg_class cl ON cl.oid = ix.indrelid
+                JOIN pg_class ic ON ic.oid = ix.indexrelid
+                JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+                CROSS JOIN LATERAL unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+                JOIN pg_attribute att
+                    ON att.attrelid = cl.oid AND att.attnum = k.attnum
+                WHERE NOT ix.indisprimary AND ns.nspname IN :schemas
+                ORDER BY ns.nspname, cl.relname, ic.relname, k.ord
+            """,
+            "key_constraints": """
+                SELECT ns.nspname, cl.relname, con.conname,
+                       CASE con.contype WHEN 'p' THEN 'PK' ELSE 'UQ' END, att.attname
+                FROM pg_constraint con
+                JOIN pg_class cl ON cl.oid = con.conrelid
+                JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+                CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                JOIN pg_attribute att
+                    ON att.attrelid = con.conrelid AND att.attnum = k.attnum
+                WHERE con.contype IN ('p', 'u') AND ns.nspname IN :schemas
+                ORDER BY ns.nspname, cl.relname, con.conname, k.ord
+            """,
+        }
+
+    @staticmethod
+    def _mssql_queries() -> Dict[str, str]:
+        return {
+            "tables": """
+                SELECT TABLE_SCHEMA, TABLE_NAME
+                FROM INFORMATION_SCHEMA.TABLES
+                WHERE TABLE_TYPE = 'BASE TABLE' AND TABLE_SCHEMA IN :schemas
+                ORDER BY TABLE_SCHEMA, TABLE_NAME
+            """,
+            "columns": """
+                SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE,
+                       CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION, NUMERIC_SCALE,
+                       IS_NULLABLE, COLUMN_DEFAULT
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA IN :schemas
+                ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+            """,
+            "foreign_keys": """
+                SELECT s.name, t.name, fk.name, rs.name, rt.name, c.name, rc.name
+                FROM sys.foreign_keys fk
+                JOIN sys.foreign_key_columns fkc
+                    ON fkc.constraint_object_id = fk.object_id
+                JOIN sys.tables t ON t.object_id = fk.parent_object_id
+                JOIN sys.schemas s ON s.schema_id = t.schema_id
+                JOIN sys.tables rt ON rt.object_id = fk.referenced_object_id
+                JOIN sys.schemas rs ON rs.schema_id = rt.schema_id
+                JOIN sys.columns c
+                    ON c.object_id = fkc.parent_object_id
+                    AND c.column_id = fkc.parent_column_id
+                JOIN sys.columns rc
+                    ON rc.object_id = fkc.referenced_object_id
+                    AND rc.column_id = fkc.referenced_column_id
+                WHERE s.name IN :schemas
+                ORDER BY s.name, t.name, fk.name, fkc.constraint_column_id
+            """,
+            "indexes": """
+                SELECT s.name, t.name, i.name, i.is_unique, c.name
+                FROM sys.indexes i
+                JOIN sys.index_columns ic
+                    ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+                JOIN sys.tables t ON t.object_id = i.object_id
+                JOIN sys.schemas s ON s.schema_id = t.schema_id
+                JOIN sys.columns c
+                    ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+                WHERE i.is_primary_key = 0 AND i.type > 0
+                    AND ic.is_included_column = 0 AND s.name IN :schemas
+                ORDER BY s.name, t.name, i.name, ic.key_ordinal
+            """,
+            "key_constraints": """
+                SELECT s.name, t.name, kc.name, kc.type, c.name
+                FROM sys.key_constraints kc
+                JOIN sys.index_columns ic
+                    ON ic.object_id = kc.parent_object_id
+                    AND ic.index_id = kc.unique_index_id
+                JOIN sys.tables t ON t.object_id = kc.parent_object_id
+                JOIN sys.schemas s ON s.schema_id = t.schema_id
+                JOIN sys.columns c
+                    ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+                WHERE s.name IN :schemas
+                ORDER BY s.name, t.name, kc.name, ic.key_ordinal
+            """,
+        }
@@ -0,0 +1,332 @@
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.data_sources.sql_dialect import SQLDialect
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+
+
+class ColumnProfiler:
+    """Builds per-column data summaries without scanning whole tables.
+
+    Summaries are read from optimizer statistics first (``pg_stats`` on
+    PostgreSQL, ``sys.dm_db_stats_histogram`` on SQL Server). Columns without
+    statistics are profiled by aggregating a bounded sample of the table in the
+    database (``TABLESAMPLE`` on large tables, capped at ``max_rows`` rows), so
+    only the summaries are transferred; the statements are cancelled once the
+    per-table time budget is spent.
+    """
+
+    DISTINCT_LIMIT = 10
+
+    def __init__(
+        self,
+        engine,
+        time_budget_seconds: Optional[float] = None,
+        max_rows: Optional[int] = None,
+    ):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.engine = engine
+        self.dialect = engine.dialect
+        self.time_budget_seconds = (
+            time_budget_seconds
+            if time_budget_seconds is not None
+            else Config.PROFILE_TABLE_TIME_BUDGET_SECONDS
+        )
+        self.max_rows = max_rows if max_rows is not None else Config.PROFILE_MAX_ROWS
+        self.row_estimates: Dict[Tuple[str, str], float] = {}
+
+    @staticmethod
+    def is_numeric(column_type: str) -> bool:
+        return any(t in column_type for t in ("INT", "NUMERIC", "FLOAT", "DECIMAL"))
+
+    @staticmethod
+    def is_text(column_type: str) -> bool:
+        return "CHAR" in column_type or "TEXT" in column_type
+
+    def load_statistics(
+        self, schema_names: List[str]
+    ) -> Dict[Tuple[str, str], Dict[str, dict]]:
+        """Read optimizer statistics for every table in ``schema_names`` at once.
+
+        Returns raw per-column statistics keyed by ``(schema, table)``; they are
+        turned into summaries by ``profile_table``. Also records row estimates
+        used to size ``TABLESAMPLE`` clauses.
+        """
+        if not schema_names or self.dialect.name not in ("postgresql", "mssql"):
+            return {}
+
+        try:
+            with self.engine.connect() as connection:
+                if self.dialect.name == "postgresql":
+                    statistics = self._load_postgresql_statistics(
+                        connection, schema_names
+                    )
+                else:
+                    statistics = self._load_mssql_statistics(connection, schema_names)
+            self.logger.info(
+                f"Loaded optimizer statistics for {len(statistics)} tables."
+            )
+            return statistics
+        except SQLAlchemyError as e:
+            self.logger.warning(
+                f"Could not read optimizer statistics, sampling instead: {str(e)}"
+            )
+            return {}
+
+    def profile_table(
+        self,
+        schema_name: str,
+        table_name: str,
+        columns: List[dict],
+        statistics: Optional[Dict[str, dict]] = None,
+    ) -> dict:
+        """Summarize ``columns`` using ``statistics`` where present, sampling the rest."""
+        started = time.monotonic()
+        statistics = statistics or {}
+        data_summary = {}
+        to_sample = []
+
+        for column in columns:
+            column_name = column["name"]
+            column_type = str(column["type"]).upper()
+            if self.is_numeric(column_type):
+                kind = "numeric"
+            elif self.is_text(column_type):
+                kind = "text"
+            else:
+                continue
+
+            summary = self._summary_from_statistics(
+                statistics.get(column_name), kind
+            )
+            if summary is not None:
+                data_summary[column_name] = summary
+            else:
+                to_sample.append((column_name, kind))
+
+        if to_sample:
+            remaining = self.time_budget_seconds - (time.monotonic() - started)
+            if remaining <= 0:
+                self.logger.warning(
+                    f"Time budget exhausted before sampling {schema_name}.{table_name}."
+                )
+            else:
+                data_summary.update(
+                    self._sample_summary(schema_name, table_name, to_sample, remaining)
+                )
+
+        # Keep the original column order
+        return {
+            column["name"]: data_summary[column["name"]]
+            for column in columns
+            if column["name"] in data_summary
+        }
+
+    def _summary_from_statistics(self, column_stats, kind: str) -> Optional[dict]:
+        if not column_stats:
+            return None
+
+        if kind == "numeric":
+            values = [
+                number
+                for number in map(self._to_number, column_stats.get("bounds", []))
+                if number is not None
+            ]
+            if not values:
+                return None
+            return {"min": min(values), "max": max(values)}
+
+        values = column_stats.get("common_values") or column_stats.get("bounds")
+        if not values:
+            return None
+        return {"distinct_values": list(dict.fromkeys(values))[: self.DISTINCT_LIMIT]}
+
+    def _sample_summary(self, schema_name, table_name, columns, time_budget) -> dict:
+        quote = self.dialect.identifier_preparer.quote
+        table_sql = SQLDialect.quote_table(self.dialect, schema_name, table_name)
+
+        estimate = self.row_estimates.get((schema_name, table_name))
+        if estimate and estimate > self.max_rows and self.dialect.name in (
+            "postgresql",
+            "mssql",
+        ):
+            # Oversample so page-level sampling still fills max_rows
+            percent = min(100.0, 200.0 * self.max_rows / estimate)
+            if self.dialect.name == "postgresql":
+                table_sql += f" TABLESAMPLE SYSTEM ({percent:.6f})"
+            else:
+                table_sql += f" TABLESAMPLE ({percent:.6f} PERCENT)"
+
+        sample_sql = "({}) AS sampled".format(
+            SQLDialect.select_limited(
+                self.dialect,
+                ", ".join(quote(column_name) for column_name, _ in columns),
+                table_sql,
+                self.max_rows,
+            )
+        )
+        numeric = [column_name for column_name, kind in columns if kind == "numeric"]
+        textual = [column_name for column_name, kind in columns if kind == "text"]
+
+        data_summary = {}
+        deadline = time.monotonic() + time_budget
+        try:
+            with self.engine.connect() as connection:
+                if numeric:
+                    # One row of MIN/MAX pairs
+                    aggregates = ", ".join(
+                        f"MIN({quote(c)}), MAX({quote(c)})" for c in numeric
+                    )
+                    with SQLDialect.statement_timeout(
+                        connection, deadline - time.monotonic()
+                    ):
+                        row = connection.execute(
+                            text(f"SELECT {aggregates} FROM {sample_sql}")
+                        ).fetchone()
+                    for position, column_name in enumerate(numeric):
+                        data_summary[column_name] = {
+                            "min": row[2 * position],
+                            "max": row[2 * position + 1],
+                        }
+
+                if textual:
+                    # Up to DISTINCT_LIMIT values per column, tagged by position
+                    branches = []
+                    for position, column_name in enumerate(textual):
+                        distinct_sql = (
+                            f"(SELECT DISTINCT {quote(column_name)} AS value "
+                            f"FROM {sample_sql} WHERE {quote(column_name)} IS NOT NULL) "
+                            f"AS distinct_{position}"
+                        )
+                        limited_sql = SQLDialect.select_limited(
+                            self.dialect, "value", distinct_sql, self.DISTINCT_LIMIT
+                        )
+                        branches.append(
+                            f"SELECT {position} AS position, value "
+                            f"FROM ({limited_sql}) AS values_{position}"
+                        )
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("time budget spent on numeric summaries")
+                    with SQLDialect.statement_timeout(connection, remaining):
+                        rows = connection.execute(
+                            text(" UNION ALL ".join(branches))
+                        ).fetchall()
+                    values = defaultdict(list)
+                    for position, value in rows:
+                        values[position].append(value)
+                    for position, column_name in enumerate(textual):
+                        data_summary[column_name] = {
+                            "distinct_values": values[position]
+                        }
+        except (SQLAlchemyError, TimeoutError) as e:
+            self.logger.error(
+                f"Error retrieving data summary for {schema_name}.{table_name}: {str(e)}"
+            )
+        return data_summary
+
+    def _load_postgresql_statistics(self, connection, schema_names):
+        statistics = defaultdict(dict)
+        rows = connection.execute(
+            text(
+                """
+                SELECT schemaname, tablename, attname,
+                       most_common_vals::text::text[],
+                       histogram_bounds::text::text[]
+                FROM pg_stats
+                WHERE schemaname IN :schemas
+                """
+            ).bindparams(bindparam("schemas", expanding=True)),
+            {"schemas": list(schema_names)},
+        )
+        for row in rows:
+            statistics[(row[0], row[1])][row[2]] = {
+                "common_values": list(row[3] or []),
+                "bounds": list(row[3] or []) + list(row[4] or []),
+            }
+
+        estimates = connection.execute(
+            text(
+                """
+                SELECT ns.nspname, cl.relname, cl.reltuples
+                FROM pg_class cl
+                JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+                WHERE cl.relkind IN ('r', 'p') AND ns.nspname IN :schemas
+                """
+            ).bindparams(bindparam("schemas", expanding=True)),
+            {"schemas": list(schema_names)},
+        )
+        self.row_estimates.update({(r[0], r[1]): float(r[2]) for r in estimates})
+        return dict(statistics)
+
+    def _load_mssql_statistics(self, connection, schema_names):
+        # Equivalent to DBCC SHOW_STATISTICS ... WITH HISTOGRAM for every
+        # statistics object, but as a single set-based query. Only the first
+        # statistics object per leading column is used.
+        steps = defaultdict(list)
+        stats_ids = {}
+        rows = connection.execute(
+            text(
+                """
+                SELECT s.name, t.name, c.name, st.stats_id,
+                       CONVERT(nvarchar(4000), h.range_high_key), h.equal_rows
+                FROM sys.stats st
+                JOIN sys.tables t ON t.object_id = st.object_id
+                JOIN sys.schemas s ON s.schema_id = t.schema_id
+                JOIN sys.stats_columns sc
+                    ON sc.object_id = st.object_id AND sc.stats_id = st.stats_id
+                    AND sc.stats_column_id = 1
+                JOIN sys.columns c
+                    ON c.object_id = sc.object_id AND c.column_id = sc.column_id
+                CROSS APPLY sys.dm_db_stats_histogram(st.object_id, st.stats_id) h
+                WHERE s.name IN :schemas
+                ORDER BY s.name, t.name, c.name, st.stats_id, h.step_number
+                """
+            ).bindparams(bindparam("schemas", expanding=True)),
+            {"schemas": list(schema_names)},
+        )
+        for row in rows:
+            column_key = (row[0], row[1], row[2])
+            if stats_ids.setdefault(column_key, row[3]) != row[3]:
+                continue
+            if row[4] is not None:
+                steps[column_key].append((row[4], row[5] or 0))
+
+        statistics = defaultdict(dict)
+        for (schema_name, table_name, column_name), column_steps in steps.items():
+            by_frequency = sorted(column_steps, key=lambda step: step[1], reverse=True)
+            statistics[(schema_name, table_name)][column_name] = {
+                "common_values": [value for value, _ in by_frequency],
+                "bounds": [column_steps[0][0], column_steps[-1][0]],
+            }
+
+        estimates = connection.execute(
+            text(
+                """
+                SELECT s.name, t.name, SUM(p.rows)
+                FROM sys.partitions p
+                JOIN sys.tables t ON t.object_id = p.object_id
+                JOIN sys.schemas s ON s.schema_id = t.schema_id
+                WHERE p.index_id IN (0, 1) AND s.name IN :schemas
+                GROUP BY s.name, t.name
+                """
+            ).bindparams(bindparam("schemas", expanding=True)),
+            {"schemas": list(schema_names)},
+        )
+        self.row_estimates.update({(r[0], r[1]): float(r[2]) for r in estimates})
+        return dict(statistics)
+
+    @staticmethod
+    def _to_number(value):
+        if isinstance(value, (int, float)):
+            return value
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        return int(number) if number.is_integer() and "." not in str(value) else number
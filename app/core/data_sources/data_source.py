@@ -1,24 +1,97 @@
+import os
 from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+from app.core.data_sources.schema_snapshot import SchemaSnapshot
+from app.core.utils.config import Config
+
+
+class QueryCostExceededError(ValueError):
+    """Raised when a generated query's estimated plan exceeds the configured limits."""
 
 
 class DataSource(ABC):
     @abstractmethod
-    def get_schema(self) -> dict:
+    def get_schema(self, progress_callback=None) -> dict:
         pass
 
     @abstractmethod
-    def schema_to_string(self, schema: dict) -> str:
+    def schema_to_string(self, schema: dict, style: Optional[str] = None) -> str:
+        """Render the schema for the LLM prompt in ``style`` (default Config.SCHEMA_FORMAT)."""
         pass
 
+    def get_sql_dialect(self) -> Optional[str]:
+        """SQLAlchemy-style dialect name of the query engine, if the source has one."""
+        return None
+
+    def get_db_type(self) -> str:
+        """Database product name the generated SQL must be compatible with."""
+        return "SQL Server"
+
+    def execute_query(self, sql: str, max_bytes=None):
+        """Run a read query and return the result as a pandas DataFrame.
+
+        Implementations stop fetching once ``max_bytes`` is reached and set
+        ``frame.attrs["truncated"]``.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support SQL queries."
+        )
+
+    def schema_to_documents(
+        self, schema: dict, style: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Split the schema into independently indexable documents keyed by a stable id."""
+        schema_str = self.schema_to_string(schema, style)
+        return {self.source: schema_str} if schema_str else {}
+
+    def get_schema_fingerprint(self) -> Optional[str]:
+        """Cheap value that changes whenever the schema changes, or None if unknown."""
+        return None
+
+    def get_cached_schema(self, progress_callback=None, fingerprint=None) -> dict:
+        """Return the schema from the on-disk snapshot while its fingerprint still matches."""
+        fingerprint = fingerprint or self.get_schema_fingerprint()
+        if fingerprint is None:
+            return SchemaSnapshot.normalize(
+                self.get_schema(progress_callback=progress_callback)
+            )
+
+        snapshot = SchemaSnapshot()
+        schema = snapshot.load(self.source, fingerprint)
+        if schema is None:
+            # Normalized so the first run renders the same as later loads
+            schema = SchemaSnapshot.normalize(
+                self.get_schema(progress_callback=progress_callback)
+            )
+            snapshot.save(self.source, fingerprint, schema)
+        return schema
+
     @staticmethod
     def create(source: str) -> "DataSource":
-        if source.startswith(("postgresql://", "mssql+pyodbc://")):
+        if source.startswith(("postgresql://", "mssql+pyodbc://", "sqlite://")):
             from app.core.data_sources.sql_data_source import SQLDataSource
 
             return SQLDataSource(source)
-        elif source.lower().endswith((".csv")):
-            from app.core.data_sources.file_data_source import FileDataSource
+        elif os.path.isdir(source) or source.lower().endswith(
+            (".csv", ".csv.gz", ".tsv", ".parquet", ".pq", ".feather", ".arrow")
+        ):
+            if Config.FILE_ENGINE == "pyarrow" and not os.path.isdir(source):
+                from app.core.data_sources.file_data_source import FileDataSource
+
+                return FileDataSource(source)
+            try:
+                from app.core.data_sources.duckdb_data_source import DuckDBDataSource
+            except ImportError:
+                # Without DuckDB, files are still described but cannot be queried
+                if os.path.isdir(source):
+                    raise ValueError(
+                        f"DuckDB is required for directory sources: {source}"
+                    )
+                from app.core.data_sources.file_data_source import FileDataSource
+
+                return FileDataSource(source)
 
-            return FileDataSource(source)
+            return DuckDBDataSource(source)
         else:
             raise ValueError(f"Unsupported data source: {source}")
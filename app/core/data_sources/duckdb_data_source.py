@@ -0,0 +1,306 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+
+from app.core.data_sources.arrow_profiler import ArrowProfiler
+from app.core.data_sources.data_source import DataSource
+from app.core.data_sources.schema_formatter import SchemaFormatter
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+from app.core.utils.resource_registry import ResourceRegistry
+
+
+class DuckDBDataSource(DataSource):
+    """A CSV/Parquet/Feather file, or a directory of them, queried through in-process DuckDB.
+
+    Every file is exposed as a view in the ``main`` schema (Feather files as
+    memory-mapped Arrow datasets registered under the same name), so generated SQL
+    runs vectorized against the files themselves, spilling to disk beyond
+    ``DUCKDB_MEMORY_LIMIT``. The schema has the same shape as
+    ``SQLDataSource``'s, with summaries profiled from the first
+    ``FILE_SAMPLE_ROWS`` rows of each view. Files added to or removed from a
+    directory are picked up by the next ``get_schema_fingerprint`` check.
+    """
+
+    # File suffix -> DuckDB table function
+    READERS = {
+        ".csv": "read_csv_auto",
+        ".csv.gz": "read_csv_auto",
+        ".tsv": "read_csv_auto",
+        ".parquet": "read_parquet",
+        ".pq": "read_parquet",
+        # Not a DuckDB function: registered as a pyarrow dataset per cursor
+        ".feather": "arrow",
+        ".arrow": "arrow",
+    }
+
+    SCHEMA_NAME = "main"
+
+    # Serializes view changes on the shared connections
+    _views_lock = threading.Lock()
+
+    def __init__(self, source: str):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.source = source
+        self.files = self._discover_files(source)
+        if not self.files:
+            raise ValueError(f"No CSV, Parquet or Feather files found in: {source}")
+        self.sample_rows = Config.FILE_SAMPLE_ROWS
+        self.profiler = ArrowProfiler()
+        self.arrow_tables = {}
+        self.connection = ResourceRegistry.instance().get_or_create(
+            "duckdb", source, self._connect
+        )
+        self._sync_views()
+
+    @classmethod
+    def reader_for(cls, path: str):
+        lowered = path.lower()
+        for suffix, reader in cls.READERS.items():
+            if lowered.endswith(suffix):
+                return reader
+        return None
+
+    def _discover_files(self, source: str) -> dict:
+        """Map view names to file paths."""
+        if os.path.isdir(source):
+            paths = sorted(
+                os.path.join(source, name)
+                for name in os.listdir(source)
+                if self.reader_for(name)
+            )
+        else:
+            paths = [source] if self.reader_for(source) else []
+
+        files = {}
+        for path in paths:
+            name = self._view_name(path)
+            if name in files:
+                self.logger.warning(f"Skipping {path}: view {name} already exists.")
+                continue
+            files[name] = path
+        return files
+
+    @classmethod
+    def _view_name(cls, path: str) -> str:
+        base = os.path.basename(path)
+        for suffix in cls.READERS:
+            if base.lower().endswith(suffix):
+                base = base[: -len(suffix)]
+                break
+        name = re.sub(r"\W+", "_", base).strip("_").lower() or "data"
+        return f"t_{name}" if name[0].isdigit() else name
+
+    def _connect(self):
+        connection = duckdb.connect(":memory:")
+        spill_directory = os.path.join(Config.CACHE_DIR, "duckdb")
+        os.makedirs(spill_directory, exist_ok=True)
+        connection.execute(f"SET memory_limit = '{Config.DUCKDB_MEMORY_LIMIT}'")
+        connection.execute(f"SET temp_directory = '{spill_directory}'")
+        if Config.DUCKDB_THREADS:
+            connection.execute(f"SET threads = {int(Config.DUCKDB_THREADS)}")
+        return connection
+
+    def refresh_files(self):
+        """Re-scan the source so files added or removed since startup are picked up."""
+        self.files = self._discover_files(self.source)
+        self._sync_views()
+
+    def _sync_views(self):
+        """Create views for new files and drop views whose file is gone.
+
+        The connection (and its views) is shared by every instance for this
+        source, so existing views are read back from the catalog; they are
+        only created once, as binding a CSV view sniffs the file.
+        """
+        view_files = {
+            name: path
+            for name, path in self.files.items()
+            if self.reader_for(path) != "arrow"
+        }
+        with self._views_lock:
+            cursor = self.connection.cursor()
+            try:
+                existing = {
+                    row[0]
+                    for row in cursor.execute(
+                        "SELECT view_name FROM duckdb_views() "
+                        f"WHERE NOT internal AND schema_name = '{self.SCHEMA_NAME}'"
+                    ).fetchall()
+                }
+                for name in existing - set(view_files):
+                    cursor.execute(f'DROP VIEW IF EXISTS "{name}"')
+                for name, path in view_files.items():
+                    if name in existing:
+                        continue
+                    escaped_path = path.replace("'", "''")
+                    cursor.execute(
+                        f'CREATE OR REPLACE VIEW "{name}" AS '
+                        f"SELECT * FROM {self.reader_for(path)}('{escaped_path}')"
+                    )
+            finally:
+                cursor.close()
+
+        # Keep already opened datasets; they are memory-mapped
+        self.arrow_tables = {
+            name: self.arrow_tables.get(name) or self._open_arrow(path)
+            for name, path in self.files.items()
+            if self.reader_for(path) == "arrow"
+        }
+        created = len(view_files) - len(existing & set(view_files))
+        removed = len(existing - set(view_files))
+        if created or removed:
+            self.logger.info(
+                f"File views in DuckDB: {created} created, {removed} dropped, "
+                f"{len(self.files)} files in total."
+            )
+
+    @staticmethod
+    def _open_arrow(path: str):
+        try:
+            # Scanned lazily from the memory map, like the CSV/Parquet views
+            return ds.dataset(path, format="ipc")
+        except pa.ArrowInvalid:
+            # Feather V1 files predate the IPC file format
+            return feather.read_table(path, memory_map=True)
+
+    def _cursor(self):
+        # DuckDB connections are not safe to share between threads; cursors are
+        # independent connections to the same in-memory database. Registered
+        # Arrow objects are per connection, so each cursor registers them.
+        cursor = self.connection.cursor()
+        for name, table in self.arrow_tables.items():
+            cursor.register(name, table)
+        return cursor
+
+    def get_sql_dialect(self):
+        return "duckdb"
+
+    def get_db_type(self) -> str:
+        return "DuckDB"
+
+    def get_schema(self, progress_callback=None) -> dict:
+        schema = {}
+        total = len(self.files)
+        cursor = self._cursor()
+        try:
+            for done, name in enumerate(self.files, start=1):
+                try:
+                    schema[f"{self.SCHEMA_NAME}.{name}"] = self._describe_view(
+                        cursor, name
+                    )
+                except duckdb.Error as e:
+                    self.logger.error(f"Error retrieving columns for {name}: {str(e)}")
+                if progress_callback:
+                    progress_callback(done, total)
+        finally:
+            cursor.close()
+
+        if not schema:
+            self.logger.warning("No schema information was retrieved.")
+        else:
+            self.logger.info(f"Schema retrieved with {len(schema)} tables.")
+        return schema
+
+    def _describe_view(self, cursor, name: str) -> dict:
+        columns = [
+            {
+                "name": row[0],
+                "type": row[1],
+                "nullable": row[2] == "YES",
+                "default": None,
+            }
+            for row in cursor.execute(f'DESCRIBE "{name}"').fetchall()
+        ]
+
+        limit = f" LIMIT {int(self.sample_rows)}" if self.sample_rows else ""
+        sample = cursor.execute(f'SELECT * FROM "{name}"{limit}').fetch_arrow_table()
+
+        return {
+            "columns": columns,
+            "foreign_keys": [],
+            "indexes": [],
+            "constraints": {},
+            "data_summary": self.profiler.profile_table(sample),
+        }
+
+    def execute_query(self, sql: str, max_bytes=None) -> pd.DataFrame:
+        """Stream the result as Arrow record batches until ``max_bytes`` is reached.
+
+        The statement is interrupted after QUERY_TIMEOUT_SECONDS.
+        """
+        chunks = []
+        fetched_bytes = 0
+        truncated = False
+        started = time.perf_counter()
+
+        cursor = self._cursor()
+        timer = None
+        if Config.QUERY_TIMEOUT_SECONDS and Config.QUERY_TIMEOUT_SECONDS > 0:
+            timer = threading.Timer(Config.QUERY_TIMEOUT_SECONDS, cursor.interrupt)
+            timer.daemon = True
+            timer.start()
+        try:
+            reader = cursor.execute(sql).fetch_record_batch(
+                Config.QUERY_FETCH_CHUNK_ROWS
+            )
+            for batch in reader:
+                chunk = batch.to_pandas(
+                    types_mapper=pd.ArrowDtype if Config.QUERY_ARROW_DTYPES else None
+                )
+                chunk_bytes = int(chunk.memory_usage(deep=True).sum())
+                if max_bytes is not None and fetched_bytes + chunk_bytes > max_bytes:
+                    fitting_rows = (
+                        len(chunk) * (max_bytes - fetched_bytes) // chunk_bytes
+                        if chunk_bytes
+                        else 0
+                    )
+                    chunks.append(chunk.iloc[: max(fitting_rows, 0)])
+                    truncated = True
+                    break
+                chunks.append(chunk)
+                fetched_bytes += chunk_bytes
+        finally:
+            if timer is not None:
+                timer.cancel()
+            cursor.close()
+
+        frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        frame.attrs["truncated"] = truncated
+        frame.attrs["plan_estimate"] = None
+        self.logger.info(
+            f"Query ran in {time.perf_counter() - started:.3f}s returning {len(frame)} rows."
+        )
+        return frame
+
+    def get_schema_fingerprint(self):
+        # Also the change check, so pick up added and removed files first
+        self.refresh_files()
+        digest = hashlib.sha256()
+        for name, path in sorted(self.files.items()):
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                self.logger.warning(f"Could not fingerprint {path}: {str(e)}")
+                return None
+            digest.update(f"{name}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def schema_to_string(self, schema: dict, style: Optional[str] = None) -> str:
+        if not schema:
+            self.logger.warning("Schema is empty.")
+            return ""
+
+        return SchemaFormatter.tables_to_string(schema, style)
+
+    def schema_to_documents(self, schema: dict, style: Optional[str] = None) -> dict:
+        return SchemaFormatter.tables_to_documents(schema, style)
@@ -1,30 +1,234 @@
-import pandas as pd
+import os
+from typing import Optional
 
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from app.core.data_sources.arrow_profiler import ArrowProfiler
 from app.core.data_sources.data_source import DataSource
+from app.core.data_sources.schema_formatter import SchemaFormatter
+from app.core.utils.config import Config
 from app.core.utils.logger import Logger
 
 
 class FileDataSource(DataSource):
+    """Schema and data summaries for a single CSV, Parquet or Feather file.
+
+    CSV files are streamed with pyarrow's incremental reader and only the first
+    ``FILE_SAMPLE_ROWS`` rows are parsed. Parquet and Feather schemas and row
+    counts come from file metadata; summaries are built from a memory-mapped
+    sample of the data.
+    """
+
+    # File suffix -> format
+    FORMATS = {
+        ".csv": "csv",
+        ".csv.gz": "csv",
+        ".tsv": "csv",
+        ".parquet": "parquet",
+        ".pq": "parquet",
+        ".feather": "feather",
+        ".arrow": "feather",
+    }
+
     def __init__(self, source: str):
         self.logger = Logger(self.__class__.__name__).get_logger()
         self.source = source
+        self.format = self.detect_format(source)
+        if self.format is None:
+            raise ValueError(f"Unsupported file type: {source}")
+        self.sample_rows = Config.FILE_SAMPLE_ROWS
+        self.profiler = ArrowProfiler()
+
+    @classmethod
+    def detect_format(cls, source: str):
+        lowered = source.lower()
+        for suffix, file_format in cls.FORMATS.items():
+            if lowered.endswith(suffix):
+                return file_format
+        return None
 
-    def get_schema(self) -> dict:
+    def get_schema(self, progress_callback=None) -> dict:
         try:
-            df = pd.read_csv(self.source)
-            schema = {col: str(df[col].dtype) for col in df.columns}
+            if self.format == "parquet":
+                sample, row_count, bounds = self._read_parquet()
+            elif self.format == "feather":
+                sample, row_count = self._read_feather()
+                bounds = {}
+            else:
+                sample, row_count = self._read_csv()
+                bounds = {}
+
+            data_summary = self.profiler.profile_table(sample)
+            # Footer statistics cover the whole file, not just the sample
+            for column_name, (low, high) in bounds.items():
+                if "min" in data_summary.get(column_name, {}):
+                    data_summary[column_name] = {"min": low, "max": high}
+
+            schema = {
+                "format": self.format,
+                "row_count": row_count,
+                "sampled_rows": sample.num_rows,
+                "columns": [
+                    {
+                        "name": field.name,
+                        "type": str(field.type),
+                        "nullable": field.nullable,
+                    }
+                    for field in sample.schema
+                ],
+                "data_summary": data_summary,
+            }
             self.logger.info("File schema retrieved successfully.")
+            if progress_callback:
+                progress_callback(1, 1)
             return schema
         except Exception as e:
             self.logger.error(f"Error retrieving schema from file: {str(e)}")
             raise
 
-    def schema_to_string(self, schema: dict) -> str:
+    def _read_csv(self):
+        """Stream record batches until ``sample_rows`` rows have been parsed.
+
+        Returns the sample and the exact row count when the whole file fit in the
+        sample, otherwise None.
+        """
+        parse_options = pa_csv.ParseOptions(
+            delimiter="\t" if self.source.lower().endswith(".tsv") else ","
+        )
+        batches = []
+        rows = 0
+        exhausted = True
+        with pa_csv.open_csv(self.source, parse_options=parse_options) as reader:
+            schema = reader.schema
+            while True:
+                try:
+                    batch = reader.read_next_batch()
+                except StopIteration:
+                    break
+                except pa.ArrowInvalid as e:
+                    # Types are inferred from the first block; a later block that
+                    # does not fit them ends the sample early
+                    self.logger.warning(
+                        f"Stopped sampling {self.source} after {rows} rows: {str(e)}"
+                    )
+                    exhausted = False
+                    break
+                batches.append(batch)
+                rows += batch.num_rows
+                if self.sample_rows and rows >= self.sample_rows:
+                    exhausted = False
+                    break
+
+        sample = pa.Table.from_batches(batches, schema=schema)
+        if self.sample_rows:
+            sample = sample.slice(0, self.sample_rows)
+        return sample, (rows if exhausted else None)
+
+    def _read_parquet(self):
+        """Return a sample, the row count and exact min/max bounds from the footer."""
+        parquet_file = pq.ParquetFile(self.source, memory_map=True)
+        metadata = parquet_file.metadata
+        batch = next(
+            parquet_file.iter_batches(batch_size=self.sample_rows or metadata.num_rows),
+            None,
+        )
+        sample = (
+            pa.Table.from_batches([batch])
+            if batch is not None
+            else parquet_file.schema_arrow.empty_table()
+        )
+        return sample, metadata.num_rows, self._parquet_bounds(metadata)
+
+    @staticmethod
+    def _parquet_bounds(metadata) -> dict:
+        # Columns are only bounded if every row group carries min/max statistics
+        bounds = {}
+        unbounded = set()
+        for index in range(metadata.num_row_groups):
+            row_group = metadata.row_group(index)
+            for position in range(row_group.num_columns):
+                column = row_group.column(position)
+                name = column.path_in_schema
+                statistics = column.statistics
+                if statistics is None or not statistics.has_min_max:
+                    unbounded.add(name)
+                    continue
+                low, high = bounds.get(name, (statistics.min, statistics.max))
+                bounds[name] = (min(low, statistics.min), max(high, statistics.max))
+        return {name: value for name, value in bounds.items() if name not in unbounded}
+
+    def _read_feather(self):
+        # Arrow IPC files are read zero-copy from the memory map; only the batches
+        # making up the sample are touched
+        source = pa.memory_map(self.source)
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            # Feather V1 files predate the IPC file format
+            table = feather.read_table(self.source, memory_map=True)
+            return self._limit(table), table.num_rows
+
+        row_count = 0
+        batches = []
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            if not self.sample_rows or row_count < self.sample_rows:
+                batches.append(batch)
+            row_count += batch.num_rows
+        sample = pa.Table.from_batches(batches, schema=reader.schema)
+        return self._limit(sample), row_count
+
+    def _limit(self, table: pa.Table) -> pa.Table:
+        return table.slice(0, self.sample_rows) if self.sample_rows else table
+
+    def get_schema_fingerprint(self):
+        try:
+            stat = os.stat(self.source)
+        except OSError as e:
+            self.logger.warning(f"Could not fingerprint file: {str(e)}")
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def schema_to_string(self, schema: dict, style: Optional[str] = None) -> str:
         if not schema:
             self.logger.warning("Schema is empty.")
             return ""
 
-        schema_str = "File Schema:\n"
-        for column, dtype in schema.items():
-            schema_str += f"  - {column}: {dtype}\n"
-        return schema_str
+        rows = (
+            schema["row_count"]
+            if schema.get("row_count") is not None
+            else f"more than {schema['sampled_rows']} (sampled)"
+        )
+        if (style or Config.SCHEMA_FORMAT) == "compact":
+            return f"{schema['format']} file, rows: {rows}\n" + (
+                SchemaFormatter.tables_to_string(
+                    {os.path.basename(self.source): schema}, "compact"
+                )
+            )
+
+        lines = [f"File Schema ({schema['format']}):", f"  Rows: {rows}"]
+
+        lines.append("  Columns:")
+        for column in schema.get("columns", []):
+            line = f"    - {column['name']} ({column['type']})"
+            if column.get("nullable"):
+                line += " [NULLABLE]"
+            lines.append(line)
+
+        data_summary = schema.get("data_summary", {})
+        if data_summary:
+            lines.append("  Data Summary:")
+            for col_name, summary in data_summary.items():
+                if "min" in summary and "max" in summary:
+                    lines.append(
+                        f"    - {col_name}: Min: {summary['min']}, Max: {summary['max']}"
+                    )
+                if "distinct_values" in summary:
+                    lines.append(
+                        f"    - {col_name}: Distinct Values: "
+                        f"{', '.join(map(str, summary['distinct_values']))}"
+                    )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,85 @@
+import json
+import re
+import xml.etree.ElementTree as ET
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.utils.logger import Logger
+
+
+class QueryPlanEstimator:
+    """Reads the optimizer's cost and row estimates for a statement without running it.
+
+    PostgreSQL uses ``EXPLAIN (FORMAT JSON)`` and SQL Server ``SET SHOWPLAN_XML``.
+    SQLite has no cost model, so cost and rows are unknown and its estimate is
+    ``nested_scans``: the most full table scans nested in one loop of
+    ``EXPLAIN QUERY PLAN``. Equi-joins are searched through an index (or an
+    automatic one), so more than one scan in a loop means a cross or non-equi
+    join, which still catches runaway joins in a local stand-in.
+    """
+
+    def __init__(self, engine):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.engine = engine
+
+    def estimate(self, sql: str) -> Optional[dict]:
+        """Return ``{"cost": ..., "rows": ...}`` or None if no estimate is available."""
+        dialect_name = self.engine.dialect.name
+        try:
+            # Generated SQL is sent verbatim, so '%' and ':' must not be treated
+            # as parameter markers
+            with self.engine.connect().execution_options(
+                no_parameters=True
+            ) as connection:
+                if dialect_name == "postgresql":
+                    return self._estimate_postgresql(connection, sql)
+                if dialect_name == "mssql":
+                    return self._estimate_mssql(connection, sql)
+                if dialect_name == "sqlite":
+                    return self._estimate_sqlite(connection, sql)
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Could not estimate query plan: {str(e)}")
+        return None
+
+    @staticmethod
+    def _estimate_postgresql(connection, sql):
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        root = plan[0]["Plan"]
+        return {"cost": float(root["Total Cost"]), "rows": float(root["Plan Rows"])}
+
+    @staticmethod
+    def _estimate_mssql(connection, sql):
+        # SHOWPLAN_XML must be the only statement in its batch
+        connection.exec_driver_sql("SET SHOWPLAN_XML ON")
+        try:
+            plan_xml = connection.exec_driver_sql(sql).scalar()
+        finally:
+            connection.exec_driver_sql("SET SHOWPLAN_XML OFF")
+
+        cost, rows = 0.0, 0.0
+        for element in ET.fromstring(plan_xml).iter():
+            if element.tag.endswith("StmtSimple"):
+                cost += float(element.get("StatementSubTreeCost", 0))
+                rows = max(rows, float(element.get("StatementEstRows", 0)))
+        return {"cost": cost, "rows": rows}
+
+    @staticmethod
+    def _estimate_sqlite(connection, sql):
+        # Rows are (id, parent, notused, detail); scans sharing a parent are
+        # nested loops of the same join
+        scans_per_loop = Counter(
+            row[1]
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            if re.match(r"SCAN\b", row[-1])
+            and "USING" not in row[-1]
+            and "CONSTANT ROW" not in row[-1]
+        )
+        return {
+            "cost": None,
+            "rows": None,
+            "nested_scans": max(scans_per_loop.values(), default=0),
+        }
@@ -0,0 +1,168 @@
+from typing import Optional
+
+from app.core.utils.config import Config
+
+
+class SchemaFormatter:
+    """Renders table-shaped schemas (as built by ``SQLDataSource``) for the LLM prompt.
+
+    Two styles are available: ``verbose`` (one line per column, index and
+    constraint) and ``compact``, a DDL-like form with one line per table plus
+    optional index and value lines, which uses far fewer prompt tokens on wide
+    tables. ``Config.SCHEMA_FORMAT`` picks the default.
+    """
+
+    STYLES = ("verbose", "compact")
+
+    @staticmethod
+    def tables_to_string(schema: dict, style: Optional[str] = None) -> str:
+        style = style or Config.SCHEMA_FORMAT
+        if style == "compact":
+            render = SchemaFormatter._compact_table
+        elif style == "verbose":
+            render = SchemaFormatter._verbose_table
+        else:
+            raise ValueError(f"Unsupported schema format: {style}")
+
+        return "\n".join(render(table, details) for table, details in schema.items())
+
+    @staticmethod
+    def tables_to_documents(schema: dict, style: Optional[str] = None) -> dict:
+        # One document per table so a single ALTER only re-embeds that table
+        return {
+            table: SchemaFormatter.tables_to_string({table: details}, style)
+            for table, details in schema.items()
+        }
+
+    @staticmethod
+    def _verbose_table(table: str, details: dict) -> str:
+        lines = [f"Table: {table}\n", "  Columns:\n"]
+        for column in details.get("columns", []):
+            line = f"    - {column['name']} ({column['type']})"
+            if column.get("nullable"):
+                line += " [NULLABLE]"
+            if column.get("default") is not None:
+                line += f" [DEFAULT: {column['default']}]"
+            lines.append(line + "\n")
+
+        foreign_keys = details.get("foreign_keys", [])
+        if foreign_keys:
+            lines.append("  Foreign Keys:\n")
+            lines.extend(
+                f"    - {fk['name']} -> {fk['referred_schema']}.{fk['referred_table']}"
+                f"({', '.join(fk['referred_columns'])})\n"
+                for fk in foreign_keys
+            )
+
+        indexes = details.get("indexes", [])
+        if indexes:
+            lines.append("  Indexes:\n")
+            lines.extend(
+                f"    - {idx['name']} on {', '.join(idx['column_names'])} "
+                f"[UNIQUE: {idx['unique']}]\n"
+                for idx in indexes
+            )
+
+        constraints = details.get("constraints", {})
+        if constraints:
+            pk = constraints.get("primary_key", {})
+            if pk:
+                lines.append(
+                    f"  Primary Key:\n    - {', '.join(pk['constrained_columns'])}\n"
+                )
+            unique_constraints = constraints.get("unique_constraints", [])
+            if unique_constraints:
+                lines.append("  Unique Constraints:\n")
+                lines.extend(
+                    f"    - {uc['name']} on {', '.join(uc['column_names'])}\n"
+                    for uc in unique_constraints
+                )
+
+        data_summary = details.get("data_summary", {})
+        if data_summary:
+            lines.append("  Data Summary:\n")
+            for col_name, summary in data_summary.items():
+                lines.append(f"    - {col_name}: ")
+                if "min" in summary and "max" in summary:
+                    lines.append(f"Min: {summary['min']}, Max: {summary['max']}\n")
+                if "distinct_values" in summary:
+                    lines.append(
+                        "Distinct Values: "
+                        f"{', '.join(map(str, summary['distinct_values']))}\n"
+                    )
+
+        return "".join(lines)
+
+    @staticmethod
+    def _compact_table(table: str, details: dict) -> str:
+        """``schema.table(col TYPE PK, col TYPE NOT NULL -> other.table.col, ...)``
+
+        followed by optional ``indexes:``, ``fks:`` (composite keys) and
+        ``values:`` lines.
+        """
+        constraints = details.get("constraints") or {}
+        primary_key = (constraints.get("primary_key") or {}).get(
+            "constrained_columns"
+        ) or []
+
+        # Single-column foreign keys are shown inline on the column
+        inline_fks = {}
+        composite_fks = []
+        for fk in details.get("foreign_keys", []):
+            target = (
+                f"{fk['referred_schema']}.{fk['referred_table']}"
+                if fk.get("referred_schema")
+                else fk["referred_table"]
+            )
+            if len(fk["constrained_columns"]) == 1:
+                inline_fks[fk["constrained_columns"][0]] = (
+                    f"{target}.{fk['referred_columns'][0]}"
+                )
+            else:
+                composite_fks.append(
+                    f"({','.join(fk['constrained_columns'])})->"
+                    f"{target}({','.join(fk['referred_columns'])})"
+                )
+
+        columns = []
+        for column in details.get("columns", []):
+            parts = [column["name"], str(column["type"])]
+            if primary_key == [column["name"]]:
+                parts.append("PK")
+            elif column.get("nullable") is False:
+                parts.append("NOT NULL")
+            if column.get("default") is not None:
+                parts.append(f"DEFAULT {column['default']}")
+            if column["name"] in inline_fks:
+                parts.append(f"-> {inline_fks[column['name']]}")
+            columns.append(" ".join(parts))
+
+        lines = [f"{table}({', '.join(columns)})"]
+
+        if len(primary_key) > 1:
+            lines.append(f"  pk: ({','.join(primary_key)})")
+
+        keys = [
+            f"{'UNIQUE ' if idx['unique'] else ''}({','.join(idx['column_names'])})"
+            for idx in details.get("indexes", [])
+        ] + [
+            f"UNIQUE ({','.join(uc['column_names'])})"
+            for uc in constraints.get("unique_constraints", [])
+        ]
+        if keys:
+            lines.append(f"  indexes: {', '.join(dict.fromkeys(keys))}")
+        if composite_fks:
+            lines.append(f"  fks: {', '.join(composite_fks)}")
+
+        values = []
+        for col_name, summary in (details.get("data_summary") or {}).items():
+            if summary.get("min") is not None and summary.get("max") is not None:
+                values.append(f"{col_name}={summary['min']}..{summary['max']}")
+            elif summary.get("distinct_values"):
+                values.append(
+                    f"{col_name}={'|'.join(map(str, summary['distinct_values']))}"
+                )
+        if values:
+            lines.append(f"  values: {'; '.join(values)}")
+
+        return "\n".join(lines) + "\n"
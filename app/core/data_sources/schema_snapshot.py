@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+
+
+class SchemaSnapshot:
+    """Versioned on-disk copy of an introspected schema, keyed by its source.
+
+    A snapshot is only returned when both the format version and the source's
+    fingerprint match, so any DDL change (or a format change here) triggers a
+    fresh introspection.
+    """
+
+    VERSION = 2
+
+    def __init__(self, directory: Optional[str] = None):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.directory = directory or os.path.join(Config.CACHE_DIR, "schema")
+
+    @staticmethod
+    def normalize(schema: dict) -> dict:
+        """The schema as it reads back from a snapshot.
+
+        Values JSON cannot hold (Decimal, datetime, ...) become strings and
+        tuples become lists, so a freshly introspected schema renders exactly
+        like a loaded one and prompt text and document hashes do not change.
+        """
+        return json.loads(json.dumps(schema, default=str))
+
+    def load(self, source: str, fingerprint: str) -> Optional[dict]:
+        path = self._path(source)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable schema snapshot {path}: {str(e)}")
+            return None
+
+        if snapshot.get("version") != self.VERSION:
+            self.logger.info("Schema snapshot format changed, re-introspecting.")
+            return None
+        if snapshot.get("fingerprint") != fingerprint:
+            self.logger.info("Schema fingerprint changed, re-introspecting.")
+            return None
+
+        self.logger.info(
+            f"Loaded schema snapshot with {len(snapshot['schema'])} tables."
+        )
+        return snapshot["schema"]
+
+    def save(self, source: str, fingerprint: str, schema: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        snapshot = {
+            "version": self.VERSION,
+            "fingerprint": fingerprint,
+            "created_at": time.time(),
+            "schema": self.normalize(schema),
+        }
+        # Write to a temporary file first so readers never see a partial snapshot
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self._path(source))
+        except OSError as e:
+            self.logger.error(f"Error writing schema snapshot: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.logger.info("Schema snapshot saved.")
+
+    def _path(self, source: str) -> str:
+        # Hash the source so credentials in connection URLs never reach disk
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{key}.json")
@@ -1,74 +1,127 @@
-from sqlalchemy import create_engine, inspect, text
-from sqlalchemy.exc import SQLAlchemyError
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
-from app.core.data_sources.data_source import DataSource
+import pandas as pd
+from sqlalchemy import create_engine, inspect, make_url, text
+from sqlalchemy.exc import ArgumentError, SQLAlchemyError
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.core.data_sources.catalog_introspector import CatalogIntrospector
+from app.core.data_sources.column_profiler import ColumnProfiler
+from app.core.data_sources.data_source import DataSource, QueryCostExceededError
+from app.core.data_sources.query_plan import QueryPlanEstimator
+from app.core.data_sources.schema_formatter import SchemaFormatter
+from app.core.data_sources.sql_dialect import SQLDialect
+from app.core.utils.config import Config
 from app.core.utils.logger import Logger
+from app.core.utils.resource_registry import ResourceRegistry
 
 
 class SQLDataSource(DataSource):
     def __init__(self, source: str):
         self.logger = Logger(self.__class__.__name__).get_logger()
+        self.source = source
         self.engine = self._connect_to_database(source)
+        self.profiler = ColumnProfiler(self.engine)
+        self.plan_estimator = QueryPlanEstimator(self.engine)
+
+    @staticmethod
+    def engine_options(source: str) -> dict:
+        """Pool arguments for ``create_engine``, which depend on the dialect's pool class."""
+        url = make_url(source)
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            # A single shared connection, so every thread sees the same database
+            return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+            return {
+                "pool_size": Config.DB_POOL_SIZE,
+                "max_overflow": Config.DB_MAX_OVERFLOW,
+            }
+        return {}
+
+    @staticmethod
+    def shared_engine(source: str):
+        """The process-wide engine (and connection pool) for ``source``."""
+        return ResourceRegistry.instance().get_or_create(
+            "engine",
+            source,
+            lambda: create_engine(source, **SQLDataSource.engine_options(source)),
+        )
 
     def _connect_to_database(self, source: str):
         try:
-            engine = create_engine(source)
+            engine = self.shared_engine(source)
             self.logger.info("Connected to database successfully.")
             return engine
-        except SQLAlchemyError as e:
+        except (SQLAlchemyError, ArgumentError, TypeError) as e:
             self.logger.error(f"Database connection error: {str(e)}")
             raise ValueError(f"Failed to connect to the database. Error: {e}")
 
-    def get_schema(self) -> dict:
+    def get_schema(self, progress_callback=None, max_workers=None) -> dict:
+        """Introspect and profile all user tables.
+
+        Tables are processed on up to ``max_workers`` threads (bounded by the
+        engine's pool size). ``progress_callback(done, total)`` is called from the
+        calling thread after each table completes.
+        """
         try:
             inspector = inspect(self.engine)
-            schema = {}
-            schema_names = inspector.get_schema_names()
-
-            # Filter out system or default schemas for 'SQL Server' and 'PostgreSQL'
-            filtered_schemas = [
-                schema_name
-                for schema_name in schema_names
-                if not (
-                    (
-                        self.engine.dialect.name == "mssql"
-                        and schema_name in ["master", "model", "msdb", "tempdb"]
-                    )
-                    or (
-                        self.engine.dialect.name == "postgresql"
-                        and (
-                            schema_name == "information_schema"
-                            or schema_name.startswith("pg_")
-                        )
+            filtered_schemas = self._filter_schemas(inspector.get_schema_names())
+
+            tables = None
+            catalog = CatalogIntrospector(self.engine)
+            if catalog.supports():
+                try:
+                    tables = catalog.introspect(filtered_schemas)
+                except SQLAlchemyError as e:
+                    self.logger.warning(
+                        f"Bulk catalog introspection failed, falling back to inspector: {str(e)}"
                     )
+
+            if tables is None:
+                # Introspected per table by the workers below
+                tables = {
+                    (schema_name, table_name): None
+                    for schema_name in filtered_schemas
+                    for table_name in inspector.get_table_names(schema=schema_name)
+                }
+
+            statistics = self.profiler.load_statistics(filtered_schemas)
+
+            def build(table_key):
+                return self._build_table_details(
+                    table_key[0], table_key[1], tables[table_key], statistics.get(table_key)
                 )
-            ]
 
-            for schema_name in filtered_schemas:
-                for table_name in inspector.get_table_names(schema=schema_name):
-                    columns_info = inspector.get_columns(table_name, schema=schema_name)
-                    foreign_keys = self._get_foreign_keys(schema_name, table_name)
-                    indexes = self._get_indexes(schema_name, table_name)
-                    constraints = self._get_constraints(schema_name, table_name)
-                    data_summary = self._get_data_summary(
-                        schema_name, table_name, columns_info
-                    )
+            results = {}
+            total = len(tables)
+            # Engines without a QueuePool hand out a single connection
+            pool_size = (
+                self.engine.pool.size() if isinstance(self.engine.pool, QueuePool) else 1
+            )
+            workers = min(max_workers or Config.SCHEMA_WORKERS, pool_size)
+            if workers > 1 and total > 1:
+                with ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="schema"
+                ) as executor:
+                    futures = {executor.submit(build, key): key for key in tables}
+                    for done, future in enumerate(as_completed(futures), start=1):
+                        results[futures[future]] = future.result()
+                        if progress_callback:
+                            progress_callback(done, total)
+            else:
+                for done, table_key in enumerate(tables, start=1):
+                    results[table_key] = build(table_key)
+                    if progress_callback:
+                        progress_callback(done, total)
 
-                    schema[f"{schema_name}.{table_name}"] = {
-                        "columns": [
-                            {
-                                "name": column["name"],
-                                "type": str(column["type"]),
-                                "nullable": column["nullable"],
-                                "default": column.get("default"),
-                            }
-                            for column in columns_info
-                        ],
-                        "foreign_keys": foreign_keys,
-                        "indexes": indexes,
-                        "constraints": constraints,
-                        "data_summary": data_summary,
-                    }
+            schema = {
+                f"{schema_name}.{table_name}": results[(schema_name, table_name)]
+                for schema_name, table_name in tables
+                if results[(schema_name, table_name)] is not None
+            }
 
             if not schema:
                 self.logger.warning("No schema information was retrieved.")
@@ -80,67 +133,234 @@ class SQLDataSource(DataSource):
             self.logger.error(f"Error retrieving schema: {str(e)}")
             raise
 
-    def schema_to_string(self, schema: dict) -> str:
-        if not schema:
-            self.logger.warning("Schema is empty.")
-            return ""
+    def get_sql_dialect(self):
+        return self.engine.dialect.name
+
+    def get_db_type(self) -> str:
+        return {
+            "mssql": "SQL Server",
+            "postgresql": "PostgreSQL",
+            "sqlite": "SQLite",
+            "mysql": "MySQL",
+        }.get(self.engine.dialect.name, self.engine.dialect.name)
+
+    def check_query_cost(self, sql: str):
+        """Pre-flight a statement against the configured plan cost/row thresholds.
+
+        Returns the plan estimate (None if unavailable), with ``flagged`` set when
+        a threshold is exceeded in "flag" mode; raises QueryCostExceededError in
+        "reject" mode.
+        """
+        if Config.QUERY_COST_GUARD_MODE == "off":
+            return None
+
+        estimate = self.plan_estimator.estimate(sql)
+        if estimate is None:
+            return None
+
+        reasons = []
+        if (
+            Config.QUERY_MAX_COST
+            and estimate["cost"] is not None
+            and estimate["cost"] > Config.QUERY_MAX_COST
+        ):
+            reasons.append(
+                f"estimated cost {estimate['cost']:,.0f} exceeds {Config.QUERY_MAX_COST:,.0f}"
+            )
+        if (
+            Config.QUERY_MAX_ESTIMATED_ROWS
+            and estimate["rows"] is not None
+            and estimate["rows"] > Config.QUERY_MAX_ESTIMATED_ROWS
+        ):
+            reasons.append(
+                f"estimated rows {estimate['rows']:,.0f} exceed "
+                f"{Config.QUERY_MAX_ESTIMATED_ROWS:,.0f}"
+            )
+        if (
+            Config.QUERY_MAX_NESTED_SCANS
+            and estimate.get("nested_scans", 0) > Config.QUERY_MAX_NESTED_SCANS
+        ):
+            reasons.append(
+                f"{estimate['nested_scans']} full table scans nested in one join "
+                f"exceed {Config.QUERY_MAX_NESTED_SCANS}"
+            )
+
+        estimate["flagged"] = bool(reasons)
+        if reasons:
+            message = f"Query rejected by cost guard: {'; '.join(reasons)}."
+            if Config.QUERY_COST_GUARD_MODE == "reject":
+                self.logger.warning(message)
+                raise QueryCostExceededError(message)
+            self.logger.warning(f"Query flagged by cost guard: {'; '.join(reasons)}.")
+        return estimate
+
+    def execute_query(self, sql: str, max_bytes=None) -> pd.DataFrame:
+        """Fetch ``sql`` in chunks, stopping once ``max_bytes`` of results are held.
+
+        The statement is checked by ``check_query_cost`` first and runs under a
+        QUERY_TIMEOUT_SECONDS statement timeout. Truncated results are flagged with
+        ``frame.attrs["truncated"]`` and the plan estimate is kept in
+        ``frame.attrs["plan_estimate"]``.
+        """
+        estimate = self.check_query_cost(sql)
 
-        schema_str = []
-        for table, details in schema.items():
-            table_str = f"Table: {table}\n"
-
-            columns = details.get("columns", [])
-            table_str += "  Columns:\n"
-            for column in columns:
-                table_str += f"    - {column['name']} ({column['type']})"
-                if column.get("nullable"):
-                    table_str += " [NULLABLE]"
-                if column.get("default") is not None:
-                    table_str += f" [DEFAULT: {column['default']}]"
-                table_str += "\n"
-
-            foreign_keys = details.get("foreign_keys", [])
-            if foreign_keys:
-                table_str += "  Foreign Keys:\n"
-                for fk in foreign_keys:
-                    table_str += f"    - {fk['name']} -> {fk['referred_schema']}.{fk['referred_table']}({', '.join(fk['referred_columns'])})\n"
-
-            indexes = details.get("indexes", [])
-            if indexes:
-                table_str += "  Indexes:\n"
-                for idx in indexes:
-                    table_str += f"    - {idx['name']} on {', '.join(idx['column_names'])} [UNIQUE: {idx['unique']}]\n"
-
-            constraints = details.get("constraints", {})
-            if constraints:
-                pk = constraints.get("primary_key", {})
-                if pk:
-                    table_str += f"  Primary Key:\n    - {', '.join(pk['constrained_columns'])}\n"
-                unique_constraints = constraints.get("unique_constraints", [])
-                if unique_constraints:
-                    table_str += "  Unique Constraints:\n"
-                    for uc in unique_constraints:
-                        table_str += (
-                            f"    - {uc['name']} on {', '.join(uc['column_names'])}\n"
+        chunks = []
+        fetched_bytes = 0
+        truncated = False
+        started = time.perf_counter()
+
+        # Server-side cursors where the driver supports them, so rows beyond the
+        # memory ceiling are never transferred. The SQL is passed verbatim.
+        with self.engine.connect().execution_options(
+            stream_results=True, no_parameters=True
+        ) as connection:
+            with SQLDialect.statement_timeout(connection, Config.QUERY_TIMEOUT_SECONDS):
+                for chunk in pd.read_sql(
+                    sql,
+                    connection,
+                    chunksize=Config.QUERY_FETCH_CHUNK_ROWS,
+                    dtype_backend=(
+                        "pyarrow" if Config.QUERY_ARROW_DTYPES else "numpy_nullable"
+                    ),
+                ):
+                    chunk_bytes = int(chunk.memory_usage(deep=True).sum())
+                    if max_bytes is not None and fetched_bytes + chunk_bytes > max_bytes:
+                        fitting_rows = (
+                            len(chunk) * (max_bytes - fetched_bytes) // chunk_bytes
+                            if chunk_bytes
+                            else 0
                         )
+                        chunks.append(chunk.iloc[: max(fitting_rows, 0)])
+                        truncated = True
+                        break
+                    chunks.append(chunk)
+                    fetched_bytes += chunk_bytes
 
-            data_summary = details.get("data_summary", {})
-            if data_summary:
-                table_str += "  Data Summary:\n"
-                for col_name, summary in data_summary.items():
-                    table_str += f"    - {col_name}: "
-                    if "min" in summary and "max" in summary:
-                        table_str += f"Min: {summary['min']}, Max: {summary['max']}\n"
-                    if "distinct_values" in summary:
-                        table_str += f"Distinct Values: {', '.join(map(str, summary['distinct_values']))}\n"
+        frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        frame.attrs["truncated"] = truncated
+        frame.attrs["plan_estimate"] = estimate
 
-            schema_str.append(table_str)
+        # Estimates next to actuals, for tuning the cost guard thresholds
+        self.logger.info(
+            f"Query ran in {time.perf_counter() - started:.3f}s returning {len(frame)} rows "
+            f"(estimated cost {estimate['cost'] if estimate else 'n/a'}, "
+            f"estimated rows {estimate['rows'] if estimate else 'n/a'})."
+        )
+        return frame
 
-        return "\n".join(schema_str)
+    def get_schema_fingerprint(self):
+        """Fingerprint the catalog with one cheap query per dialect."""
+        queries = {
+            "mssql": """
+                SELECT CONVERT(varchar(33), MAX(modify_date), 126), COUNT(*)
+                FROM sys.objects
+                WHERE is_ms_shipped = 0
+            """,
+            "postgresql": """
+                SELECT
+                    (SELECT md5(string_agg(
+                        c.oid::text || ':' || c.relname || ':' || a.attname || ':'
+                        || a.atttypid::text || ':' || a.atttypmod::text || ':'
+                        || a.attnotnull::text,
+                        ',' ORDER BY c.oid, a.attnum))
+                     FROM pg_class c
+                     JOIN pg_namespace n ON n.oid = c.relnamespace
+                     JOIN pg_attribute a
+                        ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+                     WHERE c.relkind IN ('r', 'p', 'i')
+                        AND n.nspname <> 'information_schema'
+                        AND n.nspname NOT LIKE 'pg\\_%'),
+                    (SELECT md5(string_agg(oid::text || ':' || conname, ',' ORDER BY oid))
+                     FROM pg_constraint)
+            """,
+            "sqlite": """
+                SELECT group_concat(type || ':' || name || ':' || coalesce(sql, ''), ';')
+                FROM (SELECT * FROM sqlite_master ORDER BY type, name)
+            """,
+        }
+        query = queries.get(self.engine.dialect.name)
+        if query is None:
+            return None
 
-    def _get_foreign_keys(self, schema_name, table_name):
         try:
-            inspector = inspect(self.engine)
+            with self.engine.connect() as connection:
+                row = connection.execute(text(query)).fetchone()
+        except SQLAlchemyError as e:
+            self.logger.warning(f"Could not fingerprint schema: {str(e)}")
+            return None
+
+        payload = "|".join([self.engine.dialect.name, *map(str, row)])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _build_table_details(self, schema_name, table_name, details, statistics):
+        """Introspect (if needed) and profile one table; failures only skip that table."""
+        try:
+            if details is None:
+                details = self._introspect_table(
+                    inspect(self.engine), schema_name, table_name
+                )
+        except SQLAlchemyError as e:
+            self.logger.error(
+                f"Error retrieving columns for {schema_name}.{table_name}: {str(e)}"
+            )
+            return None
+
+        details["data_summary"] = self._get_data_summary(
+            schema_name, table_name, details["columns"], statistics
+        )
+        return details
+
+    def _filter_schemas(self, schema_names):
+        # Filter out system or default schemas for 'SQL Server' and 'PostgreSQL'
+        return [
+            schema_name
+            for schema_name in schema_names
+            if not (
+                (
+                    self.engine.dialect.name == "mssql"
+                    and schema_name in ["master", "model", "msdb", "tempdb"]
+                )
+                or (
+                    self.engine.dialect.name == "postgresql"
+                    and (
+                        schema_name == "information_schema"
+                        or schema_name.startswith("pg_")
+                    )
+                )
+            )
+        ]
+
+    def _introspect_table(self, inspector, schema_name, table_name):
+        """Per-table inspector path, used for dialects without bulk introspection."""
+        columns_info = inspector.get_columns(table_name, schema=schema_name)
+        return {
+            "columns": [
+                {
+                    "name": column["name"],
+                    "type": str(column["type"]),
+                    "nullable": column["nullable"],
+                    "default": column.get("default"),
+                }
+                for column in columns_info
+            ],
+            "foreign_keys": self._get_foreign_keys(schema_name, table_name, inspector),
+            "indexes": self._get_indexes(schema_name, table_name, inspector),
+            "constraints": self._get_constraints(schema_name, table_name, inspector),
+        }
+
+    def schema_to_string(self, schema: dict, style: Optional[str] = None) -> str:
+        if not schema:
+            self.logger.warning("Schema is empty.")
+            return ""
+
+        return SchemaFormatter.tables_to_string(schema, style)
+
+    def schema_to_documents(self, schema: dict, style: Optional[str] = None) -> dict:
+        return SchemaFormatter.tables_to_documents(schema, style)
+
+    def _get_foreign_keys(self, schema_name, table_name, inspector=None):
+        try:
+            inspector = inspector or inspect(self.engine)
             foreign_keys = inspector.get_foreign_keys(table_name, schema=schema_name)
             return [
                 {
@@ -158,9 +378,9 @@ class SQLDataSource(DataSource):
             )
             return []
 
-    def _get_indexes(self, schema_name, table_name):
+    def _get_indexes(self, schema_name, table_name, inspector=None):
         try:
-            inspector = inspect(self.engine)
+            inspector = inspector or inspect(self.engine)
             indexes = inspector.get_indexes(table_name, schema=schema_name)
             return [
                 {
@@ -176,9 +396,9 @@ class SQLDataSource(DataSource):
             )
             return []
 
-    def _get_constraints(self, schema_name, table_name):
+    def _get_constraints(self, schema_name, table_name, inspector=None):
         try:
-            inspector = inspect(self.engine)
+            inspector = inspector or inspect(self.engine)
             pk_constraint = inspector.get_pk_constraint(table_name, schema=schema_name)
             try:
                 unique_constraints = inspector.get_unique_constraints(
@@ -197,61 +417,8 @@ class SQLDataSource(DataSource):
             )
             return {}
 
-    def _get_data_summary(self, schema_name, table_name, columns_info):
+    def _get_data_summary(self, schema_name, table_name, columns_info, statistics=None):
         """Get data summary for each column in the table."""
-        data_summary = {}
-        try:
-            with self.engine.connect() as connection:
-                for column in columns_info:
-                    column_name = column["name"]
-                    column_type = str(column["type"])
-
-                    quoted_column_name = self.engine.dialect.identifier_preparer.quote(
-                        column_name
-                    )
-
-                    if (
-                        "INT" in column_type
-                        or "NUMERIC" in column_type
-                        or "FLOAT" in column_type
-                        or "DECIMAL" in column_type
-                    ):
-                        # Numeric columns: Get min and max values
-                        min_max_query = text(
-                            f"SELECT MIN({quoted_column_name}) AS min_value, MAX({quoted_column_name}) AS max_value FROM {schema_name}.{table_name}"
-                        )
-                        result = connection.execute(min_max_query).fetchone()
-                        # Use integer indexing because result is a tuple
-                        data_summary[column_name] = {
-                            "min": result[0],
-                            "max": result[1],
-                        }
-                    elif "CHAR" in column_type or "TEXT" in column_type:
-                        if self.engine.dialect.name == "postgresql":
-                            # PostgreSQL uses LIMIT
-                            distinct_query = text(
-                                f"SELECT DISTINCT {quoted_column_name} FROM {schema_name}.{table_name} LIMIT 10"
-                            )
-                        elif self.engine.dialect.name == "mssql":
-                            # SQL Server uses TOP
-                            distinct_query = text(
-                                f"SELECT DISTINCT TOP 10 {quoted_column_name} FROM {schema_name}.{table_name}"
-                            )
-                        else:
-                            # Default fallback, if needed
-                            distinct_query = text(
-                                f"SELECT DISTINCT {quoted_column_name} FROM {schema_name}.{table_name} LIMIT 10"
-                            )
-
-                        result = connection.execute(distinct_query).fetchall()
-                        # Use integer indexing for each row
-                        data_summary[column_name] = {
-                            "distinct_values": [row[0] for row in result],
-                        }
-
-        except SQLAlchemyError as e:
-            self.logger.error(
-                f"Error retrieving data summary for {schema_name}.{table_name}: {str(e)}"
-            )
-
-        return data_summary
+        return self.profiler.profile_table(
+            schema_name, table_name, columns_info, statistics
+        )
@@ -0,0 +1,69 @@
+import time
+from contextlib import contextmanager
+
+
+class SQLDialect:
+    """Small helpers for dialect-specific SQL that SQLAlchemy does not cover."""
+
+    @staticmethod
+    def quote_table(dialect, schema_name: str, table_name: str) -> str:
+        preparer = dialect.identifier_preparer
+        if schema_name:
+            return f"{preparer.quote_schema(schema_name)}.{preparer.quote(table_name)}"
+        return preparer.quote(table_name)
+
+    @staticmethod
+    def select_limited(dialect, columns_sql: str, from_sql: str, limit: int) -> str:
+        if dialect.name == "mssql":
+            return f"SELECT TOP ({int(limit)}) {columns_sql} FROM {from_sql}"
+        return f"SELECT {columns_sql} FROM {from_sql} LIMIT {int(limit)}"
+
+    @staticmethod
+    @contextmanager
+    def statement_timeout(connection, seconds: float):
+        """Apply a server-side (or driver-level) timeout to statements run inside the block.
+
+        PostgreSQL uses ``SET LOCAL statement_timeout``, SQL Server the pyodbc
+        query timeout and SQLite a progress handler that interrupts the running
+        statement once the deadline passes. Other dialects run without a timeout.
+        """
+        if not seconds or seconds <= 0:
+            yield
+            return
+
+        dialect_name = connection.dialect.name
+        driver_connection = connection.connection.driver_connection
+
+        if dialect_name == "postgresql":
+            connection.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {max(1, int(seconds * 1000))}"
+            )
+            try:
+                yield
+            finally:
+                try:
+                    connection.exec_driver_sql("SET LOCAL statement_timeout TO DEFAULT")
+                except Exception:
+                    # The transaction is aborted after a cancelled statement;
+                    # SET LOCAL is discarded on rollback anyway.
+                    pass
+        elif dialect_name == "mssql" and hasattr(driver_connection, "timeout"):
+            previous = driver_connection.timeout
+            driver_connection.timeout = max(1, int(round(seconds)))
+            try:
+                yield
+            finally:
+                driver_connection.timeout = previous
+        elif dialect_name == "sqlite" and hasattr(
+            driver_connection, "set_progress_handler"
+        ):
+            deadline = time.monotonic() + seconds
+            driver_connection.set_progress_handler(
+                lambda: 1 if time.monotonic() > deadline else 0, 10000
+            )
+            try:
+                yield
+            finally:
+                driver_connection.set_progress_handler(None, 0)
+        else:
+            yield
@@ -0,0 +1,255 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import pandas as pd
+
+from app.core.execution.query_result_cache import QueryResultCache
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+from app.core.utils.resource_registry import ResourceRegistry
+from app.core.utils.tracer import Tracer
+
+
+class AggregateStore:
+    """Local Parquet copies of the aggregate queries dashboards run most.
+
+    Every aggregate query that reaches the warehouse is recorded by normalized
+    SQL with its run count and runtime. Once a query has run ``min_runs`` times
+    averaging at least ``min_seconds`` and returns at most ``max_rows`` rows, its
+    result is written to a Parquet file and later runs of the same SQL are read
+    from there. A copy is dropped when the source's schema fingerprint changes
+    or after ``ttl_seconds``, which bounds how stale the data can get; the next
+    warehouse run materializes it again.
+    """
+
+    # How long a computed source fingerprint is trusted before re-checking
+    FINGERPRINT_CHECK_SECONDS = 60
+
+    def __init__(
+        self,
+        source: str,
+        directory: str,
+        fingerprint=None,
+        min_runs: int = 3,
+        min_seconds: float = 1.0,
+        max_rows: int = 100000,
+        ttl_seconds: float = 3600,
+    ):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.tracer = Tracer.instance()
+        self.source = source
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.min_runs = min_runs
+        self.min_seconds = min_seconds
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._fingerprint_checked = 0.0
+        self._stats = {"hits": 0, "misses": 0, "materialized": 0, "seconds_avoided": 0.0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(
+            os.path.join(directory, "aggregates.sqlite3"), check_same_thread=False
+        )
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS query_usage (
+                key TEXT PRIMARY KEY,
+                sql TEXT NOT NULL,
+                runs INTEGER NOT NULL,
+                total_seconds REAL NOT NULL,
+                rows INTEGER NOT NULL,
+                last_run REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS materialized (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                fingerprint TEXT,
+                created_at REAL NOT NULL,
+                source_seconds REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            );
+            """
+        )
+        self._db.commit()
+
+    @classmethod
+    def shared(cls, source: str, data_source) -> Optional["AggregateStore"]:
+        """The process-wide store for ``source``, or ``None`` when it does not apply.
+
+        Only warehouse-backed sources (those with an ``engine``) benefit; file
+        sources are already queried locally.
+        """
+        if not Config.AGGREGATE_STORE_ENABLED:
+            return None
+        if getattr(data_source, "engine", None) is None:
+            return None
+        return ResourceRegistry.instance().get_or_create(
+            "aggregate_store",
+            source,
+            lambda: cls(
+                source,
+                os.path.join(
+                    Config.CACHE_DIR,
+                    "aggregates",
+                    hashlib.sha256(source.encode("utf-8")).hexdigest()[:16],
+                ),
+                fingerprint=data_source.get_schema_fingerprint,
+                min_runs=Config.AGGREGATE_MIN_RUNS,
+                min_seconds=Config.AGGREGATE_MIN_SECONDS,
+                max_rows=Config.AGGREGATE_MAX_ROWS,
+                ttl_seconds=Config.AGGREGATE_TTL_SECONDS,
+            ),
+        )
+
+    def key(self, sql: str) -> str:
+        return hashlib.sha256(
+            QueryResultCache.normalize_sql(sql).encode("utf-8")
+        ).hexdigest()
+
+    def current_fingerprint(self) -> Optional[str]:
+        if self.fingerprint is None:
+            return None
+        now = time.monotonic()
+        if now - self._fingerprint_checked > self.FINGERPRINT_CHECK_SECONDS:
+            try:
+                self._fingerprint = self.fingerprint()
+            except Exception as e:
+                self.logger.warning(f"Could not fingerprint the source: {str(e)}")
+                self._fingerprint = None
+            self._fingerprint_checked = now
+        return self._fingerprint
+
+    def get(self, sql: str) -> Optional[pd.DataFrame]:
+        """Return the materialized result of ``sql`` if there is a fresh one.
+
+        The copy's creation time (epoch seconds) is in ``frame.attrs["materialized_at"]``.
+        """
+        key = self.key(sql)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT path, fingerprint, created_at, source_seconds "
+                "FROM materialized WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        frame = None
+        if row is not None:
+            path, fingerprint, created_at, source_seconds = row
+            current = self.current_fingerprint()
+            if time.time() - created_at > self.ttl_seconds or (
+                current is not None and fingerprint != current
+            ):
+                self._drop(key, path)
+            else:
+                try:
+                    frame = pd.read_parquet(path)
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"Dropping unreadable aggregate {path}: {str(e)}")
+                    self._drop(key, path)
+
+        with self._lock:
+            if frame is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats["hits"] += 1
+                self._stats["seconds_avoided"] += source_seconds
+                self._db.execute(
+                    "UPDATE materialized SET hits = hits + 1 WHERE key = ?", (key,)
+                )
+                self._db.commit()
+
+        if frame is None:
+            self.tracer.increment("aggregate_store_misses")
+            return None
+        frame.attrs["materialized_at"] = created_at
+        self.tracer.increment("aggregate_store_hits")
+        self.tracer.increment("aggregate_store_warehouse_seconds_avoided", source_seconds)
+        return frame
+
+    def record(self, sql: str, seconds: float, frame: pd.DataFrame):
+        """Log a warehouse run of ``sql`` and materialize it once it is hot enough."""
+        key = self.key(sql)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO query_usage (key, sql, runs, total_seconds, rows, last_run) "
+                "VALUES (?, ?, 1, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET runs = runs + 1, "
+                "total_seconds = total_seconds + excluded.total_seconds, "
+                "rows = excluded.rows, last_run = excluded.last_run",
+                (
+                    key,
+                    QueryResultCache.normalize_sql(sql),
+                    seconds,
+                    len(frame),
+                    time.time(),
+                ),
+            )
+            self._db.commit()
+            runs, total_seconds = self._db.execute(
+                "SELECT runs, total_seconds FROM query_usage WHERE key = ?", (key,)
+            ).fetchone()
+
+        average_seconds = total_seconds / runs
+        if (
+            runs >= self.min_runs
+            and average_seconds >= self.min_seconds
+            and len(frame) <= self.max_rows
+        ):
+            self._materialize(key, frame, average_seconds)
+
+    def _materialize(self, key: str, frame: pd.DataFrame, source_seconds: float):
+        path = os.path.join(self.directory, f"{key}.parquet")
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        fingerprint = self.current_fingerprint()
+        try:
+            frame.to_parquet(temporary_path, index=False)
+            os.replace(temporary_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            # e.g. duplicate or non-string column names
+            self.logger.warning(f"Could not materialize aggregate: {str(e)}")
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO materialized "
+                "(key, path, fingerprint, created_at, source_seconds, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, path, fingerprint, time.time(), source_seconds),
+            )
+            self._db.commit()
+            self._stats["materialized"] += 1
+        self.tracer.increment("aggregate_store_materialized")
+        self.logger.info(
+            f"Materialized aggregate ({len(frame)} rows, {source_seconds:.2f}s on "
+            f"the warehouse) to {path}."
+        )
+
+    def _drop(self, key: str, path: str):
+        with self._lock:
+            self._db.execute("DELETE FROM materialized WHERE key = ?", (key,))
+            self._db.commit()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["stored"] = self._db.execute(
+                "SELECT COUNT(*) FROM materialized"
+            ).fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+        stats["seconds_avoided"] = round(stats["seconds_avoided"], 3)
+        return stats
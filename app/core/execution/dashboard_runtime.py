@@ -0,0 +1,201 @@
+import builtins
+import os
+import time
+from typing import List, Optional
+
+import pandas as pd
+import streamlit as st
+
+from app.core.data_sources.data_source import QueryCostExceededError
+from app.core.execution.aggregate_store import AggregateStore
+from app.core.execution.query_result_cache import QueryResultCache
+from app.core.execution.query_shaper import QueryShaper
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+from app.core.utils.tracer import Tracer
+
+
+class _ReportingStreamlit:
+    """Forwards to ``streamlit``, recording what the dashboard passes to st.error/st.exception."""
+
+    def __init__(self, errors: List[str]):
+        self._errors = errors
+
+    def error(self, body, *args, **kwargs):
+        self._errors.append(str(body))
+        return st.error(body, *args, **kwargs)
+
+    def exception(self, exception, *args, **kwargs):
+        self._errors.append(f"{type(exception).__name__}: {str(exception)}")
+        return st.exception(exception, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(st, name)
+
+
+class DashboardRuntime:
+    """Executes generated dashboard code against a shared engine and result cache.
+
+    Generated code runs in a namespace pre-populated with the data source's
+    pooled ``engine`` and a ``run_query(sql)`` helper, so it never creates its
+    own engine and repeated SQL is served from ``result_cache``. Errors the
+    code reports itself (``st.error``/``st.exception``, typically from its own
+    try/except blocks) are collected in ``errors``.
+    """
+
+    def __init__(
+        self,
+        data_source,
+        result_cache: QueryResultCache,
+        aggregate_store: Optional[AggregateStore] = None,
+    ):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.tracer = Tracer.instance()
+        self.data_source = data_source
+        self.result_cache = result_cache
+        self.aggregate_store = aggregate_store
+        self.shaper = QueryShaper(data_source.get_sql_dialect(), Config.QUERY_MAX_ROWS)
+        self.memory_limit_bytes = int(Config.DASHBOARD_MEMORY_LIMIT_MB * 1024 * 1024)
+        self.query_log: List[dict] = []
+        self.notices: List[str] = []
+        self.errors: List[str] = []
+        self._streamlit = _ReportingStreamlit(self.errors)
+        self.bytes_fetched = 0
+
+    def run_query(self, sql: str) -> pd.DataFrame:
+        with self.tracer.span("sql") as span:
+            frame = self._run_query(sql)
+            entry = self.query_log[-1]
+            span.set(
+                sql=entry["sql"][:200],
+                rows=entry["rows"],
+                cached=entry["cached"],
+                materialized=entry["materialized"],
+                truncated=entry["truncated"],
+            )
+        return frame
+
+    def _run_query(self, sql: str) -> pd.DataFrame:
+        started = time.perf_counter()
+        shaped_sql, limited = self.shaper.shape(sql)
+
+        frame = self.result_cache.get(shaped_sql)
+        cached = frame is not None
+        materialized = False
+        if not cached:
+            aggregate = (
+                self.aggregate_store is not None
+                and not limited
+                and self.shaper.is_aggregate_sql(shaped_sql)
+            )
+            if aggregate:
+                frame = self.aggregate_store.get(shaped_sql)
+                materialized = frame is not None
+
+            if frame is None:
+                remaining_bytes = max(self.memory_limit_bytes - self.bytes_fetched, 0)
+                warehouse_started = time.perf_counter()
+                try:
+                    frame = self.data_source.execute_query(
+                        shaped_sql, max_bytes=remaining_bytes
+                    )
+                except QueryCostExceededError as e:
+                    # Recorded here as well, since generated code may catch it
+                    self._record_rejection(shaped_sql, started, e)
+                    raise
+                if aggregate and not frame.attrs.get("truncated"):
+                    self.aggregate_store.record(
+                        shaped_sql, time.perf_counter() - warehouse_started, frame
+                    )
+            # Results cut short by this dashboard's memory budget are not reusable
+            if not frame.attrs.get("truncated"):
+                self.result_cache.put(shaped_sql, frame)
+
+        truncated = bool(frame.attrs.get("truncated"))
+        if truncated:
+            self.notices.append(
+                f"Results were truncated to {len(frame):,} rows to stay within the "
+                f"{Config.DASHBOARD_MEMORY_LIMIT_MB:g} MB dashboard memory limit."
+            )
+        elif limited and len(frame) > self.shaper.max_rows:
+            frame = frame.iloc[: self.shaper.max_rows]
+            truncated = True
+            self.notices.append(
+                f"Results were limited to the first {self.shaper.max_rows:,} rows."
+            )
+        materialized_at = frame.attrs.get("materialized_at")
+        if materialized_at is not None:
+            self.notices.append(
+                "Some results were served from a local copy refreshed at "
+                f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(materialized_at))}."
+            )
+        self.bytes_fetched += int(frame.memory_usage(deep=True).sum())
+
+        elapsed = time.perf_counter() - started
+        estimate = frame.attrs.get("plan_estimate") or {}
+        self.query_log.append(
+            {
+                "sql": QueryResultCache.normalize_sql(shaped_sql),
+                "seconds": round(elapsed, 4),
+                "rows": len(frame),
+                "cached": cached,
+                "materialized": materialized,
+                "truncated": truncated,
+                "estimated_cost": estimate.get("cost"),
+                "estimated_rows": estimate.get("rows"),
+                "flagged": estimate.get("flagged", False),
+                "rejected": False,
+            }
+        )
+        if cached:
+            served = "served from cache"
+        elif materialized:
+            served = "served from local aggregate"
+        else:
+            served = "executed"
+        self.logger.info(f"Query {served} in {elapsed:.3f}s ({len(frame)} rows).")
+        return frame
+
+    def _record_rejection(self, sql: str, started: float, error: Exception):
+        self.notices.append(f"{str(error)} Try narrowing the question.")
+        self.query_log.append(
+            {
+                "sql": QueryResultCache.normalize_sql(sql),
+                "seconds": round(time.perf_counter() - started, 4),
+                "rows": 0,
+                "cached": False,
+                "materialized": False,
+                "truncated": False,
+                "estimated_cost": None,
+                "estimated_rows": None,
+                "flagged": True,
+                "rejected": True,
+            }
+        )
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # ``import streamlit as st`` in generated code gets the reporting wrapper
+        if name == "streamlit" and level == 0:
+            return self._streamlit
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    def namespace(self) -> dict:
+        return {
+            "__name__": "__dashboard__",
+            "__builtins__": {**vars(builtins), "__import__": self._import},
+            "os": os,
+            "pd": pd,
+            "st": self._streamlit,
+            "engine": getattr(self.data_source, "engine", None),
+            "run_query": self.run_query,
+        }
+
+    def execute(self, code: str):
+        self.query_log = []
+        self.notices = []
+        self.errors = []
+        self.bytes_fetched = 0
+        self._streamlit = _ReportingStreamlit(self.errors)
+        with self.tracer.span("code_execution") as span:
+            exec(code, self.namespace())
+            span.set(queries=len(self.query_log), errors=len(self.errors))
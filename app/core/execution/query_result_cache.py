@@ -0,0 +1,42 @@
+import re
+import threading
+from typing import Optional
+
+import pandas as pd
+from cachetools import TTLCache
+
+
+class QueryResultCache:
+    """TTL-bounded cache of query results keyed by normalized SQL.
+
+    The cache is bounded by the in-memory size of the cached frames, not their
+    count; a frame larger than ``max_bytes`` on its own is not cached.
+    """
+
+    def __init__(self, max_bytes: int = 1024 * 1024 * 1024, ttl_seconds: float = 600):
+        # Entries are (frame, bytes) so sizes are measured once, on put
+        self._cache = TTLCache(
+            maxsize=max_bytes, ttl=ttl_seconds, getsizeof=lambda entry: entry[1]
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_sql(sql: str) -> str:
+        return re.sub(r"\s+", " ", sql).strip().rstrip(";").strip()
+
+    def get(self, sql: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._cache.get(self.normalize_sql(sql))
+        # Hand out copies so one dashboard cannot mutate another's data
+        return entry[0].copy() if entry is not None else None
+
+    def put(self, sql: str, frame: pd.DataFrame):
+        size = int(frame.memory_usage(deep=True).sum())
+        if size > self._cache.maxsize:
+            return
+        with self._lock:
+            self._cache[self.normalize_sql(sql)] = (frame.copy(), size)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
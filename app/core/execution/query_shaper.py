@@ -0,0 +1,79 @@
+from typing import Optional, Tuple
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+from app.core.utils.logger import Logger
+
+
+class QueryShaper:
+    """Pushes a row limit into generated SELECT statements before they run.
+
+    Only plain, non-aggregating SELECTs without an existing ``TOP``/``LIMIT`` are
+    rewritten; the limit is ``max_rows + 1`` so callers can tell when a result
+    was truncated. Statements that cannot be parsed are returned unchanged.
+    """
+
+    # SQLAlchemy dialect name -> sqlglot dialect
+    DIALECTS = {
+        "mssql": "tsql",
+        "postgresql": "postgres",
+        "sqlite": "sqlite",
+        "mysql": "mysql",
+        "duckdb": "duckdb",
+    }
+
+    def __init__(self, dialect_name: Optional[str], max_rows: int):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.dialect = self.DIALECTS.get(dialect_name or "")
+        self.max_rows = max_rows
+
+    def shape(self, sql: str) -> Tuple[str, bool]:
+        """Return ``(sql, limited)`` where ``limited`` says a limit was pushed down."""
+        if self.dialect is None or not self.max_rows:
+            return sql, False
+
+        try:
+            statements = sqlglot.parse(sql, read=self.dialect)
+        except SqlglotError as e:
+            self.logger.warning(f"Could not parse generated SQL, running as-is: {str(e)}")
+            return sql, False
+
+        if len(statements) != 1 or not isinstance(statements[0], exp.Select):
+            return sql, False
+
+        select = statements[0]
+        if (
+            any(select.args.get(arg) for arg in ("limit", "fetch", "offset"))
+            or self.is_aggregate(select)
+        ):
+            return sql, False
+
+        limited_sql = select.limit(self.max_rows + 1).sql(dialect=self.dialect)
+        return limited_sql, True
+
+    def is_aggregate_sql(self, sql: str) -> bool:
+        """Whether ``sql`` is a single aggregating SELECT (e.g. a GROUP BY)."""
+        if self.dialect is None:
+            return False
+        try:
+            statements = sqlglot.parse(sql, read=self.dialect)
+        except SqlglotError:
+            return False
+        return (
+            len(statements) == 1
+            and isinstance(statements[0], exp.Select)
+            and self.is_aggregate(statements[0])
+        )
+
+    @staticmethod
+    def is_aggregate(select: exp.Select) -> bool:
+        if select.args.get("group"):
+            return True
+        # Aggregates used as window functions do not reduce the row count
+        return any(
+            not isinstance(agg.parent, exp.Window)
+            for projection in select.expressions
+            for agg in projection.find_all(exp.AggFunc)
+        )
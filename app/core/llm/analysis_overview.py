@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+
+
+class AnalysisOverview:
+    """Generates the database overview once per schema fingerprint, off the UI thread.
+
+    The finished overview is persisted to disk and shared by every session; while
+    it is being generated, the partially streamed text is available to callers.
+    """
+
+    RETRY_AFTER_SECONDS = 60
+
+    def __init__(self, llm_service, directory: Optional[str] = None):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.llm_service = llm_service
+        self.directory = directory or os.path.join(Config.CACHE_DIR, "overview")
+        self._lock = threading.Lock()
+        self._key = None
+        self._text = ""
+        self._ready = False
+        self._error = None
+        self._failed_at = None
+        self._worker = None
+
+    def status(self) -> dict:
+        """Return ``{"text", "ready", "error"}``, starting generation if needed."""
+        key = self._current_key()
+
+        with self._lock:
+            if key != self._key:
+                self._key = key
+                self._text, self._ready, self._error = "", False, None
+                self._failed_at = None
+                cached = self._load(key)
+                if cached is not None:
+                    self._text, self._ready = cached, True
+
+            retry_due = (
+                self._failed_at is None
+                or time.monotonic() - self._failed_at > self.RETRY_AFTER_SECONDS
+            )
+            if not self._ready and retry_due and not self._worker_alive():
+                self._error, self._failed_at = None, None
+                self._worker = threading.Thread(
+                    target=self._generate, args=(key,), daemon=True
+                )
+                self._worker.start()
+
+            return {"text": self._text, "ready": self._ready, "error": self._error}
+
+    def _worker_alive(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def _generate(self, key: str):
+        self.logger.info("Generating database overview in the background...")
+        text = ""
+        try:
+            for token in self.llm_service.stream_analysis_description():
+                text += token
+                with self._lock:
+                    if self._key != key:
+                        return
+                    self._text = text
+        except Exception as e:
+            self.logger.error(f"Error generating analysis description: {str(e)}")
+            with self._lock:
+                if self._key == key:
+                    self._error = str(e)
+                    self._failed_at = time.monotonic()
+            return
+
+        text = text.strip()
+        self._save(key, text)
+        with self._lock:
+            if self._key == key:
+                self._text, self._ready = text, True
+        self.logger.info("Database overview generated and saved.")
+
+    def _current_key(self) -> str:
+        identity = "\0".join(
+            [
+                self.llm_service.data_source.source,
+                self.llm_service.model_name,
+                self.llm_service.schema_fingerprint,
+            ]
+        )
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+    def _load(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["text"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable overview cache: {str(e)}")
+            return None
+
+    def _save(self, key: str, text: str):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{self._path(key)}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"text": text, "created_at": time.time()}, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            self.logger.error(f"Error saving database overview: {str(e)}")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
@@ -1,52 +1,244 @@
-from typing import List
-
-import chromadb
-from sentence_transformers import SentenceTransformer
+import hashlib
+import os
+from typing import Dict, List, Optional
 
+from app.core.llm.embedding_backend import EmbeddingBackend
+from app.core.llm.embedding_cache import EmbeddingCache
+from app.core.llm.lexical_index import LexicalIndex
+from app.core.utils.config import Config
 from app.core.utils.logger import Logger
+from app.core.utils.resource_registry import ResourceRegistry
+from app.core.utils.tracer import Tracer
 
 
 class ChromaService:
-    def __init__(self, collection_name="schema_collection"):
+    # Candidates fetched from each index before fusion, per requested result
+    CANDIDATE_MULTIPLIER = 4
+
+    def __init__(
+        self,
+        collection_name="schema_collection",
+        path="chromadb",
+        model_name="all-MiniLM-L6-v2",
+    ):
         self.logger = Logger(self.__class__.__name__).get_logger()
+        self.tracer = Tracer.instance()
 
-        self.client = chromadb.PersistentClient(path="chromadb")
+        registry = ResourceRegistry.instance()
+        self.client = registry.get_or_create(
+            "vector_client", path, lambda: self._create_client(path)
+        )
         self.collection = self.client.get_or_create_collection(name=collection_name)
-        self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
 
-    def add_schema_vectors(self, schema_data: List[str]):
-        try:
-            embeddings = self.embedding_model.encode(
-                schema_data, convert_to_tensor=False
-            ).tolist()
+        # Rebuilt in memory on the first sync in each process, then kept in step
+        # with the collection
+        self.lexical_index = (
+            registry.get_or_create(
+                "lexical_index", (path, collection_name), LexicalIndex
+            )
+            if Config.SCHEMA_LEXICAL_SEARCH
+            else None
+        )
 
-            ids = [f"doc_{i}" for i in range(len(schema_data))]
+        # The encoder is loaded on first use; an already-populated collection
+        # queried with cached embeddings never needs it
+        self.model_name = model_name
+        # Vectors from different backends are not interchangeable, so caches and
+        # stored vectors are tagged with this key
+        self.embedding_key = EmbeddingBackend.cache_key(model_name)
+        self.batch_size = Config.EMBEDDING_BATCH_SIZE
+        self._embedding_backend = None
+        self.embedding_cache = registry.get_or_create(
+            "embedding_cache",
+            self.embedding_key,
+            lambda: EmbeddingCache(
+                self.embedding_key,
+                max_entries=Config.EMBEDDING_CACHE_SIZE,
+                cache_dir=(
+                    os.path.join(Config.CACHE_DIR, "embeddings")
+                    if Config.EMBEDDING_DISK_CACHE
+                    else None
+                ),
+                max_disk_entries=Config.EMBEDDING_DISK_CACHE_MAX_ENTRIES,
+            ),
+        )
 
-            self.logger.info("Adding schema vectors to ChromaDB collection...")
+    @staticmethod
+    def _create_client(path: str):
+        # Imported on first use: chromadb is slow to import
+        import chromadb
 
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=schema_data,
+        return chromadb.PersistentClient(path=path)
+
+    @property
+    def embedding_backend(self) -> EmbeddingBackend:
+        if self._embedding_backend is None:
+            self._embedding_backend = ResourceRegistry.instance().get_or_create(
+                "embedding_backend",
+                self.embedding_key,
+                lambda: EmbeddingBackend.create(self.model_name),
             )
+        return self._embedding_backend
 
-            self.logger.info("Schema vectors added to ChromaDB successfully.")
+    def load_encoder(self) -> EmbeddingBackend:
+        """Load the embedding model now and run one encode, so the first query does not pay for it."""
+        backend = self.embedding_backend
+        # Bypasses the cache: the point is the model's first (slow) inference
+        backend.encode(["warmup"])
+        return backend
 
-        except Exception as e:
-            self.logger.error("Error adding schema vectors to ChromaDB: %s", str(e))
+    def encode(self, texts: List[str], remember: bool = True) -> List[List[float]]:
+        """Embed ``texts``, serving repeats from the cache and encoding misses in batches."""
+        with self.tracer.span("embedding", texts=len(texts)) as span:
+            vectors = self.embedding_cache.get_many(texts, memory=remember)
+            missing = [
+                position for position, vector in enumerate(vectors) if vector is None
+            ]
+            span.set(encoded=len(missing))
+
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start : start + self.batch_size]
+                batch_texts = [texts[position] for position in batch]
+                encoded = self.embedding_backend.encode(
+                    batch_texts, batch_size=self.batch_size
+                )
+                self.embedding_cache.put_many(batch_texts, encoded, memory=remember)
+                for position, vector in zip(batch, encoded):
+                    vectors[position] = vector
+
+        return vectors
+
+    def add_schema_vectors(self, documents: Dict[str, str]) -> int:
+        """Embed and upsert ``documents`` keyed by table name, tagging each with its content hash.
+
+        Returns the number of documents written; on an error the remaining
+        batches are skipped (and retried by the next sync, as their hashes
+        still differ).
+        """
+        ids = list(documents)
+        written = 0
+
+        self.logger.info("Adding schema vectors to ChromaDB collection...")
+
+        # Encode and upsert one batch at a time so memory stays flat on huge schemas
+        for start in range(0, len(ids), self.batch_size):
+            batch_ids = ids[start : start + self.batch_size]
+            schema_data = [documents[doc_id] for doc_id in batch_ids]
+
+            try:
+                self.collection.upsert(
+                    ids=batch_ids,
+                    embeddings=self.encode(schema_data, remember=False),
+                    documents=schema_data,
+                    metadatas=[
+                        {
+                            "table": doc_id,
+                            "content_hash": self.content_hash(doc),
+                            "embedding": self.embedding_key,
+                        }
+                        for doc_id, doc in zip(batch_ids, schema_data)
+                    ],
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"Error adding schema vectors to ChromaDB after {written} of "
+                    f"{len(ids)} documents: {str(e)}"
+                )
+                return written
+            written += len(batch_ids)
 
-    def query_schema(self, query_text: str):
+        self.logger.info("Schema vectors added to ChromaDB successfully.")
+        return written
+
+    def sync_schema_vectors(self, documents: Dict[str, str]) -> dict:
+        """Bring the collection in line with ``documents``, re-embedding only what changed.
+
+        New or modified tables are upserted and tables no longer present (as well
+        as legacy positional ``doc_N`` entries) are deleted. ``failed`` counts
+        changed tables that could not be written.
+        """
+        existing = self.collection.get(include=["metadatas"])
+        # Vectors from another embedding backend count as stale; entries written
+        # before they were tagged came from the default model
+        stored_hashes = {
+            doc_id: (metadata or {}).get("content_hash")
+            if (metadata or {}).get("embedding", self.model_name) == self.embedding_key
+            else None
+            for doc_id, metadata in zip(existing["ids"], existing["metadatas"])
+        }
+
+        changed = {
+            doc_id: doc
+            for doc_id, doc in documents.items()
+            if stored_hashes.get(doc_id) != self.content_hash(doc)
+        }
+        removed = [doc_id for doc_id in stored_hashes if doc_id not in documents]
+
+        if removed:
+            self.collection.delete(ids=removed)
+        upserted = self.add_schema_vectors(changed) if changed else 0
+        failed = len(changed) - upserted
+        if self.lexical_index is not None:
+            self.lexical_index.sync(documents)
+
+        message = (
+            f"Schema index synced: {upserted} upserted, {len(removed)} removed, "
+            f"{len(documents) - len(changed)} unchanged, {failed} failed."
+        )
+        if failed:
+            self.logger.warning(message)
+        else:
+            self.logger.info(message)
+        return {
+            "upserted": upserted,
+            "removed": len(removed),
+            "unchanged": len(documents) - len(changed),
+            "failed": failed,
+        }
+
+    @staticmethod
+    def content_hash(document: str) -> str:
+        return hashlib.sha256(document.encode("utf-8")).hexdigest()
+
+    def query_schema(self, query_text: str, n_results: Optional[int] = None):
+        """Return the ``n_results`` best schema documents as ``{"table", "text", "distance"}``.
+
+        With lexical search enabled, vector and BM25 candidates are merged by
+        reciprocal rank fusion, so exact table and column names rank highly even
+        when their embeddings are not the closest.
+        """
+        n_results = n_results or Config.SCHEMA_TOP_K
         try:
-            query_embeddings = self.embedding_model.encode(
-                [query_text], convert_to_tensor=False
-            ).tolist()
+            query_embeddings = self.encode([query_text])
 
             self.logger.info("Querying ChromaDB with embeddings for RAG...")
 
-            results = self.collection.query(query_embeddings=query_embeddings)
+            candidates = (
+                n_results * self.CANDIDATE_MULTIPLIER
+                if self.lexical_index is not None
+                else n_results
+            )
+            with self.tracer.span("vector_search", candidates=candidates):
+                results = self.collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=candidates,
+                )
+
+            extracted_results = [
+                {"table": doc_id, "text": doc, "distance": distance}
+                for doc_id, doc, distance in zip(
+                    results.get("ids", [[]])[0],
+                    results.get("documents", [[]])[0],
+                    results.get("distances", [[]])[0],
+                )
+            ]
 
-            documents = results.get("documents", [[]])[0]
-            extracted_results = [{"text": doc} for doc in documents]
+            if self.lexical_index is not None:
+                with self.tracer.span("lexical_search", candidates=candidates):
+                    lexical_results = self.lexical_index.search(query_text, candidates)
+                extracted_results = self._fuse(
+                    extracted_results, lexical_results, n_results
+                )
 
             self.logger.info("Schema information retrieved from ChromaDB successfully.")
 
@@ -55,3 +247,26 @@ class ChromaService:
         except Exception as e:
             self.logger.error("Error querying schema from ChromaDB: %s", str(e))
             return []
+
+    def _fuse(self, vector_results: List[dict], lexical_results, n_results: int):
+        """Reciprocal rank fusion of vector results and ``(table, score)`` BM25 hits."""
+        scores = {}
+        for ranking in (
+            [result["table"] for result in vector_results],
+            [table for table, _ in lexical_results],
+        ):
+            for rank, table in enumerate(ranking, start=1):
+                scores[table] = scores.get(table, 0.0) + 1.0 / (
+                    Config.SCHEMA_RRF_K + rank
+                )
+
+        by_table = {result["table"]: result for result in vector_results}
+        fused = []
+        for table in sorted(scores, key=scores.get, reverse=True)[:n_results]:
+            result = by_table.get(table) or {
+                "table": table,
+                "text": self.lexical_index.document(table),
+                "distance": None,
+            }
+            fused.append({**result, "score": scores[table]})
+        return fused
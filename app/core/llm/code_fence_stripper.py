@@ -0,0 +1,55 @@
+import re
+
+
+class CodeFenceStripper:
+    """Incrementally removes markdown code fences from streamed LLM output.
+
+    Mirrors the non-streaming cleanup in ``LLMService.process_data_analysis``:
+    an opening fence with its optional ``python`` tag and newline is dropped, as
+    is any other bare fence. Text that might still turn into a fence is held
+    back until the next chunk (or ``flush``) decides it.
+    """
+
+    FENCE = "```"
+    FENCE_SUFFIXES = ("python\n", "\n")
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        self._pending += chunk
+        output = []
+
+        while True:
+            position = self._pending.find(self.FENCE)
+            if position == -1:
+                # Trailing backticks could be the start of a fence
+                held = len(self._pending) - len(self._pending.rstrip("`"))
+                output.append(self._pending[: len(self._pending) - held])
+                self._pending = self._pending[len(self._pending) - held :]
+                break
+
+            output.append(self._pending[:position])
+            rest = self._pending[position + len(self.FENCE) :]
+
+            if any(
+                suffix.startswith(rest) and len(rest) < len(suffix)
+                for suffix in self.FENCE_SUFFIXES
+            ):
+                # Not enough text yet to know whether a tag/newline follows
+                self._pending = self._pending[position:]
+                break
+
+            for suffix in self.FENCE_SUFFIXES:
+                if rest.startswith(suffix):
+                    rest = rest[len(suffix) :]
+                    break
+            self._pending = rest
+
+        return "".join(output)
+
+    def flush(self) -> str:
+        remaining = re.sub(r"```(?:python)?\n", "", self._pending)
+        remaining = re.sub(r"```", "", remaining)
+        self._pending = ""
+        return remaining
@@ -0,0 +1,118 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+
+
+class EmbeddingBackend(ABC):
+    """Turns texts into normalized sentence embeddings."""
+
+    def __init__(self, model_name: str, threads: int = 0):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.model_name = model_name
+        self.threads = threads
+
+    @abstractmethod
+    def encode(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        pass
+
+    @staticmethod
+    def create(model_name: str, backend: str = None) -> "EmbeddingBackend":
+        backend = backend or Config.EMBEDDING_BACKEND
+        if backend == "sentence-transformers":
+            return SentenceTransformerBackend(model_name, Config.EMBEDDING_THREADS)
+        elif backend == "onnx":
+            return OnnxEmbeddingBackend(
+                model_name, Config.EMBEDDING_ONNX_FILE, Config.EMBEDDING_THREADS
+            )
+        else:
+            raise ValueError(f"Unsupported embedding backend: {backend}")
+
+    @staticmethod
+    def cache_key(model_name: str, backend: str = None) -> str:
+        """Identifies the vectors a backend produces, for caches and stored metadata."""
+        if (backend or Config.EMBEDDING_BACKEND) == "onnx":
+            return f"{model_name}@{Config.EMBEDDING_ONNX_FILE}"
+        return model_name
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """The PyTorch ``SentenceTransformer`` model."""
+
+    def __init__(self, model_name: str, threads: int = 0):
+        super().__init__(model_name, threads)
+        # sentence_transformers pulls in torch, which dominates cold start
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        return self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_tensor=False,
+            normalize_embeddings=True,
+        ).tolist()
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """The same model exported to ONNX (int8-quantized by default), run on ONNX Runtime.
+
+    Weights and tokenizer come from the model's Hugging Face repository, which
+    for sentence-transformers models ships ONNX exports under ``onnx/``. Token
+    embeddings are mean-pooled over the attention mask and L2-normalized, as
+    the sentence-transformers pipeline does, so vectors stay comparable.
+    """
+
+    MAX_SEQUENCE_LENGTH = 256
+
+    def __init__(self, model_name: str, onnx_file: str, threads: int = 0):
+        super().__init__(model_name, threads)
+        import onnxruntime as ort
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        self.onnx_file = onnx_file
+        repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(repo_id, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.MAX_SEQUENCE_LENGTH)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            hf_hub_download(repo_id, onnx_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.logger.info(f"Loaded ONNX embedding model {repo_id}/{onnx_file}.")
+
+    def encode(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start : start + batch_size])
+            input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                inputs["token_type_ids"] = np.zeros_like(input_ids)
+
+            token_embeddings = self.session.run(None, inputs)[0]
+            mask = attention_mask[..., None].astype(token_embeddings.dtype)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(
+                mask.sum(axis=1), 1e-9, None
+            )
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.extend(pooled.tolist())
+        return vectors
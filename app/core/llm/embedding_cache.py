@@ -0,0 +1,172 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.core.utils.logger import Logger
+
+
+class EmbeddingCache:
+    """Bounded in-memory LRU of embeddings, optionally backed by a SQLite file.
+
+    Entries are keyed by ``sha256(model_name + text)`` so switching models never
+    returns stale vectors. The disk cache keeps at most ``max_disk_entries``
+    vectors, dropping the least recently used ones; disk errors only cost
+    cache misses.
+    """
+
+    # Share of max_disk_entries kept after an eviction pass, so eviction does
+    # not run on every write once the cache is full
+    DISK_EVICTION_TARGET = 0.9
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: int = 1024,
+        cache_dir: Optional[str] = None,
+        max_disk_entries: int = 100000,
+    ):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._disk_entries = 0
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                self._db = sqlite3.connect(
+                    os.path.join(cache_dir, "embeddings.sqlite3"),
+                    check_same_thread=False,
+                )
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings "
+                    "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, "
+                    "last_access REAL NOT NULL DEFAULT 0)"
+                )
+                columns = [
+                    row[1] for row in self._db.execute("PRAGMA table_info(embeddings)")
+                ]
+                if "last_access" not in columns:
+                    self._db.execute(
+                        "ALTER TABLE embeddings "
+                        "ADD COLUMN last_access REAL NOT NULL DEFAULT 0"
+                    )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS embeddings_last_access "
+                    "ON embeddings (last_access)"
+                )
+                self._db.commit()
+                self._disk_entries = self._db.execute(
+                    "SELECT COUNT(*) FROM embeddings"
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                self.logger.warning(f"Disk embedding cache disabled: {str(e)}")
+                self._db = None
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(
+        self, texts: List[str], memory: bool = True
+    ) -> List[Optional[List[float]]]:
+        keys = [self.key(text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        missing = []
+
+        with self._lock:
+            for position, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    results[position] = vector
+                else:
+                    missing.append(position)
+
+            if missing and self._db is not None:
+                try:
+                    found = []
+                    for position in missing:
+                        row = self._db.execute(
+                            "SELECT vector FROM embeddings WHERE key = ?",
+                            (keys[position],),
+                        ).fetchone()
+                        if row is not None:
+                            results[position] = array("f", row[0]).tolist()
+                            found.append(keys[position])
+                    if found:
+                        now = time.time()
+                        self._db.executemany(
+                            "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                            [(now, key) for key in found],
+                        )
+                        self._db.commit()
+                except sqlite3.Error as e:
+                    # Served as misses; the vectors are simply re-encoded
+                    self.logger.warning(f"Error reading embedding cache: {str(e)}")
+                if memory:
+                    for position in missing:
+                        if results[position] is not None:
+                            self._entries[keys[position]] = results[position]
+                self._evict()
+
+        return results
+
+    def put_many(
+        self, texts: List[str], vectors: List[List[float]], memory: bool = True
+    ):
+        """Store vectors on disk and, unless ``memory`` is False, in the LRU.
+
+        Bulk schema indexing passes ``memory=False`` so thousands of table
+        embeddings do not evict the hot query embeddings.
+        """
+        keys = [self.key(text) for text in texts]
+        with self._lock:
+            if memory:
+                for key, vector in zip(keys, vectors):
+                    self._entries[key] = vector
+                    self._entries.move_to_end(key)
+                self._evict()
+
+            if self._db is not None:
+                now = time.time()
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, last_access) "
+                        "VALUES (?, ?, ?)",
+                        [
+                            (key, array("f", vector).tobytes(), now)
+                            for key, vector in zip(keys, vectors)
+                        ],
+                    )
+                    # Over-counts replaced rows; corrected by the next eviction
+                    self._disk_entries += len(keys)
+                    if self.max_disk_entries and self._disk_entries > self.max_disk_entries:
+                        self._evict_disk()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Error writing embedding cache: {str(e)}")
+
+    def _evict_disk(self):
+        keep = int(self.max_disk_entries * self.DISK_EVICTION_TARGET)
+        deleted = self._db.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (keep,),
+        ).rowcount
+        self._disk_entries = self._db.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+        if deleted:
+            self.logger.info(f"Evicted {deleted} embeddings from the disk cache.")
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,80 @@
+import hashlib
+import re
+import time
+from typing import Iterator, List, Optional
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeChatModel:
+    """Deterministic stand-in for ``ChatOpenAI`` used by benchmarks and offline runs.
+
+    Supports the ``invoke``/``stream`` calls ``LLMService`` makes. The reply
+    depends only on the messages: dashboard prompts get a small dashboard that
+    queries a table named in the schema context, anything else gets a short
+    overview. ``latency_seconds`` delays the first token and
+    ``tokens_per_second`` paces the rest, to mimic a hosted model.
+    """
+
+    CHUNK_CHARS = 4
+
+    _TABLE_PATTERNS = [
+        re.compile(r"^Table: (\S+)$", re.MULTILINE),
+        re.compile(r"^([\w.]+)\(", re.MULTILINE),
+    ]
+
+    def __init__(
+        self,
+        model_name: str = "fake",
+        latency_seconds: float = 0.0,
+        tokens_per_second: Optional[float] = None,
+    ):
+        self.model_name = model_name
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.last_messages = None
+        self.last_response = None
+
+    def invoke(self, messages: List[dict]) -> FakeMessage:
+        return FakeMessage("".join(chunk.content for chunk in self.stream(messages)))
+
+    def stream(self, messages: List[dict]) -> Iterator[FakeMessage]:
+        self.last_messages = messages
+        self.last_response = response = self._respond(messages)
+
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        for start in range(0, len(response), self.CHUNK_CHARS):
+            if self.tokens_per_second:
+                time.sleep(1.0 / self.tokens_per_second)
+            yield FakeMessage(response[start : start + self.CHUNK_CHARS])
+
+    def _respond(self, messages: List[dict]) -> str:
+        text = "\n".join(message["content"] for message in messages)
+        digest = int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16)
+        tables = []
+        for pattern in self._TABLE_PATTERNS:
+            tables.extend(pattern.findall(messages[-1]["content"]))
+
+        if "Python code" not in text:
+            return (
+                f"This data source contains {len(tables)} related tables. "
+                "Example questions: What are the totals per table? "
+                "Which records changed most recently? How do values trend over time?"
+            )
+
+        if not tables:
+            return 'st.warning("No tables available.")'
+
+        table = tables[digest % len(tables)]
+        return (
+            "```python\n"
+            f'df = run_query("SELECT * FROM {table}")\n'
+            f'st.subheader("{table}")\n'
+            'st.metric("Rows", len(df))\n'
+            "st.dataframe(df.head(50))\n"
+            "```"
+        )
@@ -0,0 +1,136 @@
+import hashlib
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.utils.logger import Logger
+
+
+class LexicalIndex:
+    """In-memory BM25 inverted index over schema documents.
+
+    Identifiers are indexed whole and split on ``snake_case``/``CamelCase``
+    boundaries, so "DimProduct", "dim_product" and "product" all match the
+    ``DimProduct`` table. Documents are added, replaced and removed
+    incrementally with ``sync``, mirroring the vector collection. Terms from the
+    document id (the table name) are weighted up, so a table outranks the
+    tables that merely reference it.
+    """
+
+    K1 = 1.5
+    B = 0.75
+    # Document ids are table names; their terms count this many extra times
+    NAME_WEIGHT = 3
+
+    _WORD = re.compile(r"[A-Za-z0-9_]+")
+    _PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+    def __init__(self):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._doc_hashes: Dict[str, str] = {}
+        self._documents: Dict[str, str] = {}
+        self._total_length = 0
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        tokens = []
+        for word in cls._WORD.findall(text):
+            lowered = word.lower()
+            tokens.append(lowered)
+            parts = [
+                part.lower()
+                for chunk in word.split("_")
+                for part in cls._PART.findall(chunk)
+            ]
+            if len(parts) > 1 or (parts and parts[0] != lowered):
+                tokens.extend(parts)
+        return tokens
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def document(self, doc_id: str) -> str:
+        return self._documents.get(doc_id)
+
+    def sync(self, documents: Dict[str, str]) -> dict:
+        """Index new or changed documents and drop those no longer present."""
+        with self._lock:
+            changed = {
+                doc_id: doc
+                for doc_id, doc in documents.items()
+                if self._doc_hashes.get(doc_id) != self._hash(doc)
+            }
+            removed = [doc_id for doc_id in self._doc_terms if doc_id not in documents]
+            self.remove(removed)
+            self.upsert(changed)
+        return {"upserted": len(changed), "removed": len(removed)}
+
+    def upsert(self, documents: Dict[str, str]):
+        with self._lock:
+            for doc_id, doc in documents.items():
+                self._remove_one(doc_id)
+                terms = Counter(self.tokenize(doc))
+                for term in self.tokenize(doc_id):
+                    terms[term] += self.NAME_WEIGHT
+                for term, frequency in terms.items():
+                    self._postings[term][doc_id] = frequency
+                self._doc_terms[doc_id] = terms
+                self._doc_lengths[doc_id] = sum(terms.values())
+                self._doc_hashes[doc_id] = self._hash(doc)
+                self._documents[doc_id] = doc
+                self._total_length += self._doc_lengths[doc_id]
+
+    def remove(self, doc_ids: Iterable[str]):
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove_one(doc_id)
+
+    def _remove_one(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._doc_hashes.pop(doc_id, None)
+        self._documents.pop(doc_id, None)
+
+    def search(self, query: str, n_results: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``n_results`` ``(doc_id, bm25_score)`` pairs, best first."""
+        with self._lock:
+            n_docs = len(self._doc_terms)
+            if not n_docs:
+                return []
+            average_length = self._total_length / n_docs
+
+            scores = defaultdict(float)
+            for term in set(self.tokenize(query)):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for doc_id, frequency in postings.items():
+                    norm = self.K1 * (
+                        1 - self.B + self.B * self._doc_lengths[doc_id] / average_length
+                    )
+                    scores[doc_id] += (
+                        idf * frequency * (self.K1 + 1) / (frequency + norm)
+                    )
+
+        return heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+
+    @staticmethod
+    def _hash(document: str) -> str:
+        return hashlib.sha256(document.encode("utf-8")).hexdigest()
@@ -0,0 +1,281 @@
+import contextvars
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Iterator, List, Optional
+
+from app.core.llm.token_budget import TokenBudget
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+from app.core.utils.rate_limiter import RateLimiter
+from app.core.utils.tracer import Tracer
+
+
+class _InFlight:
+    """One upstream call shared by every caller that sent the same messages."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.chunks = []
+        self.result = None
+        self.error = None
+        self.done = False
+
+    def publish(self, chunk):
+        with self.condition:
+            self.chunks.append(chunk)
+            self.condition.notify_all()
+
+    def finish(self, result=None, error: Optional[BaseException] = None):
+        with self.condition:
+            self.result = result
+            self.error = error
+            self.done = True
+            self.condition.notify_all()
+
+    def wait(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.done)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def replay(self) -> Iterator:
+        """Yield every chunk from the start, then new ones as they arrive."""
+        position = 0
+        while True:
+            with self.condition:
+                self.condition.wait_for(
+                    lambda: self.done or position < len(self.chunks)
+                )
+                chunks = self.chunks[position:]
+                done = self.done
+            yield from chunks
+            position += len(chunks)
+            if done and position >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class LLMScheduler:
+    """Shared front for a chat model with the ``invoke``/``stream`` interface.
+
+    Identical concurrent requests are coalesced into one upstream call (later
+    callers replay the same chunks), at most ``max_concurrency`` calls run at
+    once, and a tokens-per-minute bucket is charged with the estimated prompt
+    tokens before each call and with the completion tokens after it. Rate
+    limits, timeouts and 5xx errors are retried with full-jitter exponential
+    backoff (honouring ``Retry-After``); streams are only retried before their
+    first chunk. Queue depth and wait time are exported through the tracer.
+    """
+
+    RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+    RETRYABLE_ERRORS = {
+        "RateLimitError",
+        "APITimeoutError",
+        "APIConnectionError",
+        "InternalServerError",
+    }
+
+    def __init__(
+        self,
+        llm,
+        model_name: str,
+        max_concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.llm = llm
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency or Config.LLM_MAX_CONCURRENCY
+        tokens_per_minute = (
+            Config.LLM_TOKENS_PER_MINUTE
+            if tokens_per_minute is None
+            else tokens_per_minute
+        )
+        self.token_bucket = RateLimiter(tokens_per_minute / 60.0, tokens_per_minute)
+        self.max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.token_budget = TokenBudget(model_name)
+        self.tracer = Tracer.instance()
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._stats = {
+            "queued": 0,
+            "running": 0,
+            "calls": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def invoke(self, messages: List[dict]):
+        inflight, leader = self._join("invoke", messages)
+        if not leader:
+            return inflight.wait()
+
+        try:
+            result = self._call(messages, lambda: self._invoke_upstream(messages))
+        except Exception as e:
+            inflight.finish(error=e)
+            raise
+        finally:
+            self._leave("invoke", messages)
+        inflight.finish(result=result)
+        return result
+
+    def stream(self, messages: List[dict]) -> Iterator:
+        inflight, leader = self._join("stream", messages)
+        if leader:
+            # The upstream stream is pumped on its own thread so a caller that
+            # stops reading early does not cut it short for coalesced callers
+            context = contextvars.copy_context()
+            threading.Thread(
+                target=context.run,
+                args=(self._pump, messages, inflight),
+                name="llm-stream",
+                daemon=True,
+            ).start()
+        return inflight.replay()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_wait_seconds"] = (
+            stats["wait_seconds_total"] / stats["calls"] if stats["calls"] else 0.0
+        )
+        return stats
+
+    def _key(self, mode: str, messages: List[dict]) -> tuple:
+        payload = json.dumps(messages, sort_keys=True, default=str)
+        return (mode, hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+    def _join(self, mode: str, messages: List[dict]):
+        key = self._key(mode, messages)
+        with self._lock:
+            inflight = self._in_flight.get(key)
+            if inflight is not None:
+                self._stats["coalesced"] += 1
+                self.tracer.increment("llm_coalesced")
+                return inflight, False
+            inflight = self._in_flight[key] = _InFlight()
+            return inflight, True
+
+    def _leave(self, mode: str, messages: List[dict]):
+        with self._lock:
+            self._in_flight.pop(self._key(mode, messages), None)
+
+    def _pump(self, messages: List[dict], inflight: _InFlight):
+        try:
+            self._call(
+                messages,
+                lambda: self._stream_upstream(messages, inflight),
+                # Chunks already replayed to callers cannot be taken back
+                can_retry=lambda: not inflight.chunks,
+            )
+        except Exception as e:
+            inflight.finish(error=e)
+        else:
+            inflight.finish()
+        finally:
+            self._leave("stream", messages)
+
+    def _invoke_upstream(self, messages: List[dict]):
+        response = self.llm.invoke(messages)
+        usage = getattr(response, "usage_metadata", None) or {}
+        completion_tokens = usage.get("output_tokens")
+        if completion_tokens is None:
+            completion_tokens = self.token_budget.count(response.content)
+        self.token_bucket.debit(completion_tokens)
+        return response
+
+    def _stream_upstream(self, messages: List[dict], inflight: _InFlight):
+        completion = []
+        for chunk in self.llm.stream(messages):
+            completion.append(chunk.content or "")
+            inflight.publish(chunk)
+        self.token_bucket.debit(self.token_budget.count("".join(completion)))
+
+    def _call(self, messages: List[dict], upstream, can_retry=None):
+        prompt_tokens = self.token_budget.count(
+            "\n".join(message["content"] for message in messages)
+        )
+
+        with self.tracer.span("llm_queue") as span:
+            self._update_queue(queued=1)
+            try:
+                started = time.perf_counter()
+                self.token_bucket.acquire(prompt_tokens)
+                self._slots.acquire()
+                waited = time.perf_counter() - started
+            finally:
+                self._update_queue(queued=-1)
+            span.set(wait_seconds=round(waited, 3), prompt_tokens=prompt_tokens)
+
+        self._update_queue(running=1, waited=waited)
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return upstream()
+                except Exception as e:
+                    if (
+                        attempt >= self.max_retries
+                        or not self._retryable(e)
+                        or (can_retry is not None and not can_retry())
+                    ):
+                        raise
+                    delay = self._backoff(attempt, e)
+                    with self._lock:
+                        self._stats["retries"] += 1
+                    self.tracer.increment("llm_retries")
+                    self.logger.warning(
+                        f"LLM call failed ({type(e).__name__}), retrying in "
+                        f"{delay:.2f}s (attempt {attempt + 1}/{self.max_retries})."
+                    )
+                    time.sleep(delay)
+        finally:
+            self._slots.release()
+            self._update_queue(running=-1)
+
+    def _retryable(self, error: Exception) -> bool:
+        status = getattr(error, "status_code", None)
+        return (
+            status in self.RETRYABLE_STATUS
+            or type(error).__name__ in self.RETRYABLE_ERRORS
+            or isinstance(error, (TimeoutError, ConnectionError))
+        )
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(
+            0,
+            min(
+                Config.LLM_BACKOFF_MAX_SECONDS,
+                Config.LLM_BACKOFF_BASE_SECONDS * 2**attempt,
+            ),
+        )
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after")
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    def _update_queue(self, queued: int = 0, running: int = 0, waited: float = None):
+        with self._lock:
+            self._stats["queued"] += queued
+            self._stats["running"] += running
+            if waited is not None:
+                self._stats["calls"] += 1
+                self._stats["wait_seconds_total"] += waited
+                self._stats["wait_seconds_max"] = max(
+                    self._stats["wait_seconds_max"], waited
+                )
+            queued_now, running_now = self._stats["queued"], self._stats["running"]
+        self.tracer.set_gauge("llm_queue_depth", queued_now)
+        self.tracer.set_gauge("llm_in_flight", running_now)
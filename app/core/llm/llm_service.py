@@ -1,85 +1,245 @@
+import os
 import re
-
-from langchain_openai import ChatOpenAI
+import sqlite3
+import time
+from typing import Iterator, Optional
 
 from app.core.data_sources.data_source import DataSource
 from app.core.llm.chroma_service import ChromaService
+from app.core.llm.code_fence_stripper import CodeFenceStripper
+from app.core.llm.fake_chat_model import FakeChatModel
+from app.core.llm.llm_scheduler import LLMScheduler
 from app.core.llm.prompts import Prompts
+from app.core.llm.result_cache import ResultCache
+from app.core.llm.schema_graph import SchemaGraph
+from app.core.llm.token_budget import TokenBudget
 from app.core.utils.config import Config
 from app.core.utils.logger import Logger
+from app.core.utils.resource_registry import ResourceRegistry
+from app.core.utils.tracer import Tracer
 
 
 class LLMService:
-    def __init__(self, source: str, model_name: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        source: str,
+        model_name: str = "gpt-4o-mini",
+        progress_callback=None,
+        llm=None,
+    ):
         self.logger = Logger(self.__class__.__name__).get_logger()
+        self.model_name = model_name
+        self.tracer = Tracer.instance()
         self.data_source = DataSource.create(source)
-        self.llm = ChatOpenAI(model=model_name, openai_api_key=Config().OPENAI_API_KEY)
+        self.llm = llm or ResourceRegistry.instance().get_or_create(
+            "llm", (Config.LLM_PROVIDER, model_name), self._create_llm
+        )
         self.chroma_service = ChromaService()
-        self._initialize_chroma_db()
+        self.token_budget = TokenBudget(model_name, Config.SCHEMA_CONTEXT_MAX_TOKENS)
+        self.result_cache = None
+        self._initialize_chroma_db(progress_callback)
 
-    def _initialize_chroma_db(self):
-        existing_docs = self.chroma_service.collection.get()
+    def _create_llm(self):
+        """Build the chat model behind the process-wide scheduler shared by all sessions."""
+        return LLMScheduler(self._create_chat_model(), self.model_name)
 
-        if not existing_docs or len(existing_docs.get("documents", [])) == 0:
-            self.logger.info("Vectorizing schema and storing in ChromaDB for RAG...")
-            raw_schema = self.data_source.get_schema()
-            formatted_schema = self.data_source.schema_to_string(raw_schema)
+    def _create_chat_model(self):
+        if Config.LLM_PROVIDER == "fake":
+            return FakeChatModel(
+                self.model_name, latency_seconds=Config.FAKE_LLM_LATENCY_SECONDS
+            )
+        if Config.LLM_PROVIDER != "openai":
+            raise ValueError(f"Unsupported LLM provider: {Config.LLM_PROVIDER}")
+        from langchain_openai import ChatOpenAI
 
-            schema_chunks = formatted_schema.split("\n\n")
-            self.chroma_service.add_schema_vectors(schema_chunks)
-            self.logger.info("Schema stored in ChromaDB successfully.")
+        # Retries are handled by the scheduler, with jittered backoff
+        return ChatOpenAI(
+            model=self.model_name,
+            openai_api_key=Config().OPENAI_API_KEY,
+            base_url=Config.OPENAI_BASE_URL,
+            max_retries=0,
+        )
+
+    def _initialize_chroma_db(self, progress_callback=None):
+        self.logger.info("Syncing schema vectors in ChromaDB for RAG...")
+        with self.tracer.span("introspection") as span:
+            fingerprint = self.data_source.get_schema_fingerprint()
+            raw_schema = self.data_source.get_cached_schema(
+                progress_callback=progress_callback, fingerprint=fingerprint
+            )
+            span.set(tables=len(raw_schema))
+        schema_documents = self.data_source.schema_to_documents(raw_schema)
+        self.schema_documents = schema_documents
+        self.schema_graph = SchemaGraph(raw_schema)
+
+        # Sources without a catalog fingerprint fall back to the document contents
+        self.schema_fingerprint = fingerprint or ChromaService.content_hash(
+            "\n".join(sorted(map(ChromaService.content_hash, schema_documents.values())))
+        )
+        self._initialize_result_cache()
+
+        if not schema_documents:
+            self.logger.warning("No schema documents to store in ChromaDB.")
+            return
+
+        result = self.chroma_service.sync_schema_vectors(schema_documents)
+        if result["failed"]:
+            self.logger.warning(
+                f"{result['failed']} schema documents are missing from ChromaDB; "
+                "they will be retried on the next sync."
+            )
         else:
-            self.logger.info("Schema data already available in ChromaDB.")
+            self.logger.info("Schema stored in ChromaDB successfully.")
 
-    def generate_analysis_description(self):
+    def _initialize_result_cache(self):
+        if not Config.RESULT_CACHE_ENABLED:
+            return
+        if self.result_cache is not None:
+            self.result_cache.set_schema_fingerprint(self.schema_fingerprint)
+            return
+        try:
+            self.result_cache = ResultCache(
+                os.path.join(Config.CACHE_DIR, "results.sqlite3"),
+                self.data_source.source,
+                self.schema_fingerprint,
+                ttl_seconds=Config.RESULT_CACHE_TTL_SECONDS,
+                max_entries=Config.RESULT_CACHE_MAX_ENTRIES,
+                similarity_threshold=Config.RESULT_CACHE_SIMILARITY_THRESHOLD,
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Result cache disabled: {str(e)}")
+
+    def refresh_schema(self, progress_callback=None):
+        """Re-sync the vector store after schema changes (only changed tables are re-embedded)."""
+        self._initialize_chroma_db(progress_callback)
+
+    def _retrieve_schema_context(self, query_text: str) -> str:
+        """Top-k tables for ``query_text`` plus their join partners, within the token budget."""
+        with self.tracer.span("retrieval") as span:
+            chroma_results = self.chroma_service.query_schema(query_text)
+            retrieved = [result["table"] for result in chroma_results]
+            tables = self.schema_graph.expand(retrieved, hops=Config.SCHEMA_FK_HOPS)
+
+            retrieved_texts = {
+                result["table"]: result["text"] for result in chroma_results
+            }
+            documents = [
+                self.schema_documents.get(table) or retrieved_texts.get(table)
+                for table in tables
+            ]
+            documents, tokens = self.token_budget.fit([doc for doc in documents if doc])
+            span.set(tables=len(documents), retrieved=len(retrieved), tokens=tokens)
+
+        self.logger.info(
+            f"Schema context: {len(documents)} tables ({len(retrieved)} retrieved, "
+            f"{len(tables) - len(retrieved)} join partners), {tokens} tokens "
+            f"(budget {self.token_budget.max_tokens or 'unlimited'})."
+        )
+        return "\n\n".join(documents)
+
+    def _overview_messages(self) -> list:
         self.logger.info("Retrieving schema description using RAG...")
 
-        chroma_results = self.chroma_service.query_schema(
+        relevant_schema_text = self._retrieve_schema_context(
             "key data source details to enable complex data analysis"
         )
 
-        if not chroma_results:
+        if not relevant_schema_text:
             self.logger.error("No schema data found in ChromaDB.")
             raise ValueError("No schema data available for analysis.")
 
-        relevant_schema_texts = [doc["text"] for doc in chroma_results]
+        return Prompts.data_source_overview_prompt(relevant_schema_text)
 
-        if not relevant_schema_texts:
-            self.logger.error("No valid schema text found in ChromaDB results.")
-            raise ValueError("No valid schema text found in ChromaDB results.")
-
-        relevant_schema_text = "\n\n".join(relevant_schema_texts)
-
-        messages = Prompts.data_source_overview_prompt(relevant_schema_text)
+    def generate_analysis_description(self):
+        messages = self._overview_messages()
 
-        response = self.llm.invoke(messages)
+        with self.tracer.span("llm", label="Analysis description") as span:
+            response = self.llm.invoke(messages)
+            self._record_usage(span, messages, response.content, response)
 
         self.logger.info(f"Analysis description generated successfully.")
 
         return response.content.strip()
 
-    def process_data_analysis(
-        self, natural_language_query: str, db_type: str = "SQL Server"
-    ) -> str:
+    def stream_analysis_description(self) -> Iterator[str]:
+        """Yield the analysis description as tokens arrive from the LLM."""
+        messages = self._overview_messages()
+
+        yield from self._stream_llm(messages, "Analysis description")
+
+    def _dashboard_request(self, natural_language_query: str, db_type: str):
+        """Retrieve schema context and return ``(messages, cache_lookup)``.
+
+        ``cache_lookup`` is ``(cached_code, context_hash, query_embedding)``.
+        """
+        with self.tracer.span("prompt_build") as span:
+            messages, cache_lookup = self._build_dashboard_request(
+                natural_language_query, db_type
+            )
+            span.set(cache_hit=cache_lookup[0] is not None)
+        return messages, cache_lookup
+
+    def _build_dashboard_request(self, natural_language_query: str, db_type: str):
         self.logger.info("Retrieving schema for analysis using RAG...")
 
-        chroma_results = self.chroma_service.query_schema(natural_language_query)
+        relevant_schema_text = self._retrieve_schema_context(natural_language_query)
 
-        if not chroma_results:
+        if not relevant_schema_text:
             self.logger.error("No relevant schema found in ChromaDB for analysis.")
             raise ValueError("No relevant schema found in ChromaDB.")
 
-        relevant_schema_text = "\n\n".join([doc["text"] for doc in chroma_results])
+        context_hash = ResultCache.context_hash(f"{db_type}\0{relevant_schema_text}")
+        query_embedding = None
+        cached_code = None
+        if self.result_cache is not None:
+            if self.result_cache.similarity_threshold:
+                # Already encoded (and cached) by query_schema above
+                query_embedding = self.chroma_service.encode([natural_language_query])[0]
+            cached_code = self.result_cache.get(
+                natural_language_query,
+                context_hash,
+                self.model_name,
+                query_embedding,
+                self.chroma_service.embedding_key,
+            )
 
         # Prepare the structured prompt using the new format
         messages = Prompts.dashboard_creation_prompt(
             formatted_schema=relevant_schema_text,
             db_type=db_type,
             query=natural_language_query,
+            has_engine=getattr(self.data_source, "engine", None) is not None,
         )
 
+        return messages, (cached_code, context_hash, query_embedding)
+
+    def _store_result(self, natural_language_query, cache_lookup, final_code):
+        if self.result_cache is not None:
+            _, context_hash, query_embedding = cache_lookup
+            self.result_cache.put(
+                natural_language_query,
+                context_hash,
+                self.model_name,
+                final_code,
+                query_embedding,
+                self.chroma_service.embedding_key,
+            )
+
+    def process_data_analysis(
+        self, natural_language_query: str, db_type: Optional[str] = None
+    ) -> str:
+        messages, cache_lookup = self._dashboard_request(
+            natural_language_query, db_type or self.data_source.get_db_type()
+        )
+        if cache_lookup[0] is not None:
+            return cache_lookup[0]
+
         # Invoke the LLM with the structured multi-message prompt
-        dashboard_response = self.llm.invoke(messages)
+        with self.tracer.span("llm", label="Dashboard code") as span:
+            dashboard_response = self.llm.invoke(messages)
+            self._record_usage(
+                span, messages, dashboard_response.content, dashboard_response
+            )
 
         self.logger.info("Dashboard code generated by LLM successfully.")
 
@@ -89,4 +249,70 @@ class LLMService:
         final_code = re.sub(r"```(?:python)?\n", "", final_code)
         final_code = re.sub(r"```", "", final_code)
 
+        self._store_result(natural_language_query, cache_lookup, final_code)
+
         return final_code
+
+    def stream_data_analysis(
+        self, natural_language_query: str, db_type: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield dashboard code incrementally, with code fences already stripped."""
+        messages, cache_lookup = self._dashboard_request(
+            natural_language_query, db_type or self.data_source.get_db_type()
+        )
+        if cache_lookup[0] is not None:
+            yield cache_lookup[0]
+            return
+
+        stripper = CodeFenceStripper()
+        chunks = []
+        for token in self._stream_llm(messages, "Dashboard code"):
+            cleaned = stripper.feed(token)
+            if cleaned:
+                chunks.append(cleaned)
+                yield cleaned
+        cleaned = stripper.flush()
+        if cleaned:
+            chunks.append(cleaned)
+            yield cleaned
+
+        self._store_result(natural_language_query, cache_lookup, "".join(chunks).strip())
+
+    def _stream_llm(self, messages: list, label: str) -> Iterator[str]:
+        started = time.perf_counter()
+        time_to_first_token = None
+        completion = []
+
+        with self.tracer.span("llm", label=label) as span:
+            for chunk in self.llm.stream(messages):
+                if not chunk.content:
+                    continue
+                if time_to_first_token is None:
+                    time_to_first_token = time.perf_counter() - started
+                    span.set(ttft_s=round(time_to_first_token, 3))
+                completion.append(chunk.content)
+                yield chunk.content
+            self._record_usage(span, messages, "".join(completion))
+
+        total = time.perf_counter() - started
+        self.logger.info(
+            f"{label} streamed: time to first token "
+            f"{time_to_first_token if time_to_first_token is not None else total:.2f}s, "
+            f"total {total:.2f}s."
+        )
+
+    def _record_usage(self, span, messages: list, completion: str, response=None):
+        """Attach token usage to ``span``, preferring what the provider reported."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        prompt_tokens = usage.get("input_tokens")
+        if prompt_tokens is None:
+            prompt_tokens = self.token_budget.count(
+                "\n".join(message["content"] for message in messages)
+            )
+        completion_tokens = usage.get("output_tokens")
+        if completion_tokens is None:
+            completion_tokens = self.token_budget.count(completion)
+
+        span.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        self.tracer.increment("llm_tokens", prompt_tokens, kind="prompt")
+        self.tracer.increment("llm_tokens", completion_tokens, kind="completion")
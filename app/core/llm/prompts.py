@@ -30,8 +30,13 @@ class Prompts:
 
     @staticmethod
     def dashboard_creation_prompt(
-        formatted_schema: str, db_type: str, query: str
+        formatted_schema: str, db_type: str, query: str, has_engine: bool = False
     ) -> list:
+        engine_note = (
+            "  A pre-configured SQLAlchemy `engine` is also available if a query cannot go through `run_query`. "
+            if has_engine
+            else ""
+        )
         return [
             {
                 "role": "system",
@@ -44,11 +49,12 @@ class Prompts:
                     "- The code must include SQL queries that directly fetch data from the provided schema, ensuring accurate and relevant data retrieval. "
                     "- Do not use or create any tables, columns, or data structures not explicitly mentioned in the schema. "
                     "- All visualizations must be created using Plotly Express, taking care to use appropriate chart types that best represent the data and insights. "
-                    "- Use SQLAlchemy for all database connections. Always connect to the database using:\n"
+                    "- Do not create database connections or engines. Fetch all data with the provided `run_query(sql)` helper, "
+                    "which returns a pandas DataFrame and caches results:\n"
                     "  ```python\n"
-                    "  DATABASE_URL = os.getenv('DW_DATABASE_URL')\n"
-                    "  engine = create_engine(DATABASE_URL)\n"
-                    "  ```"
+                    "  df = run_query(\"SELECT ...\")\n"
+                    "  ```\n"
+                    f"{engine_note}"
                     "- Ensure all SQL queries are fully compatible with the specified database type, such as using 'TOP' instead of 'LIMIT' for SQL Server. "
                     "- The dashboard should not include interactive elements since it's being executred inside a exec() method. "
                     "- Design the layout to be clear and organized, with distinct sections for different types of data or analyses. Avoid clutter and ensure all elements are easily readable. "
@@ -0,0 +1,247 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.utils.logger import Logger
+
+
+class ResultCache:
+    """Persistent cache of generated dashboard code.
+
+    Entries are scoped to a data source. Exact hits are keyed by the normalized
+    query, the hash of the retrieved schema context, the model name and the
+    embedding model (``embedding_key``). Optionally, a query whose embedding is
+    within ``similarity_threshold`` (cosine) of a cached query for the same
+    source, model, schema context and embedding model is served as a
+    near-duplicate, provided both mention the same literals (numbers and
+    quoted strings), so "top 5" never gets the code for "top 10". Entries
+    expire after ``ttl_seconds``, the least recently used are evicted beyond
+    ``max_entries``, and a source's entries are dropped when its schema
+    fingerprint changes.
+    """
+
+    COLUMNS = (
+        "key",
+        "source",
+        "normalized_query",
+        "model",
+        "context_hash",
+        "schema_fingerprint",
+        "embedding_key",
+        "query_embedding",
+        "code",
+        "created_at",
+        "last_access",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        source: str,
+        schema_fingerprint: str,
+        ttl_seconds: float = 86400,
+        max_entries: int = 500,
+        similarity_threshold: Optional[float] = 0.95,
+    ):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        # Hashed, so connection credentials are not written to the cache file
+        self.source = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "near_hits": 0, "misses": 0}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(results)")]
+        if columns and tuple(columns) != self.COLUMNS:
+            # Written by an older version; it is only a cache
+            self._db.execute("DROP TABLE results")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                normalized_query TEXT NOT NULL,
+                model TEXT NOT NULL,
+                context_hash TEXT NOT NULL,
+                schema_fingerprint TEXT NOT NULL,
+                embedding_key TEXT NOT NULL,
+                query_embedding BLOB,
+                code TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+        self.set_schema_fingerprint(schema_fingerprint)
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return re.sub(r"\s+", " ", query).strip().rstrip("?.!;").strip().lower()
+
+    @staticmethod
+    def context_hash(context: str) -> str:
+        return hashlib.sha256(context.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def literals(normalized_query: str) -> List[str]:
+        """Numbers and quoted strings in a query, which a near hit must share."""
+        return sorted(re.findall(r"\d+(?:\.\d+)?|'[^']*'|\"[^\"]*\"", normalized_query))
+
+    def set_schema_fingerprint(self, schema_fingerprint: str):
+        """Drop this source's entries generated against any other schema version."""
+        with self._lock:
+            self.schema_fingerprint = schema_fingerprint
+            deleted = self._db.execute(
+                "DELETE FROM results WHERE source = ? AND schema_fingerprint != ?",
+                (self.source, schema_fingerprint),
+            ).rowcount
+            self._db.commit()
+        if deleted:
+            self.logger.info(f"Schema changed, invalidated {deleted} cached results.")
+
+    def get(
+        self,
+        query: str,
+        context_hash: str,
+        model: str,
+        query_embedding: Optional[List[float]] = None,
+        embedding_key: str = "",
+    ) -> Optional[str]:
+        normalized_query = self.normalize_query(query)
+        key = self._key(normalized_query, context_hash, model, embedding_key)
+        now = time.time()
+
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM results WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            row = self._db.execute(
+                "SELECT code, key FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            counter = "hits"
+
+            if row is None and query_embedding is not None and self.similarity_threshold:
+                row = self._nearest(
+                    normalized_query, context_hash, model, query_embedding, embedding_key
+                )
+                counter = "near_hits"
+
+            if row is None:
+                self._counters["misses"] += 1
+                self._db.commit()
+                return None
+
+            self._counters[counter] += 1
+            self._db.execute(
+                "UPDATE results SET last_access = ? WHERE key = ?", (now, row[1])
+            )
+            self._db.commit()
+
+        self.logger.info(f"Served dashboard code from result cache ({counter}).")
+        return row[0]
+
+    def put(
+        self,
+        query: str,
+        context_hash: str,
+        model: str,
+        code: str,
+        query_embedding: Optional[List[float]] = None,
+        embedding_key: str = "",
+    ):
+        normalized_query = self.normalize_query(query)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(normalized_query, context_hash, model, embedding_key),
+                    self.source,
+                    normalized_query,
+                    model,
+                    context_hash,
+                    self.schema_fingerprint,
+                    embedding_key,
+                    (
+                        array("f", query_embedding).tobytes()
+                        if query_embedding is not None
+                        else None
+                    ),
+                    code,
+                    now,
+                    now,
+                ),
+            )
+            # Size-based eviction, least recently used first
+            self._db.execute(
+                """
+                DELETE FROM results WHERE key IN (
+                    SELECT key FROM results ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute(
+                "SELECT COUNT(*) FROM results WHERE source = ?", (self.source,)
+            ).fetchone()[0]
+            lookups = sum(self._counters.values())
+            hits = self._counters["hits"] + self._counters["near_hits"]
+            return {
+                **self._counters,
+                "entries": entries,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def _nearest(
+        self,
+        normalized_query: str,
+        context_hash: str,
+        model: str,
+        query_embedding: List[float],
+        embedding_key: str,
+    ):
+        # Vectors from different embedding models are not comparable
+        rows = self._db.execute(
+            "SELECT code, key, query_embedding, normalized_query FROM results "
+            "WHERE source = ? AND model = ? AND context_hash = ? "
+            "AND embedding_key = ? AND query_embedding IS NOT NULL",
+            (self.source, model, context_hash, embedding_key),
+        ).fetchall()
+        if not rows:
+            return None
+
+        matrix = np.stack([np.frombuffer(row[2], dtype=np.float32) for row in rows])
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        similarities = matrix @ query / np.where(norms == 0, 1, norms)
+
+        literals = self.literals(normalized_query)
+        for index in np.argsort(-similarities):
+            if similarities[index] < self.similarity_threshold:
+                break
+            if self.literals(rows[index][3]) == literals:
+                return rows[index][0], rows[index][1]
+        return None
+
+    def _key(
+        self, normalized_query: str, context_hash: str, model: str, embedding_key: str
+    ) -> str:
+        key = "\0".join(
+            (self.source, model, embedding_key, context_hash, normalized_query)
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
@@ -0,0 +1,49 @@
+from collections import defaultdict
+from typing import Dict, List, Set
+
+
+class SchemaGraph:
+    """Undirected join graph between tables, built from the introspected foreign keys.
+
+    Tables are keyed as in the schema dict (``"schema.table"``), so neighbours can
+    be looked up directly among the per-table schema documents.
+    """
+
+    def __init__(self, schema: dict):
+        self.edges: Dict[str, Set[str]] = defaultdict(set)
+        for table, details in schema.items():
+            if not isinstance(details, dict):
+                continue
+            for fk in details.get("foreign_keys") or []:
+                referred = (
+                    f"{fk['referred_schema']}.{fk['referred_table']}"
+                    if fk.get("referred_schema")
+                    else f"{table.rsplit('.', 1)[0]}.{fk['referred_table']}"
+                )
+                if referred in schema and referred != table:
+                    self.edges[table].add(referred)
+                    self.edges[referred].add(table)
+
+    def neighbors(self, table: str) -> List[str]:
+        return sorted(self.edges.get(table, ()))
+
+    def expand(self, tables: List[str], hops: int = 1) -> List[str]:
+        """Return ``tables`` followed by their join partners up to ``hops`` away.
+
+        Order is breadth-first from the highest-ranked tables, so when the context
+        is trimmed to budget, the retrieved tables and their direct partners are
+        kept first.
+        """
+        ordered = list(dict.fromkeys(tables))
+        seen = set(ordered)
+        frontier = ordered
+        for _ in range(max(hops, 0)):
+            next_frontier = []
+            for table in frontier:
+                for neighbor in self.neighbors(table):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+            ordered.extend(next_frontier)
+            frontier = next_frontier
+        return ordered
@@ -0,0 +1,231 @@
+"""Local OpenAI-compatible chat completions server backed by the fake chat model.
+
+Usage (from the repository root):
+
+    python -m app.core.llm.stub_llm_server --port 8001 [--latency 0.5] \\
+        [--error-rate 0.1]
+
+Then point the app at it with ``LLM_PROVIDER=openai``,
+``OPENAI_BASE_URL=http://127.0.0.1:8001/v1`` and any ``OPENAI_API_KEY``.
+``POST /v1/chat/completions`` answers like ``FakeChatModel`` (streamed as
+server-sent events when ``"stream": true``); ``--error-rate`` answers that
+fraction of requests with 429 and a ``Retry-After`` header to exercise the
+scheduler's backoff. ``GET /stats`` returns request counts.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.llm.fake_chat_model import FakeChatModel
+from app.core.utils.logger import Logger
+
+
+class StubLLMServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8001,
+        latency_seconds: float = 0.0,
+        tokens_per_second: float = None,
+        error_rate: float = 0.0,
+        seed: int = None,
+    ):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.host = host
+        self.port = port
+        self.latency_seconds = latency_seconds
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "completions": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _rate_limited(self) -> bool:
+        with self._lock:
+            return self.random.random() < self.error_rate
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path == "/stats":
+                    with stub._lock:
+                        self._send_json(200, dict(stub.stats))
+                elif self.path == "/v1/models":
+                    self._send_json(200, {"object": "list", "data": []})
+                else:
+                    self._send_json(404, {"error": {"message": "Not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                stub._count("requests")
+                if not self.path.endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "Not found"}})
+                    return
+                if stub._rate_limited():
+                    stub._count("rate_limited")
+                    self._send_json(
+                        429,
+                        {"error": {"message": "Rate limit reached", "type": "requests"}},
+                        {"Retry-After": "0.1"},
+                    )
+                    return
+
+                stub._count("completions")
+                model = FakeChatModel(
+                    request.get("model", "fake"),
+                    latency_seconds=stub.latency_seconds,
+                    tokens_per_second=stub.tokens_per_second,
+                )
+                if request.get("stream"):
+                    self._stream(model, request)
+                else:
+                    content = model.invoke(request["messages"]).content
+                    self._send_json(
+                        200,
+                        {
+                            **self._envelope(request, "chat.completion"),
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {"role": "assistant", "content": content},
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                            "usage": self._usage(request, content),
+                        },
+                    )
+
+            def _stream(self, model, request):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                envelope = self._envelope(request, "chat.completion.chunk")
+                content = []
+                for chunk in model.stream(request["messages"]):
+                    content.append(chunk.content)
+                    self._send_event(
+                        {
+                            **envelope,
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "delta": {"content": chunk.content},
+                                    "finish_reason": None,
+                                }
+                            ],
+                        }
+                    )
+                self._send_event(
+                    {
+                        **envelope,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    }
+                )
+                if (request.get("stream_options") or {}).get("include_usage"):
+                    self._send_event(
+                        {
+                            **envelope,
+                            "choices": [],
+                            "usage": self._usage(request, "".join(content)),
+                        }
+                    )
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def _envelope(self, request, kind):
+                return {
+                    "id": f"chatcmpl-{uuid.uuid4().hex}",
+                    "object": kind,
+                    "created": int(time.time()),
+                    "model": request.get("model", "fake"),
+                }
+
+            def _usage(self, request, content):
+                # Same rough estimate as TokenBudget without an encoding
+                prompt = "".join(m.get("content") or "" for m in request["messages"])
+                prompt_tokens = -(-len(prompt) // 4)
+                completion_tokens = -(-len(content) // 4)
+                return {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                }
+
+            def _send_event(self, payload):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+            def _send_json(self, status, payload, headers=None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                stub.logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(
+            target=self._server.serve_forever, name="stub-llm-server", daemon=True
+        ).start()
+        self.logger.info(f"Stub LLM server listening on http://{self.host}:{self.port}/v1")
+        return self
+
+    def dispose(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        args.host,
+        args.port,
+        latency_seconds=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ).start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from typing import List, Optional, Tuple
+
+from app.core.utils.logger import Logger
+from app.core.utils.resource_registry import ResourceRegistry
+
+
+class TokenBudget:
+    """Counts prompt tokens with the model's tiktoken encoding and trims context to fit.
+
+    If the encoding cannot be loaded (e.g. offline without a tiktoken cache), token
+    counts fall back to an estimate of one token per ``CHARS_PER_TOKEN`` characters.
+    """
+
+    CHARS_PER_TOKEN = 4
+    DEFAULT_ENCODING = "cl100k_base"
+
+    def __init__(self, model_name: str, max_tokens: Optional[int] = None):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.encoding = ResourceRegistry.instance().get_or_create(
+            "tokenizer", model_name, self._load_encoding
+        )
+
+    def _load_encoding(self):
+        try:
+            import tiktoken
+
+            try:
+                return tiktoken.encoding_for_model(self.model_name)
+            except KeyError:
+                return tiktoken.get_encoding(self.DEFAULT_ENCODING)
+        except Exception as e:
+            self.logger.warning(
+                f"Could not load tiktoken encoding, estimating token counts: {str(e)}"
+            )
+            return None
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return -(-len(text) // self.CHARS_PER_TOKEN)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is None:
+            return text[: max_tokens * self.CHARS_PER_TOKEN]
+        tokens = self.encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max_tokens])
+
+    def fit(self, documents: List[str], separator: str = "\n\n") -> Tuple[List[str], int]:
+        """Keep documents in order while they fit in ``max_tokens``.
+
+        Documents that would overflow the budget are skipped (later, smaller ones
+        may still fit). If not even the first document fits, it is truncated.
+        Returns the kept documents and their total token count.
+        """
+        separator_tokens = self.count(separator)
+        kept, used = [], 0
+        for document in documents:
+            cost = self.count(document) + (separator_tokens if kept else 0)
+            if not self.max_tokens or used + cost <= self.max_tokens:
+                kept.append(document)
+                used += cost
+
+        if not kept and documents:
+            kept = [self.truncate(documents[0], self.max_tokens)]
+            used = self.count(kept[0])
+        return kept, used
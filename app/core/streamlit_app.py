@@ -1,9 +1,16 @@
 import pandas as pd
 import streamlit as st
 
+from app.core.data_sources.data_source import QueryCostExceededError
+from app.core.execution.query_result_cache import QueryResultCache
+from app.core.llm.analysis_overview import AnalysisOverview
 from app.core.llm.llm_service import LLMService
 from app.core.utils.config import Config
 from app.core.utils.logger import Logger
+from app.core.utils.metrics_server import MetricsServer
+from app.core.utils.resource_registry import ResourceRegistry
+from app.core.utils.tracer import Tracer
+from app.core.utils.warmup import start_background_warmup
 
 
 class StreamlitApp:
@@ -14,33 +21,114 @@ class StreamlitApp:
         # Initialize logger and services
         self.logger = Logger(self.__class__.__name__).get_logger()
         self.source = Config().DW_DATABASE_URL
-        self.llm_service = LLMService(source=self.source)
+        self.tracer = Tracer.instance()
+        if Config.METRICS_PORT:
+            ResourceRegistry.instance().get_or_create(
+                "metrics_server", Config.METRICS_PORT, self._start_metrics_server
+            )
+        self._llm_service = None
 
-        # Initialize session state for analysis description
-        if "analysis_description" not in st.session_state:
-            st.session_state["analysis_description"] = None
+    @property
+    def llm_service(self) -> LLMService:
+        # Resolved on first use so the page header renders before the heavy
+        # initialization. The process-wide service is reused across reruns and
+        # sessions so the engine, vector client, embedding model and Chroma
+        # check happen once.
+        if self._llm_service is None:
+            self._llm_service = ResourceRegistry.instance().get_or_create(
+                "llm_service", self.source, self._create_llm_service
+            )
+        return self._llm_service
+
+    def _start_metrics_server(self):
+        try:
+            return MetricsServer(Config.METRICS_HOST, Config.METRICS_PORT).start()
+        except OSError as e:
+            self.logger.warning(f"Metrics endpoint disabled: {str(e)}")
+            return None
+
+    def _create_llm_service(self):
+        """Build the shared LLMService, showing schema profiling progress in the sidebar."""
+        progress_bar = st.sidebar.progress(0.0, text="Profiling database schema...")
+
+        def report_progress(done, total):
+            progress_bar.progress(done / total, text=f"Profiled {done}/{total} tables")
+
+        try:
+            return LLMService(source=self.source, progress_callback=report_progress)
+        finally:
+            progress_bar.empty()
+
+    def _create_runtime(self):
+        # sqlglot is only needed once a query runs
+        from app.core.execution.aggregate_store import AggregateStore
+        from app.core.execution.dashboard_runtime import DashboardRuntime
+
+        result_cache = ResourceRegistry.instance().get_or_create(
+            "query_result_cache",
+            self.source,
+            lambda: QueryResultCache(
+                max_bytes=int(Config.QUERY_CACHE_MAX_MB * 1024 * 1024),
+                ttl_seconds=Config.QUERY_CACHE_TTL_SECONDS,
+            ),
+        )
+        data_source = self.llm_service.data_source
+        return DashboardRuntime(
+            data_source,
+            result_cache,
+            AggregateStore.shared(self.source, data_source),
+        )
 
     def show_database_overview(self):
-        """Display the database overview in the sidebar."""
+        """Display the database overview in the sidebar without blocking the page."""
         st.sidebar.title("Database Overview")
         try:
-            if st.session_state["analysis_description"] is None:
-                analysis_description = self.llm_service.generate_analysis_description()
-                st.session_state["analysis_description"] = analysis_description
+            overview = ResourceRegistry.instance().get_or_create(
+                "analysis_overview",
+                self.source,
+                lambda: AnalysisOverview(self.llm_service),
+            )
+            status = overview.status()
+            if status["ready"] or status["error"]:
+                with st.sidebar:
+                    self._render_overview(overview)
+            else:
+                # Poll the background worker without rerunning the whole page
+                with st.sidebar:
+                    self._render_overview_fragment(overview)
+        except Exception as e:
+            self.logger.error(f"Error generating analysis description: {str(e)}")
+            st.sidebar.error(f"Error generating analysis description: {str(e)}")
 
-            with st.sidebar.expander("Details and suggested prompts", expanded=False):
+    def _render_overview(self, overview):
+        status = overview.status()
+        if status["ready"]:
+            with st.expander("Details and suggested prompts", expanded=False):
                 st.markdown(
-                    f"<div style='width: auto; word-wrap: break-word;'>{st.session_state['analysis_description']}</div>",
+                    f"<div style='width: auto; word-wrap: break-word;'>{status['text']}</div>",
                     unsafe_allow_html=True,
                 )
-        except Exception as e:
-            self.logger.error(f"Error generating analysis description: {str(e)}")
-            st.sidebar.error(f"Error generating analysis description: {str(e)}")
+        elif status["error"]:
+            st.error(f"Error generating analysis description: {status['error']}")
+        else:
+            st.info("Generating database overview...")
+            if status["text"]:
+                st.markdown(status["text"])
+
+    @st.fragment(run_every=Config.OVERVIEW_POLL_SECONDS)
+    def _render_overview_fragment(self, overview):
+        status = overview.status()
+        if status["ready"] or status["error"]:
+            # A full rerun renders the final state outside this fragment, which
+            # stops the polling
+            st.rerun()
+        self._render_overview(overview)
 
     def run(self):
         """Run the main Streamlit application."""
         st.title("Talk to Your Data")
         st.subheader("Interact with your data using natural language queries")
+        start_background_warmup(self.source)
 
         # Display the database overview in the sidebar
         self.show_database_overview()
@@ -53,27 +141,71 @@ class StreamlitApp:
 
         if st.button("Submit Query"):
             if prompt:
-                try:
-                    # Get the pure Python code from the LLM response
-                    python_code = self.llm_service.process_data_analysis(prompt)
-
-                    # Execute the generated Python code
-                    exec(python_code)
-
-                    # Show the generated Python code at the bottom of the page
-                    with st.expander("View Generated Python Code", expanded=False):
-                        st.write("## Generated Python Code")
-                        st.code(python_code, language="python")
-
-                except Exception as e:
-                    # Show the generated Python code at the bottom of the page
-                    with st.expander("View Generated Python Code", expanded=False):
-                        st.write("## Generated Python Code")
-                        st.code(python_code, language="python")
-
-                    self.logger.error(
-                        f"Error processing query: {str(e)}", exc_info=True
-                    )
-                    st.warning(f"Error processing query, please try again.")
+                with self.tracer.span("request", query=prompt) as trace:
+                    self._answer(prompt)
+                st.session_state["last_trace"] = trace
             else:
                 st.warning("Please enter a query.")
+
+        self._render_trace_panel()
+
+    def _answer(self, prompt: str):
+        """Stream, execute and display the dashboard generated for ``prompt``."""
+        python_code = ""
+        try:
+            # Stream the pure Python code from the LLM response into
+            # the code panel as it is generated
+            code_placeholder = st.empty()
+            for chunk in self.llm_service.stream_data_analysis(prompt):
+                python_code += chunk
+                code_placeholder.code(python_code, language="python")
+            code_placeholder.empty()
+            python_code = python_code.strip()
+
+            # Execute the generated Python code with the shared engine
+            # and cached run_query() helper
+            runtime = self._create_runtime()
+            runtime.execute(python_code)
+            for notice in dict.fromkeys(runtime.notices):
+                st.info(notice)
+
+            # Show the generated Python code at the bottom of the page
+            with st.expander("View Generated Python Code", expanded=False):
+                st.write("## Generated Python Code")
+                st.code(python_code, language="python")
+
+            if runtime.query_log:
+                with st.expander("View Query Timings", expanded=False):
+                    st.dataframe(
+                        pd.DataFrame(runtime.query_log),
+                        use_container_width=True,
+                    )
+
+        except QueryCostExceededError as e:
+            with st.expander("View Generated Python Code", expanded=False):
+                st.write("## Generated Python Code")
+                st.code(python_code, language="python")
+
+            st.warning(f"{str(e)} Try narrowing the question.")
+
+        except Exception as e:
+            # Show the generated Python code at the bottom of the page
+            with st.expander("View Generated Python Code", expanded=False):
+                st.write("## Generated Python Code")
+                st.code(python_code, language="python")
+
+            self.logger.error(
+                f"Error processing query: {str(e)}", exc_info=True
+            )
+            st.warning(f"Error processing query, please try again.")
+
+    def _render_trace_panel(self):
+        """Show the per-stage timing breakdown of the last query."""
+        trace = st.session_state.get("last_trace")
+        if trace is None:
+            return
+        with st.expander("Debug: Request Breakdown", expanded=False):
+            st.caption(
+                f"Total {trace.duration:.2f}s for: {trace.attributes.get('query')}"
+            )
+            st.dataframe(pd.DataFrame(trace.to_rows()), use_container_width=True)
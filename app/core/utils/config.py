@@ -6,3 +6,121 @@ class Config:
     DW_DATABASE_URL = os.getenv("DW_DATABASE_URL")
     OLTP_DATABASE_URL = os.getenv("OLTP_DATABASE_URL")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    # OpenAI-compatible endpoint, e.g. the local stub model server
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
+
+    # Chat model backend: "openai", or "fake" for the deterministic offline model
+    # (with an optional simulated time to first token)
+    LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai").lower()
+    FAKE_LLM_LATENCY_SECONDS = float(os.getenv("FAKE_LLM_LATENCY_SECONDS", "0"))
+
+    # Shared LLM scheduler: concurrent upstream calls, tokens-per-minute budget
+    # (0 disables it) and retries with jittered exponential backoff
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "20"))
+
+    # Local directory for schema snapshots and other derived caches
+    CACHE_DIR = os.getenv("CACHE_DIR", "cache")
+
+    # Per-table column profiling limits used when optimizer statistics are missing
+    PROFILE_TABLE_TIME_BUDGET_SECONDS = float(
+        os.getenv("PROFILE_TABLE_TIME_BUDGET_SECONDS", "10")
+    )
+    PROFILE_MAX_ROWS = int(os.getenv("PROFILE_MAX_ROWS", "10000"))
+
+    # Connection pool for the shared engine; schema introspection uses at most
+    # DB_POOL_SIZE worker threads
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    SCHEMA_WORKERS = int(os.getenv("SCHEMA_WORKERS", "4"))
+
+    # Embedding cache (in-memory LRU, optionally persisted under CACHE_DIR) and
+    # encoder batch size for bulk schema indexing
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+    EMBEDDING_DISK_CACHE = os.getenv("EMBEDDING_DISK_CACHE", "true").lower() == "true"
+    EMBEDDING_DISK_CACHE_MAX_ENTRIES = int(
+        os.getenv("EMBEDDING_DISK_CACHE_MAX_ENTRIES", "100000")
+    )
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+    # Embedding backend: "sentence-transformers" (PyTorch) or "onnx" (ONNX Runtime,
+    # int8-quantized export by default), and CPU threads for encoding (0: default)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "sentence-transformers").lower()
+    EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+    EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0"))
+
+    # Cache of generated dashboard code; near-duplicate queries are matched by
+    # embedding similarity (set the threshold to 0 to only allow exact matches)
+    RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "86400"))
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "500"))
+    RESULT_CACHE_SIMILARITY_THRESHOLD = float(
+        os.getenv("RESULT_CACHE_SIMILARITY_THRESHOLD", "0.95")
+    )
+
+    # How often the sidebar checks on the background database overview
+    OVERVIEW_POLL_SECONDS = float(os.getenv("OVERVIEW_POLL_SECONDS", "2"))
+
+    # Cache of SQL results fetched by generated dashboards via run_query()
+    QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "600"))
+    # Total in-memory size of cached results; larger results are not cached
+    QUERY_CACHE_MAX_MB = float(os.getenv("QUERY_CACHE_MAX_MB", "1024"))
+
+    # Result shaping for generated queries: row limit pushed into plain SELECTs,
+    # fetch chunk size, Arrow-backed dtypes and a per-dashboard memory ceiling
+    QUERY_MAX_ROWS = int(os.getenv("QUERY_MAX_ROWS", "100000"))
+    QUERY_FETCH_CHUNK_ROWS = int(os.getenv("QUERY_FETCH_CHUNK_ROWS", "50000"))
+    QUERY_ARROW_DTYPES = os.getenv("QUERY_ARROW_DTYPES", "true").lower() == "true"
+    DASHBOARD_MEMORY_LIMIT_MB = float(os.getenv("DASHBOARD_MEMORY_LIMIT_MB", "512"))
+
+    # Guard rails for generated SQL: EXPLAIN-based pre-flight check
+    # ("reject", "flag" or "off"; thresholds of 0 disable that check) and a
+    # server-side statement timeout
+    QUERY_COST_GUARD_MODE = os.getenv("QUERY_COST_GUARD_MODE", "reject").lower()
+    QUERY_MAX_COST = float(os.getenv("QUERY_MAX_COST", "10000000"))
+    QUERY_MAX_ESTIMATED_ROWS = float(os.getenv("QUERY_MAX_ESTIMATED_ROWS", "50000000"))
+    # SQLite has no plan cost; limit the full table scans nested in one join instead
+    QUERY_MAX_NESTED_SCANS = int(os.getenv("QUERY_MAX_NESTED_SCANS", "1"))
+    QUERY_TIMEOUT_SECONDS = float(os.getenv("QUERY_TIMEOUT_SECONDS", "60"))
+
+    # Rows parsed from CSV files (and read from Parquet/Feather files) to infer
+    # column types and data summaries; 0 reads the whole file
+    FILE_SAMPLE_ROWS = int(os.getenv("FILE_SAMPLE_ROWS", "100000"))
+
+    # Engine for single-file sources: "duckdb" (queryable) or "pyarrow"
+    # (schema and summaries only, no SQL); directories always use DuckDB
+    FILE_ENGINE = os.getenv("FILE_ENGINE", "duckdb").lower()
+    # In-process DuckDB engine for CSV/Parquet sources; queries beyond the memory
+    # limit spill to CACHE_DIR/duckdb (0 threads uses all cores)
+    DUCKDB_MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT", "2GB")
+    DUCKDB_THREADS = int(os.getenv("DUCKDB_THREADS", "0"))
+
+    # Schema retrieval for prompts: top-k tables from the vector store, expanded
+    # along foreign keys, trimmed to a token budget (0 disables the budget)
+    SCHEMA_TOP_K = int(os.getenv("SCHEMA_TOP_K", "5"))
+    SCHEMA_FK_HOPS = int(os.getenv("SCHEMA_FK_HOPS", "1"))
+    SCHEMA_CONTEXT_MAX_TOKENS = int(os.getenv("SCHEMA_CONTEXT_MAX_TOKENS", "4000"))
+    # BM25 index over schema documents, fused with vector results by reciprocal
+    # rank fusion (RRF constant k)
+    SCHEMA_LEXICAL_SEARCH = os.getenv("SCHEMA_LEXICAL_SEARCH", "true").lower() == "true"
+    SCHEMA_RRF_K = int(os.getenv("SCHEMA_RRF_K", "60"))
+    # Schema text format in prompts: "verbose" or "compact" (DDL-like, fewer
+    # tokens; opt in once it has been evaluated against your queries)
+    SCHEMA_FORMAT = os.getenv("SCHEMA_FORMAT", "verbose").lower()
+    # Prometheus metrics endpoint for stage latency histograms; opt-in, set
+    # METRICS_PORT (e.g. 9464) to serve it
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+    # Background warmup after the first render: "off", "imports" (heavy modules)
+    # or "services" (also the LLM service and embedding model)
+    WARMUP_ON_START = os.getenv("WARMUP_ON_START", "off").lower()
+    # Local Parquet store for hot aggregate queries: materialized once a query has
+    # run AGGREGATE_MIN_RUNS times averaging AGGREGATE_MIN_SECONDS on the
+    # warehouse, and refreshed when the schema fingerprint changes or after the TTL
+    AGGREGATE_STORE_ENABLED = os.getenv("AGGREGATE_STORE_ENABLED", "true").lower() == "true"
+    AGGREGATE_MIN_RUNS = int(os.getenv("AGGREGATE_MIN_RUNS", "3"))
+    AGGREGATE_MIN_SECONDS = float(os.getenv("AGGREGATE_MIN_SECONDS", "1"))
+    AGGREGATE_MAX_ROWS = int(os.getenv("AGGREGATE_MAX_ROWS", "100000"))
+    AGGREGATE_TTL_SECONDS = float(os.getenv("AGGREGATE_TTL_SECONDS", "3600"))
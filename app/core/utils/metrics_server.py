@@ -0,0 +1,52 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.utils.logger import Logger
+from app.core.utils.tracer import Tracer
+
+
+class MetricsServer:
+    """Serves the tracer's metrics at ``/metrics`` in Prometheus text format."""
+
+    def __init__(self, host: str, port: int, tracer: Tracer = None):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self.host = host
+        self.port = port
+        self.tracer = tracer or Tracer.instance()
+        self._server = None
+
+    def start(self):
+        tracer = self.tracer
+        logger = self.logger
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = tracer.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        ).start()
+        self.logger.info(
+            f"Serving metrics on http://{self.host}:{self.port}/metrics"
+        )
+        return self
+
+    def dispose(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,47 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe token bucket: ``rate`` units per second with bursts up to ``capacity``.
+
+    A ``rate`` of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until ``amount`` units are available; returns the seconds waited."""
+        if not self.rate:
+            return 0.0
+        # Requests larger than the bucket would never fit; let them drain it
+        amount = min(amount, self.capacity)
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return now - started
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def debit(self, amount: float):
+        """Charge ``amount`` after the fact; the balance may go negative."""
+        if not self.rate:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
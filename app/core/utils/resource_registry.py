@@ -0,0 +1,142 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.utils.logger import Logger
+
+
+class ResourceRegistry:
+    """Process-wide, thread-safe cache of expensive shared resources.
+
+    Streamlit re-runs the app script on every interaction, so anything built in
+    ``StreamlitApp.__init__`` is rebuilt per click. Resources such as database
+    engines, vector store clients and embedding models are registered here once
+    per process, keyed by ``(kind, key)`` (e.g. ``("engine", source_url)``).
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self._lock = threading.Lock()
+        self._resources: Dict[Tuple[str, Hashable], Any] = {}
+        self._build_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        self._stats: Dict[Tuple[str, Hashable], dict] = {}
+
+    @classmethod
+    def instance(cls) -> "ResourceRegistry":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def get_or_create(self, kind: str, key: Hashable, factory: Callable[[], Any]):
+        """Return the resource for ``(kind, key)``, building it with ``factory`` once."""
+        resource_key = (kind, key)
+        start = time.perf_counter()
+
+        with self._lock:
+            if resource_key in self._resources:
+                resource = self._resources[resource_key]
+                self._record_warm(resource_key, time.perf_counter() - start)
+                return resource
+            build_lock = self._build_locks.setdefault(resource_key, threading.Lock())
+
+        # Build outside the registry lock so a slow model load does not block
+        # lookups of unrelated resources; the per-key lock prevents duplicates.
+        with build_lock:
+            with self._lock:
+                if resource_key in self._resources:
+                    resource = self._resources[resource_key]
+                    self._record_warm(resource_key, time.perf_counter() - start)
+                    return resource
+
+            resource = factory()
+            elapsed = time.perf_counter() - start
+
+            with self._lock:
+                self._resources[resource_key] = resource
+                stats = self._stats.setdefault(resource_key, self._empty_stats())
+                stats["cold_builds"] += 1
+                stats["cold_seconds"] = elapsed
+
+        self.logger.info(f"Built shared {kind} resource in {elapsed:.3f}s.")
+        return resource
+
+    def invalidate(self, kind: Optional[str] = None, key: Optional[Hashable] = None):
+        """Drop cached resources matching ``kind`` and ``key`` (``None`` matches all).
+
+        Resources exposing ``dispose()`` (e.g. SQLAlchemy engines) are disposed so
+        their connection pools are closed.
+        """
+        with self._lock:
+            matches = [
+                resource_key
+                for resource_key in self._resources
+                if (kind is None or resource_key[0] == kind)
+                and (key is None or resource_key[1] == key)
+            ]
+            removed = [(rk, self._resources.pop(rk)) for rk in matches]
+
+        for resource_key, resource in removed:
+            dispose = getattr(resource, "dispose", None)
+            if callable(dispose):
+                try:
+                    dispose()
+                except Exception as e:
+                    self.logger.error(
+                        f"Error disposing {resource_key[0]} resource: {str(e)}"
+                    )
+
+        if removed:
+            self.logger.info(f"Invalidated {len(removed)} shared resource(s).")
+        return len(removed)
+
+    def report(self) -> Dict[str, dict]:
+        """Cold-vs-warm construction timings per registered resource."""
+        with self._lock:
+            report = {}
+            for (kind, key), stats in self._stats.items():
+                warm_hits = stats["warm_hits"]
+                report[f"{kind}:{self.display_key(key)}"] = {
+                    "cached": (kind, key) in self._resources,
+                    "cold_builds": stats["cold_builds"],
+                    "cold_seconds": stats["cold_seconds"],
+                    "warm_hits": warm_hits,
+                    "warm_seconds_avg": (
+                        stats["warm_seconds_total"] / warm_hits if warm_hits else None
+                    ),
+                }
+            return report
+
+    @classmethod
+    def display_key(cls, key: Hashable) -> str:
+        """Render ``key`` for reports with any URL passwords masked."""
+        if isinstance(key, tuple):
+            return f"({', '.join(cls.display_key(part) for part in key)})"
+        if isinstance(key, str) and "://" in key:
+            # Imported here: the registry is loaded before SQLAlchemy is needed
+            from sqlalchemy import make_url
+            from sqlalchemy.exc import ArgumentError
+
+            try:
+                return make_url(key).render_as_string(hide_password=True)
+            except ArgumentError:
+                return "<url>"
+        return str(key)
+
+    def _record_warm(self, resource_key, elapsed: float):
+        stats = self._stats.setdefault(resource_key, self._empty_stats())
+        stats["warm_hits"] += 1
+        stats["warm_seconds_total"] += elapsed
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {
+            "cold_builds": 0,
+            "cold_seconds": None,
+            "warm_hits": 0,
+            "warm_seconds_total": 0.0,
+        }
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from app.core.utils.logger import Logger
+
+
+class Span:
+    """One timed stage of a request; nested spans become its children."""
+
+    __slots__ = ("name", "attributes", "start", "duration", "children", "error")
+
+    def __init__(self, name: str, attributes: dict):
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self.duration = None
+        self.children: List["Span"] = []
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_rows(self, depth: int = 0) -> List[dict]:
+        """Flatten the span tree depth-first, for display."""
+        rows = [
+            {
+                "stage": f"{'  ' * depth}{self.name}",
+                "ms": round((self.duration or 0) * 1000, 1),
+                "error": self.error,
+                **self.attributes,
+            }
+        ]
+        for child in self.children:
+            rows.extend(child.to_rows(depth + 1))
+        return rows
+
+
+class Tracer:
+    """Lightweight in-process tracer with Prometheus-style aggregation.
+
+    ``span(name)`` times a block and nests under the span active in the current
+    context. Every finished span is added to a per-stage latency histogram;
+    ``increment`` feeds counters such as LLM token usage. ``render_prometheus``
+    returns both in the Prometheus text exposition format.
+    """
+
+    PREFIX = "talk_to_data"
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.logger = Logger(self.__class__.__name__).get_logger()
+        self._current: ContextVar[Optional[Span]] = ContextVar(
+            "current_span", default=None
+        )
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, dict] = {}
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._counters: Dict[Tuple[str, Tuple], float] = defaultdict(float)
+        self._gauges: Dict[Tuple[str, Tuple], float] = {}
+
+    @classmethod
+    def instance(cls) -> "Tracer":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = self._current.get()
+        span = Span(name, attributes)
+        token = self._current.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            try:
+                self._current.reset(token)
+            except ValueError:
+                # A generator holding the span was finalized in another context
+                pass
+            if parent is not None:
+                parent.children.append(span)
+            self._observe(span)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._gauges[key] = value
+
+    def _observe(self, span: Span):
+        with self._lock:
+            histogram = self._histograms.setdefault(
+                span.name, {"buckets": [0] * len(self.BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for position, bound in enumerate(self.BUCKETS):
+                if span.duration <= bound:
+                    histogram["buckets"][position] += 1
+            histogram["sum"] += span.duration
+            histogram["count"] += 1
+            if span.error:
+                self._errors[span.name] += 1
+
+    @staticmethod
+    def _format_value(value) -> str:
+        # ``:g`` keeps only 6 significant digits, so large counters stop moving
+        if isinstance(value, int) or float(value).is_integer():
+            return str(int(value))
+        return repr(float(value))
+
+    def render_prometheus(self) -> str:
+        metric = f"{self.PREFIX}_stage_duration_seconds"
+        lines = [
+            f"# HELP {metric} Time spent per pipeline stage.",
+            f"# TYPE {metric} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._histograms.items()):
+                for bound, count in zip(self.BUCKETS, histogram["buckets"]):
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(
+                    f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}'
+                )
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {histogram["count"]}')
+
+            errors = f"{self.PREFIX}_stage_errors_total"
+            lines.extend(
+                [
+                    f"# HELP {errors} Pipeline stages that raised an exception.",
+                    f"# TYPE {errors} counter",
+                ]
+            )
+            lines.extend(
+                f'{errors}{{stage="{stage}"}} {count}'
+                for stage, count in sorted(self._errors.items())
+            )
+
+            declared = set()
+            samples = [
+                (f"{self.PREFIX}_{name}_total", "counter", labels, value)
+                for (name, labels), value in self._counters.items()
+            ] + [
+                (f"{self.PREFIX}_{name}", "gauge", labels, value)
+                for (name, labels), value in self._gauges.items()
+            ]
+            for metric_name, kind, labels, value in sorted(samples):
+                if metric_name not in declared:
+                    declared.add(metric_name)
+                    lines.append(f"# TYPE {metric_name} {kind}")
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                series = f"{metric_name}{{{label_text}}}" if label_text else metric_name
+                lines.append(f"{series} {self._format_value(value)}")
+
+        return "\n".join(lines) + "\n"
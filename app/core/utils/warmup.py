@@ -0,0 +1,120 @@
+"""Optional warmup hook that front-loads heavy imports and shared resources.
+
+Run it in a server's parent process before workers are forked (e.g. from a
+``--preload`` hook) so children inherit the imported modules, or from a
+container entrypoint to prime the schema snapshot, embedding and model caches:
+
+    python -m app.core.utils.warmup [--services]
+
+With ``WARMUP_ON_START`` set, the app runs it in a background thread after the
+first page render instead.
+"""
+
+import argparse
+import importlib
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.utils.config import Config
+from app.core.utils.logger import Logger
+from app.core.utils.resource_registry import ResourceRegistry
+
+# Modules that dominate cold start, in the order the pipeline first needs them
+HEAVY_MODULES = (
+    "sqlalchemy",
+    "sqlglot",
+    "pyarrow",
+    "duckdb",
+    "tiktoken",
+    "chromadb",
+    "sentence_transformers",
+    "onnxruntime",
+    "langchain_openai",
+)
+
+logger = Logger("Warmup").get_logger()
+
+
+def import_heavy_modules(modules=None) -> Dict[str, Optional[float]]:
+    """Import ``modules``, returning seconds per module (``None`` if unavailable).
+
+    By default this is ``HEAVY_MODULES`` minus the embedding backend not in use.
+    """
+    if modules is None:
+        unused = (
+            "sentence_transformers"
+            if Config.EMBEDDING_BACKEND == "onnx"
+            else "onnxruntime"
+        )
+        modules = [module for module in HEAVY_MODULES if module != unused]
+    timings = {}
+    for module in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(module)
+            timings[module] = round(time.perf_counter() - started, 3)
+        except ImportError as e:
+            logger.warning(f"Skipping warmup import of {module}: {str(e)}")
+            timings[module] = None
+    return timings
+
+
+def warmup(source: Optional[str] = None, services: bool = False) -> dict:
+    """Import heavy modules and, with ``services``, build the shared LLMService.
+
+    The service is registered under the same key the app uses, so a later
+    ``StreamlitApp`` in this process reuses it.
+    """
+    started = time.perf_counter()
+    report = {"imports": import_heavy_modules()}
+
+    if services:
+        from app.core.llm.llm_service import LLMService
+
+        source = source or Config().DW_DATABASE_URL
+        service_started = time.perf_counter()
+        llm_service = ResourceRegistry.instance().get_or_create(
+            "llm_service", source, lambda: LLMService(source=source)
+        )
+        llm_service.chroma_service.load_encoder()
+        report["services_seconds"] = round(time.perf_counter() - service_started, 3)
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    logger.info(f"Warmup finished in {report['seconds']:.2f}s.")
+    return report
+
+
+def start_background_warmup(source: Optional[str] = None):
+    """Run the configured warmup once per process on a daemon thread."""
+    mode = Config.WARMUP_ON_START
+    if mode not in ("imports", "services"):
+        return
+
+    def start():
+        thread = threading.Thread(
+            target=warmup,
+            kwargs={"source": source, "services": mode == "services"},
+            name="warmup",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    ResourceRegistry.instance().get_or_create("warmup", mode, start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm up imports and shared resources")
+    parser.add_argument("--source", help="Data source (default DW_DATABASE_URL)")
+    parser.add_argument(
+        "--services",
+        action="store_true",
+        help="Also build the LLM service (schema, vector index, embedding model)",
+    )
+    args = parser.parse_args()
+    print(warmup(args.source, services=args.services))
+
+
+if __name__ == "__main__":
+    main()
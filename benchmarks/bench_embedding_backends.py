@@ -0,0 +1,171 @@
+"""Embedding backends compared: throughput, memory and retrieval agreement.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_embedding_backends [--tables 1000] [--queries 200] \\
+        [--backends sentence-transformers onnx] [--threads 4] [--k 5]
+
+Each backend runs in a fresh interpreter so its import, load time and resident
+memory are measured in isolation. Every backend embeds the compact documents
+of a synthetic schema and a set of table lookups (see bench_schema_retrieval);
+the report gives load time, encode throughput, max RSS, recall@k of exact
+cosine search, and agreement with the first backend: mean cosine similarity of
+the document vectors and the overlap of the top-k tables per query.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.core.data_sources.schema_formatter import SchemaFormatter
+from benchmarks.bench_schema_retrieval import build_queries
+from benchmarks.synthetic_schema import generate_schema
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def max_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def corpus(args):
+    schema = generate_schema(args.tables, seed=args.seed)
+    documents = SchemaFormatter.tables_to_documents(schema, "compact")
+    queries = build_queries(list(schema), args.queries, args.seed)
+    return documents, queries
+
+
+def run_backend(args):
+    """Worker: embed the corpus with one backend and save the vectors."""
+    from app.core.llm.embedding_backend import EmbeddingBackend
+    from app.core.utils.config import Config
+
+    documents, queries = corpus(args)
+    Config.EMBEDDING_THREADS = args.threads
+    baseline_rss = max_rss_mb()
+
+    started = time.perf_counter()
+    backend = EmbeddingBackend.create(args.model, args.worker)
+    load_seconds = time.perf_counter() - started
+
+    texts = list(documents.values())
+    started = time.perf_counter()
+    document_vectors = backend.encode(texts, batch_size=args.batch_size)
+    encode_seconds = time.perf_counter() - started
+    query_vectors = backend.encode([query for query, _ in queries], args.batch_size)
+
+    np.savez(
+        args.vectors,
+        documents=np.asarray(document_vectors, dtype=np.float32),
+        queries=np.asarray(query_vectors, dtype=np.float32),
+    )
+    print(
+        json.dumps(
+            {
+                "load_s": round(load_seconds, 3),
+                "encode_s": round(encode_seconds, 3),
+                "docs_per_s": round(len(texts) / encode_seconds, 1),
+                "baseline_rss_mb": baseline_rss,
+                "max_rss_mb": max_rss_mb(),
+            }
+        )
+    )
+
+
+def top_k(document_vectors, query_vectors, k: int):
+    scores = query_vectors @ document_vectors.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument(
+        "--backends", nargs="+", default=["sentence-transformers", "onnx"]
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--vectors", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_backend(args)
+        return
+
+    documents, queries = corpus(args)
+    tables = list(documents)
+    expected = np.array([tables.index(table) for _, table in queries])
+    results, reference = {}, None
+
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in args.backends:
+            vectors_path = os.path.join(directory, f"{len(results)}.npz")
+            command = [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_embedding_backends",
+                *sys.argv[1:],
+                "--worker",
+                backend,
+                "--vectors",
+                vectors_path,
+            ]
+            completed = subprocess.run(
+                command, cwd=REPO_ROOT, capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                error = completed.stderr.strip().splitlines()
+                results[backend] = {"skipped": error[-1] if error else "failed"}
+                continue
+
+            metrics = json.loads(completed.stdout.strip().splitlines()[-1])
+            vectors = np.load(vectors_path)
+            ranked = top_k(vectors["documents"], vectors["queries"], args.k)
+            metrics[f"recall@{args.k}"] = round(
+                float(np.mean([e in row for e, row in zip(expected, ranked)])), 3
+            )
+
+            if reference is None:
+                reference = (backend, vectors["documents"], ranked)
+            else:
+                name, reference_documents, reference_ranked = reference
+                cosine = np.sum(reference_documents * vectors["documents"], axis=1)
+                overlap = [
+                    len(set(a) & set(b)) / args.k
+                    for a, b in zip(reference_ranked, ranked)
+                ]
+                metrics[f"agreement_vs_{name}"] = {
+                    "mean_cosine": round(float(np.mean(cosine)), 4),
+                    "min_cosine": round(float(np.min(cosine)), 4),
+                    f"top{args.k}_overlap": round(float(np.mean(overlap)), 3),
+                }
+            results[backend] = metrics
+
+    print(
+        json.dumps(
+            {
+                "tables": args.tables,
+                "queries": len(queries),
+                "threads": args.threads,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Import-time profile of the app's cold start.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_import_time [--module app.core.streamlit_app] \\
+        [--target-seconds 1.5] [--output results/import.json]
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters and
+reports the slowest modules by cumulative import time, which heavy
+dependencies were pulled in eagerly, and the median wall time of the import
+(interpreter start included) as a proxy for time-to-first-render. Exits with
+status 1 when that median exceeds the target. The JSON report can be compared
+with ``python -m benchmarks.compare``.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from app.core.utils.warmup import HEAVY_MODULES
+from benchmarks.bench_pipeline import git_commit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_imports(module: str) -> list:
+    """Return ``(module, self_seconds, cumulative_seconds)`` from ``-X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+def time_import(module: str) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", f"import {module}"], cwd=REPO_ROOT, check=True
+    )
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.core.streamlit_app")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--target-seconds", type=float, default=1.5)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    rows = profile_imports(args.module)
+    by_name = {name: cumulative for name, _, cumulative in rows}
+    wall_times = [time_import(args.module) for _ in range(args.repeat)]
+    median = statistics.median(wall_times)
+
+    report = {
+        "commit": git_commit(),
+        "parameters": {"module": args.module, "repeat": args.repeat},
+        "stages": {
+            f"import[{args.module}]": {
+                "seconds": round(median, 4),
+                "import_seconds": round(by_name.get(args.module, 0.0), 4),
+                "modules": len(rows),
+            }
+        },
+        "eager_heavy_modules": {
+            module: round(by_name[module], 4)
+            for module in HEAVY_MODULES
+            if module in by_name
+        },
+        "slowest": [
+            {"module": name, "cumulative_seconds": round(cumulative, 4)}
+            for name, _, cumulative in sorted(rows, key=lambda row: -row[2])[
+                : args.top
+            ]
+        ],
+        "target_seconds": args.target_seconds,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if median > args.target_seconds:
+        print(
+            f"\nTime to first render {median:.2f}s exceeds the "
+            f"{args.target_seconds:g}s target."
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
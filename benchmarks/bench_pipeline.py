@@ -0,0 +1,213 @@
+"""End-to-end benchmark of the schema -> index -> retrieve -> generate pipeline.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_pipeline --tables 200 --columns 20 --rows 1000 \\
+        --output results/$(git rev-parse --short HEAD).json
+
+Builds a synthetic warehouse (SQLite in a temporary directory unless --url
+points at e.g. a local Postgres database or in-memory ``sqlite://``), then
+times each stage with the deterministic fake chat model standing in for the
+LLM. Per stage it records wall time, peak Python allocations (tracemalloc),
+process max RSS and token counts. Compare two result files with
+``python -m benchmarks.compare``. The --url password is masked in the report.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from app.core.data_sources.data_source import DataSource
+from app.core.llm.fake_chat_model import FakeChatModel
+from app.core.llm.token_budget import TokenBudget
+from app.core.utils.config import Config
+from app.core.utils.resource_registry import ResourceRegistry
+from benchmarks.bench_schema_retrieval import build_queries
+from benchmarks.synthetic_warehouse import build_warehouse
+
+MB = 1024 * 1024
+
+
+class StageRecorder:
+    """Collects wall time, memory and caller-supplied metrics per named stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        metrics = {}
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        try:
+            yield metrics
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            metrics.update(
+                {
+                    "seconds": round(time.perf_counter() - started, 4),
+                    "peak_alloc_mb": round((peak - baseline) / MB, 3),
+                    # ru_maxrss is in kilobytes on Linux
+                    "max_rss_mb": round(
+                        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+                    ),
+                }
+            )
+            # Callers may add metrics after the timed block
+            self.stages[name] = metrics
+
+    def skip(self, name: str, reason: str):
+        self.stages[name] = {"skipped": reason}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args, workdir: str) -> dict:
+    recorder = StageRecorder()
+    token_budget = TokenBudget(args.model)
+    url = args.url or f"sqlite:///{os.path.join(workdir, 'warehouse.db')}"
+
+    warehouse = build_warehouse(url, args.tables, args.columns, args.rows, args.seed)
+    queries = build_queries(list(warehouse["schema"]), args.queries, args.seed)
+    queries = [query for query, _ in queries]
+
+    with recorder.stage("get_schema") as metrics:
+        data_source = DataSource.create(url)
+        schema = data_source.get_schema()
+        metrics["tables"] = len(schema)
+
+    for style in ("verbose", "compact"):
+        with recorder.stage(f"schema_to_string[{style}]") as metrics:
+            schema_text = data_source.schema_to_string(schema, style)
+        metrics["chars"] = len(schema_text)
+        metrics["tokens"] = token_budget.count(schema_text)
+
+    documents = data_source.schema_to_documents(schema)
+
+    try:
+        from app.core.llm.chroma_service import ChromaService
+
+        chroma_service = ChromaService()
+        # Load the encoder up front so it is not charged to the first stage
+        chroma_service.load_encoder()
+    except Exception as e:
+        for name in ("add_schema_vectors", "query_schema", "process_data_analysis"):
+            recorder.skip(name, str(e))
+        return recorder.stages
+
+    with recorder.stage("add_schema_vectors") as metrics:
+        metrics["documents"] = chroma_service.add_schema_vectors(documents)
+
+    with recorder.stage("query_schema") as metrics:
+        context_tokens = []
+        for query in queries:
+            results = chroma_service.query_schema(query)
+            context_tokens.append(
+                token_budget.count("\n\n".join(r["text"] for r in results))
+            )
+        metrics["queries"] = len(queries)
+        metrics["avg_context_tokens"] = round(sum(context_tokens) / len(queries), 1)
+
+    try:
+        from app.core.llm.llm_service import LLMService
+
+        llm = FakeChatModel(
+            args.model,
+            latency_seconds=args.llm_latency,
+            tokens_per_second=args.llm_tokens_per_second,
+        )
+        Config.RESULT_CACHE_ENABLED = False
+        llm_service = LLMService(url, model_name=args.model, llm=llm)
+    except Exception as e:
+        recorder.skip("process_data_analysis", str(e))
+        return recorder.stages
+
+    with recorder.stage("process_data_analysis") as metrics:
+        prompt_tokens, completion_tokens = 0, 0
+        for query in queries:
+            llm_service.process_data_analysis(query)
+            prompt_tokens += token_budget.count(
+                "\n".join(message["content"] for message in llm.last_messages)
+            )
+            completion_tokens += token_budget.count(llm.last_response)
+        metrics["queries"] = len(queries)
+        metrics["avg_prompt_tokens"] = round(prompt_tokens / len(queries), 1)
+        metrics["avg_completion_tokens"] = round(completion_tokens / len(queries), 1)
+
+    return recorder.stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Existing database to build the warehouse in")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--llm-latency", type=float, default=0.0)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=None)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    previous_cwd = os.getcwd()
+    # The vector store and caches use relative paths; keep them out of the repo
+    os.chdir(workdir)
+    Config.CACHE_DIR = os.path.join(workdir, "cache")
+    tracemalloc.start()
+    try:
+        stages = run(args, workdir)
+    finally:
+        tracemalloc.stop()
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            key: (
+                ResourceRegistry.display_key(value)
+                if key == "url" and value
+                else value
+            )
+            for key, value in vars(args).items()
+            if key != "output"
+        },
+        "stages": stages,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
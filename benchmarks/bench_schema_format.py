@@ -0,0 +1,73 @@
+"""Compare the verbose and compact schema formats on synthetic schemas.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_schema_format [--tables 50 200 1000] [--columns 20]
+
+Reports characters, prompt tokens (tiktoken, or an estimate when offline) and
+serialization time per format.
+"""
+
+import argparse
+import json
+import time
+
+from app.core.data_sources.schema_formatter import SchemaFormatter
+from app.core.llm.token_budget import TokenBudget
+from benchmarks.synthetic_schema import generate_schema
+
+
+def measure(schema: dict, style: str, token_budget: TokenBudget, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        text = SchemaFormatter.tables_to_string(schema, style)
+        timings.append(time.perf_counter() - started)
+    return {
+        "style": style,
+        "chars": len(text),
+        "tokens": token_budget.count(text),
+        "serialize_ms": round(min(timings) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    token_budget = TokenBudget(args.model)
+    results = []
+    for n_tables in args.tables:
+        schema = generate_schema(n_tables, columns_per_table=args.columns)
+        rows = [
+            measure(schema, style, token_budget, args.repeat)
+            for style in SchemaFormatter.STYLES
+        ]
+        verbose_tokens = rows[0]["tokens"]
+        for row in rows:
+            row["tables"] = n_tables
+            row["token_ratio"] = round(row["tokens"] / verbose_tokens, 3)
+        results.extend(rows)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(
+        f"{'tables':>7} {'style':>8} {'chars':>10} {'tokens':>9} "
+        f"{'ratio':>6} {'ms':>9}"
+    )
+    for row in results:
+        print(
+            f"{row['tables']:>7} {row['style']:>8} {row['chars']:>10} "
+            f"{row['tokens']:>9} {row['token_ratio']:>6} {row['serialize_ms']:>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
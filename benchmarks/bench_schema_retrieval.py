@@ -0,0 +1,119 @@
+"""Schema retrieval latency and recall: BM25, vector and hybrid (RRF) lookup.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_schema_retrieval [--tables 2000] [--queries 200] [--k 5]
+
+Queries name a table either exactly ("dbo.order_invoice_17") or as loose words
+("order invoice 17 totals"); a query counts as a hit when that table is in the
+top k. Vector and hybrid modes need chromadb and the embedding model and are
+skipped when they cannot be loaded.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+
+from app.core.data_sources.schema_formatter import SchemaFormatter
+from app.core.llm.lexical_index import LexicalIndex
+from app.core.utils.config import Config
+from benchmarks.synthetic_schema import generate_schema
+
+
+def build_queries(tables, n_queries: int, seed: int):
+    rng = random.Random(seed)
+    queries = []
+    for table in rng.sample(tables, min(n_queries, len(tables))):
+        name = table.split(".", 1)[1]
+        if rng.random() < 0.5:
+            queries.append((f"show {table} by month", table))
+        else:
+            queries.append((f"{' '.join(name.split('_'))} totals", table))
+    return queries
+
+
+def evaluate(search, queries, k: int) -> dict:
+    latencies = []
+    hits = 0
+    for query, expected in queries:
+        started = time.perf_counter()
+        tables = search(query, k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += expected in tables
+    latencies.sort()
+    return {
+        f"recall@{k}": round(hits / len(queries), 3),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 3),
+    }
+
+
+def chroma_service(path: str, lexical: bool):
+    from app.core.llm.chroma_service import ChromaService
+
+    Config.SCHEMA_LEXICAL_SEARCH = lexical
+    return ChromaService(collection_name="bench_schema", path=path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    schema = generate_schema(args.tables, seed=args.seed)
+    documents = SchemaFormatter.tables_to_documents(schema, "compact")
+    queries = build_queries(list(schema), args.queries, args.seed)
+    results = {}
+
+    lexical_index = LexicalIndex()
+    started = time.perf_counter()
+    lexical_index.sync(documents)
+    build_seconds = time.perf_counter() - started
+    results["lexical"] = {
+        "build_s": round(build_seconds, 3),
+        **evaluate(
+            lambda query, k: [t for t, _ in lexical_index.search(query, k)],
+            queries,
+            args.k,
+        ),
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        Config.CACHE_DIR = directory
+        try:
+            hybrid = chroma_service(directory, lexical=True)
+            started = time.perf_counter()
+            hybrid.sync_schema_vectors(documents)
+            build_seconds = time.perf_counter() - started
+            vector = chroma_service(directory, lexical=False)
+        except Exception as e:
+            print(f"Skipping vector and hybrid retrieval: {str(e)}")
+        else:
+            for name, service in (("vector", vector), ("hybrid", hybrid)):
+                results[name] = {
+                    "build_s": round(build_seconds, 3),
+                    **evaluate(
+                        lambda query, k: [
+                            r["table"] for r in service.query_schema(query, k)
+                        ],
+                        queries,
+                        args.k,
+                    ),
+                }
+
+    print(
+        json.dumps(
+            {"tables": args.tables, "queries": len(queries), "results": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
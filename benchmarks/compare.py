@@ -0,0 +1,70 @@
+"""Compare two benchmark JSON reports and flag regressions.
+
+Usage (from the repository root):
+
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10]
+
+Exits with status 1 when any stage's wall time or peak allocations grew by more
+than the threshold (ignoring changes below the noise floors).
+"""
+
+import argparse
+import json
+import sys
+
+# Metrics checked for regressions, with the absolute change below which a
+# difference is treated as noise
+CHECKED_METRICS = {"seconds": 0.005, "peak_alloc_mb": 1.0}
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, candidate: dict, threshold: float):
+    rows, regressions = [], []
+    for stage, after in candidate["stages"].items():
+        before = baseline["stages"].get(stage)
+        if before is None or "skipped" in before or "skipped" in after:
+            continue
+        for metric, value in after.items():
+            old = before.get(metric)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+                continue
+            change = (value - old) / old if old else 0.0
+            rows.append((stage, metric, old, value, change))
+            noise_floor = CHECKED_METRICS.get(metric)
+            if (
+                noise_floor is not None
+                and change > threshold
+                and value - old > noise_floor
+            ):
+                regressions.append((stage, metric, change))
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    rows, regressions = compare(baseline, candidate, args.threshold)
+
+    print(f"baseline {baseline.get('commit')} -> candidate {candidate.get('commit')}")
+    print(f"{'stage':<28} {'metric':<22} {'before':>12} {'after':>12} {'change':>8}")
+    for stage, metric, old, value, change in rows:
+        print(f"{stage:<28} {metric:<22} {old:>12} {value:>12} {change:>+8.1%}")
+
+    if regressions:
+        print("\nRegressions:")
+        for stage, metric, change in regressions:
+            print(f"  {stage} {metric} {change:+.1%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
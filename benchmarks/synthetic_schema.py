@@ -0,0 +1,122 @@
+import random
+
+COLUMN_TYPES = [
+    "INTEGER",
+    "BIGINT",
+    "VARCHAR(50)",
+    "VARCHAR(255)",
+    "NUMERIC(18, 2)",
+    "DATE",
+    "TIMESTAMP",
+    "BOOLEAN",
+]
+
+WORDS = [
+    "customer",
+    "order",
+    "product",
+    "invoice",
+    "payment",
+    "shipment",
+    "region",
+    "store",
+    "employee",
+    "supplier",
+    "category",
+    "campaign",
+    "account",
+    "ledger",
+    "inventory",
+    "return",
+    "discount",
+    "channel",
+    "contract",
+    "ticket",
+]
+
+
+def generate_schema(
+    n_tables: int,
+    columns_per_table: int = 20,
+    fks_per_table: int = 2,
+    schema_name: str = "dbo",
+    seed: int = 0,
+) -> dict:
+    """Build a deterministic schema dict shaped like ``SQLDataSource.get_schema``'s.
+
+    Every table has an ``id`` primary key, up to ``fks_per_table`` foreign keys
+    to earlier tables, one index per foreign key and a data summary for its
+    numeric and text columns.
+    """
+    rng = random.Random(seed)
+    tables = [
+        f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{index}" for index in range(n_tables)
+    ]
+
+    schema = {}
+    for index, table in enumerate(tables):
+        columns = [
+            {"name": "id", "type": "INTEGER", "nullable": False, "default": None}
+        ]
+        foreign_keys = []
+        for target in rng.sample(tables[:index], min(fks_per_table, index)):
+            column_name = f"{target}_id"
+            columns.append(
+                {
+                    "name": column_name,
+                    "type": "INTEGER",
+                    "nullable": True,
+                    "default": None,
+                }
+            )
+            foreign_keys.append(
+                {
+                    "name": f"fk_{table}_{target}",
+                    "constrained_columns": [column_name],
+                    "referred_schema": schema_name,
+                    "referred_table": target,
+                    "referred_columns": ["id"],
+                }
+            )
+
+        while len(columns) < columns_per_table:
+            columns.append(
+                {
+                    "name": f"{rng.choice(WORDS)}_{len(columns)}",
+                    "type": rng.choice(COLUMN_TYPES),
+                    "nullable": rng.random() < 0.7,
+                    "default": "0" if rng.random() < 0.1 else None,
+                }
+            )
+
+        data_summary = {}
+        for column in columns[1:]:
+            if column["type"].startswith(("INTEGER", "BIGINT", "NUMERIC")):
+                low = rng.randint(0, 1000)
+                data_summary[column["name"]] = {
+                    "min": low,
+                    "max": low + rng.randint(1, 10**6),
+                }
+            elif column["type"].startswith("VARCHAR"):
+                data_summary[column["name"]] = {
+                    "distinct_values": [f"{rng.choice(WORDS)}_{n}" for n in range(10)]
+                }
+
+        schema[f"{schema_name}.{table}"] = {
+            "columns": columns,
+            "foreign_keys": foreign_keys,
+            "indexes": [
+                {
+                    "name": f"ix_{table}_{fk['constrained_columns'][0]}",
+                    "column_names": fk["constrained_columns"],
+                    "unique": False,
+                }
+                for fk in foreign_keys
+            ],
+            "constraints": {
+                "primary_key": {"name": f"pk_{table}", "constrained_columns": ["id"]},
+                "unique_constraints": [],
+            },
+            "data_summary": data_summary,
+        }
+    return schema
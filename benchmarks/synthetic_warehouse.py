@@ -0,0 +1,155 @@
+"""Build a synthetic warehouse in SQLite or Postgres from a generated schema.
+
+Usage (from the repository root):
+
+    python -m benchmarks.synthetic_warehouse sqlite:///bench.db --tables 100 --rows 1000
+"""
+
+import argparse
+import datetime
+import random
+import time
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+)
+
+from app.core.data_sources.sql_data_source import SQLDataSource
+from benchmarks.synthetic_schema import WORDS, generate_schema
+
+EPOCH = datetime.datetime(2020, 1, 1)
+
+
+def _column_type(type_name: str):
+    if type_name.startswith("VARCHAR"):
+        return String(int(type_name[8:-1]))
+    if type_name.startswith("NUMERIC"):
+        return Numeric(18, 2)
+    return {
+        "INTEGER": Integer,
+        "BIGINT": BigInteger,
+        "DATE": Date,
+        "TIMESTAMP": DateTime,
+        "BOOLEAN": Boolean,
+    }[type_name]()
+
+
+def _value(rng: random.Random, type_name: str):
+    if type_name.startswith("VARCHAR"):
+        return f"{rng.choice(WORDS)}_{rng.randint(0, 20)}"
+    if type_name.startswith("NUMERIC"):
+        return round(rng.uniform(0, 10000), 2)
+    if type_name in ("INTEGER", "BIGINT"):
+        return rng.randint(0, 10**6)
+    if type_name == "DATE":
+        return (EPOCH + datetime.timedelta(days=rng.randint(0, 1500))).date()
+    if type_name == "TIMESTAMP":
+        return EPOCH + datetime.timedelta(seconds=rng.randint(0, 10**8))
+    return rng.random() < 0.5
+
+
+def build_warehouse(
+    url: str,
+    n_tables: int,
+    columns_per_table: int = 20,
+    rows_per_table: int = 1000,
+    seed: int = 0,
+) -> dict:
+    """Create (replacing) ``n_tables`` related tables at ``url`` and fill them with rows.
+
+    Builds through the app's shared engine for ``url``, so an in-memory
+    ``sqlite://`` warehouse is the same database a later ``DataSource`` sees.
+    Returns the generated schema dict and build statistics.
+    """
+    engine = SQLDataSource.shared_engine(url)
+    schema_name = "main" if engine.dialect.name == "sqlite" else "public"
+    schema = generate_schema(
+        n_tables,
+        columns_per_table=columns_per_table,
+        schema_name=schema_name,
+        seed=seed,
+    )
+
+    metadata = MetaData()
+    tables = []
+    for key, details in schema.items():
+        table_name = key.split(".", 1)[1]
+        referenced = {
+            fk["constrained_columns"][0]: f"{fk['referred_table']}.id"
+            for fk in details["foreign_keys"]
+        }
+        columns = []
+        for column in details["columns"]:
+            arguments = (
+                [ForeignKey(referenced[column["name"]])]
+                if column["name"] in referenced
+                else []
+            )
+            columns.append(
+                Column(
+                    column["name"],
+                    _column_type(column["type"]),
+                    *arguments,
+                    primary_key=column["name"] == "id",
+                    nullable=column["nullable"],
+                )
+            )
+        tables.append((Table(table_name, metadata, *columns), details))
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        for table, details in tables:
+            rows = []
+            for row_id in range(1, rows_per_table + 1):
+                row = {}
+                for column in details["columns"]:
+                    if column["name"] == "id":
+                        row["id"] = row_id
+                    elif column["name"].endswith("_id"):
+                        row[column["name"]] = rng.randint(1, rows_per_table)
+                    else:
+                        row[column["name"]] = _value(rng, column["type"])
+                rows.append(row)
+            if rows:
+                connection.execute(table.insert(), rows)
+
+    return {
+        "schema": schema,
+        "tables": n_tables,
+        "columns_per_table": columns_per_table,
+        "rows_per_table": rows_per_table,
+        "build_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", help="SQLAlchemy URL, e.g. sqlite:///bench.db")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = build_warehouse(args.url, args.tables, args.columns, args.rows, args.seed)
+    print(
+        f"Built {result['tables']} tables x {result['rows_per_table']} rows "
+        f"in {result['build_seconds']}s."
+    )
+
+
+if __name__ == "__main__":
+    main()